@@ -1,10 +1,14 @@
+import os
 from datetime import datetime
 from core.utilities import LogLvl, set_log_level, logging
 from core.data_fetching import SetManager
+from core.data_fetching.utils import DATA_DIR_LOC, DATA_DIR_NAME
+from core.data_requesting import RequestTelemetry
 
 
 TARGET_SET = 'ONE'
 LOG_LEVEL = LogLvl.SPARSE
+TELEMETRY_FILE = 'RequestTelemetry.json'
 set_log_level(LOG_LEVEL)
 
 
@@ -18,10 +22,20 @@ def load_set_data():
     return set_data
 
 
+def dump_request_telemetry():
+    # Summarise where the time went for each endpoint, and save the full stats for later inspection.
+    for endpoint, stats in RequestTelemetry.get_stats().items():
+        logging.sparse(f"{endpoint}: {stats['requests']} requests, {stats['latency']['total']}s waiting on the "
+                       f"network, {stats['slept']['total']}s sleeping, {stats['retries']} retries, "
+                       f"{stats['cache']['hits']} cache hits.")
+    RequestTelemetry.dump(os.path.join(DATA_DIR_LOC, DATA_DIR_NAME), TELEMETRY_FILE)
+
+
 def main():
     from core.game_metadata.game_objects.Card import CardManager
     CardManager.load_cache_from_file()
     load_set_data()
+    dump_request_telemetry()
 
 
 if __name__ == "__main__":
@@ -1,18 +1,27 @@
 import unittest
 from datetime import date, datetime
+from types import SimpleNamespace
 from os import path
-from pandas import DataFrame
+import os
+import tempfile
+from pandas import DataFrame, MultiIndex, Index, concat
+from pandas.testing import assert_frame_equal, assert_series_equal
 
-from core.wubrg import subset
+from core.wubrg import subset, COLOR_COMBINATIONS
 from core.game_metadata import FormatMetadata
 from core.data_fetching import utc_today, get_prev_17lands_update_time, get_next_17lands_update_time
-from core.data_fetching.utils.pandafy import gen_card_frame, gen_meta_frame
+from core.data_fetching.utils.pandafy import gen_card_frame, gen_card_frames, append_card_info, get_stats_grades, \
+    gen_meta_frame, gen_hist_frames, compact_frame, gen_card_records, gen_card_frames_from_records
 from core.data_fetching import get_name_slice, get_color_slice, stringify_for_date_slice, \
     get_date_slice
 from core.data_fetching import rarity_filter, cmc_filter, card_color_filter, cast_color_filter, \
     compose_filters
+from core.data_fetching import STAT_COL_NAMES, SHARED_COL_NAMES, CARD_INFO_COL_NAMES
+from core.data_fetching.utils.consts import RANK_COL_NAMES, WEIGHTED_STAT_DICT
 
-from core.data_fetching import DataLoader, LoadedData, DataFramer, FramedData
+from core.data_fetching import DataLoader, LoadedData, DataFramer, FramedData, DataStore, JsonDataStore, \
+    ParquetDataStore, DataWarehouse, DataManifest, FrameSnapshot, SummaryAggregator, CumulativeFrame, \
+    IndexLookup, CardTable
 
 CARD_KEYS_REQ = ['seen_count', 'avg_seen', 'pick_count', 'avg_pick', 'game_count', 'win_rate',
                  'opening_hand_game_count', 'opening_hand_win_rate', 'drawn_game_count', 'drawn_win_rate',
@@ -129,6 +138,109 @@ class TestUtils(unittest.TestCase):
         frame = gen_card_frame(list())
         self.assertEqual(len(frame), 0)
 
+    def test_gen_card_frames(self):
+        frame = gen_card_frames({('2023-02-08', ''): CARD_DATA, ('2023-02-08', 'WU'): list(),
+                                 ('2023-02-09', 'WU'): CARD_DATA[1:]}, ['Date', 'Deck Colors'])
+        self.assertEqual(list(frame.index.names), ['Date', 'Deck Colors', 'Name'])
+        self.assertEqual(list(frame.index), [('2023-02-08', '', 'Healing Grace'),
+                                             ('2023-02-08', '', 'History of Benalia'),
+                                             ('2023-02-09', 'WU', 'History of Benalia')])
+
+        # Each group should match the frame made for it on its own.
+        card_frame = gen_card_frame(CARD_DATA)
+        self.assertTrue(frame.loc[('2023-02-08', '')].equals(card_frame))
+        self.assertEqual(frame.loc[('2023-02-08', '', 'Healing Grace'), 'GP GW'], 4)
+
+        frame = gen_card_frames({('2023-02-08', ''): list()}, ['Date', 'Deck Colors'])
+        self.assertEqual(len(frame), 0)
+        self.assertEqual(list(frame.index.names), ['Date', 'Deck Colors', 'Name'])
+
+    def test_append_card_info(self):
+        frame = gen_card_frames({('2023-02-08', ''): CARD_DATA, ('2023-02-09', 'W'): CARD_DATA[::-1]},
+                                ['Date', 'Deck Colors'])
+        card_info = DataFrame({'CMC': [2, 3], 'Types': [{'Instant'}, {'Enchantment'}]},
+                              index=Index(['Healing Grace', 'History of Benalia'], name='Name'))
+        frame = append_card_info(frame, card_info.reindex(columns=CARD_INFO_COL_NAMES))
+
+        self.assertListEqual(list(frame.columns), STAT_COL_NAMES + SHARED_COL_NAMES + CARD_INFO_COL_NAMES)
+        self.assertEqual(list(frame['CMC']), [2, 3, 3, 2])
+        self.assertEqual(frame.loc[('2023-02-09', 'W', 'Healing Grace'), 'Types'], {'Instant'})
+
+    def test_get_stats_grades(self):
+        cards = [dict(CARD_DATA[0], name=f'Card {i}', ever_drawn_win_rate=0.4 + i / 100) for i in range(20)]
+        cards[0]['ever_drawn_win_rate'] = None
+        frame = gen_card_frames({('2023-02-08', ''): cards, ('2023-02-08', 'WU'): cards[::-1]},
+                                ['Date', 'Deck Colors'])
+        frame = get_stats_grades(frame, ['Date', 'Deck Colors'])
+        self.assertListEqual(list(frame.columns[-3:]), RANK_COL_NAMES)
+
+        # Each group should be graded on its own, the same as if it was graded by itself.
+        single = get_stats_grades(gen_card_frame(cards))
+        for col in RANK_COL_NAMES:
+            expected = list(single[col].fillna(-1))
+            self.assertListEqual(list(frame.loc[('2023-02-08', '')][col].fillna(-1)), expected)
+            self.assertListEqual(list(frame.loc[('2023-02-08', 'WU')][col].fillna(-1)), expected[::-1])
+
+        # Cards without a GIH WR aren't graded, and each range of percentiles includes its end.
+        self.assertIsNone(single.loc['Card 0', 'Rank'])
+        self.assertEqual(single.loc['Card 19', 'Rank'], 'A-')
+        self.assertEqual(single.loc['Card 1', 'Rank'], 'D-')
+        self.assertEqual(single.loc['Card 10', 'Percentile'], 50)
+        self.assertEqual(single.loc['Card 10', 'Rank'], 'C')
+        self.assertTrue(single['Tier'].dropna().is_monotonic_increasing)
+
+    def test_compact_frame(self):
+        frame = gen_card_frames({('2023-02-08', ''): CARD_DATA, ('2023-02-09', 'WU'): CARD_DATA},
+                                ['Date', 'Deck Colors'])
+        card_info = DataFrame({'CMC': [2, 3], 'Types': [{'Instant'}, {'Enchantment'}], 'Power': [None, '2']},
+                              index=Index(['Healing Grace', 'History of Benalia'], name='Name'))
+        frame = append_card_info(frame, card_info.reindex(columns=CARD_INFO_COL_NAMES))
+        compact = compact_frame(frame)
+
+        self.assertEqual(compact['Rarity'].dtype, 'category')
+        self.assertEqual(compact['Types'].dtype, 'category')
+        self.assertEqual(compact['Power'].dtype, 'category')
+        self.assertEqual(compact['# GP'].dtype, 'int8')
+        self.assertEqual(compact['# Seen'].dtype, 'int16')
+        self.assertEqual(compact['GP WR'].dtype, 'float64')
+        self.assertEqual(str(compact.index.levels[0].dtype), 'datetime64[ns]')
+        self.assertLess(compact.memory_usage(deep=True).sum(), frame.memory_usage(deep=True).sum())
+
+        # The values, and looking them up, should work the same as before.
+        self.assertEqual(compact.loc[('2023-02-09', 'WU', 'Healing Grace'), 'Types'], {'Instant'})
+        self.assertEqual(len(compact.loc(axis=0)[['2023-02-09'], :, :]), 2)
+        self.assertEqual(list(compact['Rarity']), list(frame['Rarity']))
+        self.assertTrue(compact_frame(compact).equals(compact))
+
+        # Differences between counts should be able to go negative.
+        counts = compact_frame(DataFrame({'# GP': [5, 9], '# GIH': [7, 3]}))
+        self.assertEqual(list(counts['# GP'] - counts['# GIH']), [-2, 6])
+
+    def test_gen_hist_frames(self):
+        card_data = {'2023-02-08': {'': CARD_DATA, 'WU': CARD_DATA[1:]}, '2023-02-09': {'': CARD_DATA[::-1]}}
+        meta_data = {'2023-02-08': META_DATA, '2023-02-09': META_DATA}
+        card_info = DataFrame({'CMC': [2, 3]}, index=Index(['Healing Grace', 'History of Benalia'], name='Name'))
+        card_info = card_info.reindex(columns=CARD_INFO_COL_NAMES)
+
+        grouped, single, card = gen_hist_frames(card_data, meta_data, card_info)
+        self.assertEqual(list(card.index.names), ['Date', 'Deck Colors', 'Name'])
+        self.assertEqual(list(single.index.names), ['Date', 'Name'])
+        self.assertListEqual(list(card.columns[-3:]), RANK_COL_NAMES)
+
+        # Dates made separately, eg. by different processes, should join into the same frames.
+        parts = [gen_hist_frames({date: card_data[date]}, {date: meta_data[date]}, card_info) for date in card_data]
+        for frame, frames in zip((grouped, single, card), zip(*parts)):
+            self.assertTrue(frame.equals(concat(frames)))
+
+        self.assertIsNone(gen_hist_frames(dict(), meta_data, card_info)[2])
+
+        # Card data given as records, eg. from a CardTable, should make the same frames.
+        records = {date: gen_card_records({(color,): data[color] for color in data}, ['Deck Colors'])
+                   for date, data in card_data.items()}
+        self.assertTrue(gen_hist_frames(records, meta_data, card_info)[2].equals(card))
+        self.assertTrue(gen_card_frames_from_records(records['2023-02-09'], ['Deck Colors'])
+                        .equals(gen_card_frames({('',): CARD_DATA[::-1]}, ['Deck Colors'])))
+
     def test_gen_meta_frame(self):
         sum_frame, arc_frame = gen_meta_frame(META_DATA)
         self.assertEqual(len(sum_frame), 2)
@@ -308,6 +420,369 @@ class TestUtils(unittest.TestCase):
         self.assertEqual(filter_1(frame).sum(), 6)
 
 
+class TestDataStore(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.folder = self.temp_dir.name
+        self.card_data = {'': CARD_DATA, 'WU': CARD_DATA[:1], 'BR': CARD_DATA[1:]}
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def check_store(self, store: DataStore):
+        # Nothing should be loaded before it's saved.
+        self.assertEqual(store.load_card_data(self.folder, ['', 'WU']), dict())
+        self.assertIsNone(store.load_meta_data(self.folder))
+
+        self.assertTrue(store.save_card_data(self.folder, self.card_data))
+        self.assertTrue(store.save_meta_data(self.folder, META_DATA))
+        self.assertEqual(store.load_card_data(self.folder, ['', 'WU', 'BR', 'G']), self.card_data)
+        self.assertEqual(store.load_card_data(self.folder, ['WU']), {'WU': CARD_DATA[:1]})
+        self.assertEqual(store.load_card_data(self.folder, []), dict())
+        self.assertEqual(store.load_meta_data(self.folder), META_DATA)
+
+        # Saving a colour again should replace its data, and leave the others alone.
+        self.assertTrue(store.save_card_data(self.folder, {'WU': CARD_DATA[1:]}))
+        self.assertEqual(store.load_card_data(self.folder, ['WU', 'BR']), {'WU': CARD_DATA[1:], 'BR': CARD_DATA[1:]})
+
+    def test_get_store(self):
+        self.assertIsInstance(DataStore.get_store('json'), JsonDataStore)
+        self.assertIsInstance(DataStore.get_store('parquet'), ParquetDataStore)
+        self.assertRaises(ValueError, DataStore.get_store, 'csv')
+
+    def test_abstract_methods(self):
+        # A store which is missing a method should fail when it's created, and not be offered as a store.
+        class PartialDataStore(DataStore):
+            NAME = 'partial'
+
+            def owns_file(self, filename: str) -> bool:
+                return False
+
+        self.assertRaises(TypeError, DataStore)
+        self.assertRaises(TypeError, PartialDataStore)
+        self.assertNotIn(PartialDataStore, DataStore.get_stores())
+        self.assertRaises(ValueError, DataStore.get_store, 'partial')
+
+    def test_json_store(self):
+        store = JsonDataStore()
+        self.check_store(store)
+        self.assertEqual(sorted(store.get_files(self.folder)),
+                         ['BRCardRatings.json', 'CardRatings.json', 'ColorRatings.json', 'WUCardRatings.json'])
+        self.assertEqual(store.get_data_files(['', 'WU'], True),
+                         ['CardRatings.json', 'WUCardRatings.json', 'ColorRatings.json'])
+        self.assertEqual(store.get_data_files(['BR'], False), ['BRCardRatings.json'])
+
+    def test_parquet_store(self):
+        store = ParquetDataStore()
+        self.check_store(store)
+        self.assertEqual(store.get_files(self.folder), ['CardRatings.parquet', 'ColorRatings.parquet'])
+        self.assertEqual(store.get_data_files(['', 'WU'], True), ['CardRatings.parquet', 'ColorRatings.parquet'])
+        self.assertEqual(store.get_data_files(list(), True), ['ColorRatings.parquet'])
+        self.assertEqual(len(os.listdir(self.folder)), 2)
+
+        # Columns should be widened when a colour has a different type, or is missing a key.
+        card = {key: val for key, val in CARD_DATA[0].items() if key != 'url_back'}
+        card['game_count'] = 19.5
+        store.save_card_data(self.folder, {'G': [card]})
+        loaded = store.load_card_data(self.folder, ['G', ''])
+        self.assertEqual(loaded['G'][0]['game_count'], 19.5)
+        self.assertIsNone(loaded['G'][0]['url_back'])
+        self.assertEqual(loaded[''], CARD_DATA)
+
+    def test_card_table(self):
+        store = ParquetDataStore()
+        store.save_card_data(self.folder, self.card_data)
+
+        # The colours are given in the order asked for, and the rows are only made into json objects when used.
+        table = store.load_card_data(self.folder, ['G', 'BR', '', 'WU'])
+        self.assertIsInstance(table, CardTable)
+        self.assertEqual(list(table), ['BR', '', 'WU'])
+        self.assertIn('WU', table)
+        self.assertNotIn('G', table)
+        self.assertIsNone(table._card_data)
+        self.assertRaises(KeyError, table.__getitem__, 'G')
+        self.assertEqual(table['WU'], CARD_DATA[:1])
+        self.assertEqual(dict(table), {'BR': CARD_DATA[1:], '': CARD_DATA, 'WU': CARD_DATA[:1]})
+
+        # Records are made straight from the table.
+        records = table.get_records('Deck Colors')
+        self.assertEqual(len(records), 4)
+        self.assertEqual(sorted(records['Deck Colors']), ['', '', 'BR', 'WU'])
+        self.assertEqual(list(records.columns[:-1]), list(CARD_DATA[0]))
+        self.assertTrue(DataFramer._get_card_records({'2023-02-08': table})['2023-02-08'].equals(records))
+
+    def test_copy_to(self):
+        # Json files should be able to be imported into another store, and back out.
+        json_store, parquet_store = JsonDataStore(), ParquetDataStore()
+        json_store.save_card_data(self.folder, self.card_data)
+        json_store.save_meta_data(self.folder, META_DATA)
+        self.assertTrue(json_store.copy_to(self.folder, parquet_store, ['', 'WU', 'BR']))
+        self.assertEqual(parquet_store.load_card_data(self.folder, ['', 'WU', 'BR']), self.card_data)
+        self.assertEqual(parquet_store.load_meta_data(self.folder), META_DATA)
+
+        # Nothing should be copied from an empty folder.
+        with tempfile.TemporaryDirectory() as empty_folder:
+            self.assertFalse(parquet_store.copy_to(empty_folder, json_store, ['', 'WU']))
+
+
+class TestDataWarehouse(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.warehouse = DataWarehouse(path.join(self.temp_dir.name, 'Test.sqlite'))
+
+    def tearDown(self):
+        self.warehouse.close()
+        self.temp_dir.cleanup()
+
+    def test_get_warehouse(self):
+        file_path = path.join(self.temp_dir.name, 'Shared.sqlite')
+        warehouse = DataWarehouse.get_warehouse(file_path)
+        self.assertIs(warehouse, DataWarehouse.get_warehouse(file_path))
+        warehouse.close()
+        del DataWarehouse.WAREHOUSES[path.abspath(file_path)]
+
+    def test_save_load(self):
+        self.warehouse.save_card_data('ONE', 'PremierDraft', '2023-02-08', {'': CARD_DATA, 'WU': list()})
+        self.warehouse.save_meta_data('ONE', 'PremierDraft', '2023-02-08', META_DATA)
+        self.warehouse.save_card_data('ONE', 'PremierDraft', '2023-02-09', {'': CARD_DATA})
+
+        # Only dates with archetype data and every colour are fully loaded. Empty colours still count.
+        self.assertEqual(self.warehouse.get_loaded_dates('ONE', 'PremierDraft', ['', 'WU']), ['2023-02-08'])
+        self.assertEqual(self.warehouse.get_loaded_dates('ONE', 'PremierDraft', ['', 'WU', 'BR']), [])
+        self.assertEqual(self.warehouse.get_loaded_dates('BRO', 'PremierDraft', ['']), [])
+        self.assertEqual(self.warehouse.get_loaded('ONE', 'PremierDraft', '2023-02-08'), {'', 'WU', None})
+        self.assertEqual(self.warehouse.get_loaded('ONE', 'PremierDraft', '2023-02-09'), {''})
+        self.assertEqual(self.warehouse.get_loaded('ONE', 'PremierDraft', '2023-02-10'), set())
+
+        card_data, meta_data = self.warehouse.load_data('ONE', 'PremierDraft')
+        self.assertEqual(card_data, {'2023-02-08': {'': CARD_DATA, 'WU': list()}, '2023-02-09': {'': CARD_DATA}})
+        self.assertEqual(meta_data, {'2023-02-08': META_DATA})
+
+        card_data, meta_data = self.warehouse.load_data('ONE', 'PremierDraft', ['2023-02-09'])
+        self.assertEqual(card_data, {'2023-02-09': {'': CARD_DATA}})
+        self.assertEqual(meta_data, dict())
+        self.assertEqual(self.warehouse.load_data('ONE', 'PremierDraft', list()), (dict(), dict()))
+
+        # The dates should be filtered by the queries, with long lists of dates put in a temporary table.
+        statements = list()
+        self.warehouse._conn.set_trace_callback(statements.append)
+        for max_params in [DataWarehouse._MAX_DATE_PARAMS, 1]:
+            self.warehouse._MAX_DATE_PARAMS = max_params
+            card_data, meta_data = self.warehouse.load_data('ONE', 'PremierDraft', ['2023-02-08', '2023-02-10'])
+            self.assertEqual(card_data, {'2023-02-08': {'': CARD_DATA, 'WU': list()}})
+            self.assertEqual(meta_data, {'2023-02-08': META_DATA})
+        self.warehouse._conn.set_trace_callback(None)
+        queries = [sql for sql in statements if sql.startswith('SELECT')]
+        self.assertEqual(len(queries), 6)
+        self.assertTrue(all("date IN ('2023-02-08', '2023-02-10')" in sql for sql in queries[:3]))
+        self.assertTrue(all('date IN (SELECT date FROM temp.load_dates)' in sql for sql in queries[3:]))
+
+        # Saving data again should replace it.
+        self.warehouse.save_card_data('ONE', 'PremierDraft', '2023-02-08', {'': CARD_DATA[:1]})
+        self.warehouse.save_meta_data('ONE', 'PremierDraft', '2023-02-08', META_DATA[:1])
+        card_data, meta_data = self.warehouse.load_data('ONE', 'PremierDraft', ['2023-02-08'])
+        self.assertEqual(card_data['2023-02-08'][''], CARD_DATA[:1])
+        self.assertEqual(meta_data['2023-02-08'], META_DATA[:1])
+
+    def test_get_card_ratings(self):
+        name = CARD_DATA[0]['name']
+        self.warehouse.save_card_data('ONE', 'PremierDraft', '2023-02-08', {'': CARD_DATA, 'WU': CARD_DATA})
+        self.warehouse.save_card_data('ONE', 'TradDraft', '2023-02-08', {'': CARD_DATA})
+        self.warehouse.save_card_data('BRO', 'PremierDraft', '2022-11-16', {'': CARD_DATA})
+        self.warehouse.save_card_data('BRO', 'PremierDraft', DataWarehouse.SUMMARY_DATE, {'': CARD_DATA})
+
+        ratings = self.warehouse.get_card_ratings(name)
+        self.assertEqual([(r['set_code'], r['format'], r['date']) for r in ratings],
+                         [('BRO', 'PremierDraft', '2022-11-16'), ('ONE', 'PremierDraft', '2023-02-08'),
+                          ('ONE', 'TradDraft', '2023-02-08')])
+        self.assertEqual(ratings[0]['win_rate'], CARD_DATA[0]['win_rate'])
+
+        self.assertEqual(len(self.warehouse.get_card_ratings(name, set_code='ONE', format_name='PremierDraft')), 1)
+        self.assertEqual(len(self.warehouse.get_card_ratings(name, 'WU')), 1)
+        self.assertEqual(len(self.warehouse.get_card_ratings(name, include_summary=True)), 4)
+        self.assertEqual(self.warehouse.get_card_ratings('Not A Card'), list())
+
+
+class TestDataManifest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.folder = self.temp_dir.name
+        self.json_store, self.parquet_store = JsonDataStore(), ParquetDataStore()
+
+        # Save some data before there's a manifest, including a file with no real data.
+        self.day_folder = path.join(self.folder, '2023-02-08')
+        os.makedirs(self.day_folder)
+        self.json_store.save_card_data(self.day_folder, {'': CARD_DATA, 'WU': list()})
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_rebuild(self):
+        manifest = DataManifest(self.folder)
+        self.assertTrue(path.isfile(manifest.file_path))
+        self.assertEqual(manifest.get_files('2023-02-08'), ['CardRatings.json', 'WUCardRatings.json'])
+        self.assertEqual(manifest.get_files('2023-02-08', valid_only=True), ['CardRatings.json'])
+        self.assertEqual(manifest.get_files('2023-02-09'), list())
+
+        entry = manifest.get_entry('2023-02-08', 'CardRatings.json')
+        self.assertEqual(entry['size'], path.getsize(path.join(self.day_folder, 'CardRatings.json')))
+        self.assertEqual(entry['store'], 'json')
+        self.assertIsNone(entry['checksum'])
+        self.assertIsNone(manifest.get_entry('2023-02-08', 'ColorRatings.json'))
+
+    def test_update(self):
+        manifest = DataManifest(self.folder)
+        self.assertIsNone(manifest.get_fetch_time('2023-02-08', self.parquet_store))
+
+        self.parquet_store.save_card_data(self.day_folder, {'': CARD_DATA})
+        manifest.update('2023-02-08', self.parquet_store)
+        self.assertEqual(manifest.get_files('2023-02-08', self.parquet_store), ['CardRatings.parquet'])
+        self.assertGreater(manifest.get_fetch_time('2023-02-08', self.parquet_store),
+                           manifest.get_fetch_time('2023-02-08', self.json_store))
+
+        # Unchanged files shouldn't be recorded again.
+        entry = manifest.get_entry('2023-02-08', 'CardRatings.parquet')
+        manifest.update('2023-02-08', self.parquet_store)
+        self.assertEqual(manifest.get_entry('2023-02-08', 'CardRatings.parquet'), entry)
+
+        # The manifest should be loaded from the file, instead of scanning the folder again.
+        self.parquet_store.save_meta_data(self.day_folder, META_DATA)
+        manifest = DataManifest(self.folder)
+        self.assertEqual(manifest.get_entry('2023-02-08', 'CardRatings.parquet'), entry)
+        self.assertIsNone(manifest.get_entry('2023-02-08', 'ColorRatings.parquet'))
+
+        # A broken manifest should be rebuilt.
+        with open(manifest.file_path, 'w') as f:
+            f.write('{"2023-02-08": ')
+        manifest = DataManifest(self.folder)
+        self.assertIsNotNone(manifest.get_entry('2023-02-08', 'ColorRatings.parquet'))
+
+        # Deleted files should be removed, but only for the store which was updated.
+        os.remove(path.join(self.day_folder, 'ColorRatings.parquet'))
+        manifest.update('2023-02-08', self.parquet_store)
+        self.assertIsNone(manifest.get_entry('2023-02-08', 'ColorRatings.parquet'))
+        self.assertEqual(manifest.get_files('2023-02-08', self.json_store),
+                         ['CardRatings.json', 'WUCardRatings.json'])
+        self.assertIsNone(DataManifest(self.folder).get_entry('2023-02-08', 'ColorRatings.parquet'))
+
+    def test_get_fingerprint(self):
+        manifest = DataManifest(self.folder)
+        fingerprint = manifest.get_fingerprint('2023-02-08')
+        self.assertEqual(len(fingerprint), 40)
+        self.assertIsNone(manifest.get_fingerprint('2023-02-09'))
+
+        # Checksums are only worked out for files with data, and saved once they have been.
+        self.assertEqual(len(manifest.get_entry('2023-02-08', 'CardRatings.json')['checksum']), 40)
+        self.assertIsNone(manifest.get_entry('2023-02-08', 'WUCardRatings.json')['checksum'])
+        self.assertEqual(DataManifest(self.folder).get_entry('2023-02-08', 'CardRatings.json'),
+                         manifest.get_entry('2023-02-08', 'CardRatings.json'))
+
+        # Files without data don't count, but any change to the files with data should.
+        self.json_store.save_card_data(self.day_folder, {'WU': list()})
+        manifest.update('2023-02-08', self.json_store)
+        self.assertEqual(manifest.get_fingerprint('2023-02-08'), fingerprint)
+
+        self.json_store.save_card_data(self.day_folder, {'': CARD_DATA[:1]})
+        manifest.update('2023-02-08', self.json_store)
+        self.assertNotEqual(manifest.get_fingerprint('2023-02-08'), fingerprint)
+
+    def test_update_files(self):
+        manifest = DataManifest(self.folder)
+        self.json_store.save_card_data(self.day_folder, {'W': CARD_DATA, 'U': CARD_DATA})
+
+        # Only the files which were written should be checked.
+        manifest.update('2023-02-08', self.json_store, filenames=['WCardRatings.json'])
+        self.assertEqual(manifest.get_files('2023-02-08', valid_only=True), ['CardRatings.json', 'WCardRatings.json'])
+
+        # Files which were meant to be written, but weren't, should be removed.
+        os.remove(path.join(self.day_folder, 'WCardRatings.json'))
+        manifest.update('2023-02-08', self.json_store, filenames=['WCardRatings.json'])
+        self.assertEqual(manifest.get_files('2023-02-08', valid_only=True), ['CardRatings.json'])
+
+        # Without any files given, every file of the store is checked.
+        manifest.update('2023-02-08', self.json_store)
+        self.assertEqual(manifest.get_files('2023-02-08', valid_only=True), ['CardRatings.json', 'UCardRatings.json'])
+
+    def test_batch(self):
+        manifest = DataManifest(self.folder)
+        self.parquet_store.save_card_data(self.day_folder, {'': CARD_DATA})
+
+        # The manifest should only be saved once the outermost batch ends.
+        with manifest.batch():
+            with manifest.batch():
+                manifest.update('2023-02-08', self.parquet_store)
+            self.assertIsNone(DataManifest(self.folder).get_entry('2023-02-08', 'CardRatings.parquet'))
+            self.assertIsNotNone(manifest.get_entry('2023-02-08', 'CardRatings.parquet'))
+        self.assertIsNotNone(DataManifest(self.folder).get_entry('2023-02-08', 'CardRatings.parquet'))
+
+        # Even if the batch ends with an error.
+        with self.assertRaises(ValueError), manifest.batch():
+            manifest.get_fingerprint('2023-02-08')
+            raise ValueError()
+        self.assertIsNotNone(DataManifest(self.folder).get_entry('2023-02-08', 'CardRatings.parquet')['checksum'])
+
+    def test_missing_folder(self):
+        manifest = DataManifest(self.folder)
+
+        # Folders saved without the manifest, eg. copied in by hand, should be found the first time they're needed.
+        other_folder = path.join(self.folder, '2023-02-09')
+        os.makedirs(other_folder)
+        self.parquet_store.save_card_data(other_folder, {'': CARD_DATA})
+        self.assertEqual(manifest.get_files('2023-02-09'), ['CardRatings.parquet'])
+        self.assertIsNotNone(manifest.get_fingerprint('2023-02-09'))
+        self.assertIsNotNone(DataManifest(self.folder).get_entry('2023-02-09', 'CardRatings.parquet'))
+
+        # As should those found when saving to them.
+        self.json_store.save_card_data(other_folder, {'': CARD_DATA})
+        manifest = DataManifest(self.folder)
+        with open(manifest.file_path, 'w') as f:
+            f.write('{}')
+        manifest = DataManifest(self.folder)
+        manifest.update('2023-02-09', self.json_store, filenames=['CardRatings.json'])
+        self.assertEqual(manifest.get_files('2023-02-09'), ['CardRatings.json', 'CardRatings.parquet'])
+
+        # A folder with no files is only looked for once.
+        self.assertEqual(manifest.get_files('2023-02-10'), list())
+        os.makedirs(path.join(self.folder, '2023-02-10'))
+        self.json_store.save_card_data(path.join(self.folder, '2023-02-10'), {'': CARD_DATA})
+        self.assertEqual(manifest.get_files('2023-02-10'), list())
+
+
+class TestFrameSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.folder = self.temp_dir.name
+        index = MultiIndex.from_tuples([('2023-02-08', 'WU'), ('2023-02-09', 'WU')], names=['Date', 'Name'])
+        self.frame = DataFrame({'Wins': [1, 2]}, index=index)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_save_load(self):
+        snapshot = FrameSnapshot(self.folder, 'history_frames', '1-full')
+        self.assertFalse(snapshot.load())
+
+        snapshot.FRAMES = {'CARD_HISTORY_FRAME': self.frame, 'GROUPED_ARCHETYPE_HISTORY_FRAME': None}
+        snapshot.FINGERPRINTS = {'2023-02-08': 'a', '2023-02-09': 'b'}
+        self.assertTrue(snapshot.save())
+        self.assertTrue(path.isfile(snapshot.file_path))
+
+        loaded = FrameSnapshot(self.folder, 'history_frames', '1-full')
+        self.assertTrue(loaded.load())
+        self.assertTrue(loaded.FRAMES['CARD_HISTORY_FRAME'].equals(self.frame))
+        self.assertIsNone(loaded.FRAMES['GROUPED_ARCHETYPE_HISTORY_FRAME'])
+        self.assertEqual(loaded.FINGERPRINTS, snapshot.FINGERPRINTS)
+
+        # Snapshots made a different way should be ignored.
+        self.assertFalse(FrameSnapshot(self.folder, 'history_frames', '2-full').load())
+
+    def test_get_valid_keys(self):
+        snapshot = FrameSnapshot(self.folder, 'history_frames', '1-full')
+        snapshot.FINGERPRINTS = {'2023-02-08': 'a', '2023-02-09': 'b', '2023-02-10': 'c'}
+        fingerprints = {'2023-02-08': 'a', '2023-02-09': 'x', '2023-02-10': None, '2023-02-11': 'd'}
+        self.assertEqual(snapshot.get_valid_keys(fingerprints), ['2023-02-08'])
+
+
 class TestDataLoader(unittest.TestCase):
     DATA_DIR_LOC = r'C:\Users\Zachary\Coding\GitHub'
     DATA_DIR_NAME = '17LandsData'
@@ -334,6 +809,11 @@ class TestDataLoader(unittest.TestCase):
         str2 = r'https://www.17lands.com/color_ratings/data?expansion=DOM&event_type=PremierDraft&combine_splash=false'
         self.assertEqual(str1, str2 + date_str)
 
+    def test_response_cache(self):
+        # Only the summary is fetched more than once, so the data for each day shouldn't be cached.
+        self.assertIs(DataLoader('DOM', 'PremierDraft')._fetcher._CACHE, DataLoader._RESPONSE_CACHE)
+        self.assertIsNone(DataLoader('DOM', 'PremierDraft', date(2022, 4, 1))._fetcher._CACHE)
+
     def test_urls(self):
         loader = DataLoader('DOM', 'PremierDraft', date(2022, 4, 1))
 
@@ -383,6 +863,71 @@ class TestDataLoader(unittest.TestCase):
         self.assertTrue(loader.file_exists('ColorRatings.json'))
         self.assertTrue(loader.file_exists('CardRatings.json'))
 
+    @staticmethod
+    def get_offline_loader(folder: str, fetch, store: DataStore = None) -> DataLoader:
+        # Keeps everything the loader saves in a folder, and gets its data from `fetch` instead of 17Lands.
+        loader = DataLoader('DOM', 'PremierDraft', date(2022, 4, 1), store=store or JsonDataStore())
+        loader._MANIFEST = DataManifest(folder)
+        loader.get_folder_path = lambda: path.join(folder, loader.get_date_key())
+        loader._fetch_data = fetch
+        return loader
+
+    def test_fetch_concurrently(self):
+        def fetch(url, key):
+            if key == 'WUB':
+                raise ConnectionError('Failed')
+            return META_DATA if key == DataLoader._META_TASK_KEY else [dict(CARD_DATA[0], color=key)]
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            loader = self.get_offline_loader(temp_dir, fetch)
+            loader.FETCH_WORKERS = 4
+            card_data, meta_data = loader._get_data(COLOR_COMBINATIONS, True, concurrent=True)
+
+            # Every colour should be returned in order, with the one which failed left empty, and the rest saved.
+            self.assertEqual(list(card_data), COLOR_COMBINATIONS)
+            self.assertEqual(card_data['WUB'], list())
+            self.assertTrue(all(card_data[color][0]['color'] == color for color in COLOR_COMBINATIONS
+                                if color != 'WUB'))
+            self.assertEqual(meta_data, META_DATA)
+            files = loader._MANIFEST.get_files(loader.get_date_key())
+            self.assertEqual(len(files), len(COLOR_COMBINATIONS))
+            self.assertNotIn('WUBCardRatings.json', files)
+
+            # Only the colour which failed should be fetched again.
+            fetched = list()
+            loader._fetch_data = lambda url, key: fetched.append(key) or [dict(CARD_DATA[0], color=key)]
+            card_data, _ = loader._get_data(COLOR_COMBINATIONS, True, concurrent=True)
+            self.assertEqual(fetched, ['WUB'])
+            self.assertEqual(card_data['WUB'][0]['color'], 'WUB')
+
+    def test_save_once(self):
+        def fetch(url, key):
+            if key == 'WUB':
+                raise ConnectionError('Failed')
+            return [dict(CARD_DATA[0], color=key)]
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = ParquetDataStore()
+            saves = list()
+            save_card_data = store.save_card_data
+            store.save_card_data = lambda folder, card_data: saves.append(list(card_data)) or \
+                save_card_data(folder, card_data)
+
+            # The day's data should be written once, including what was fetched before an error stopped the fetch.
+            loader = self.get_offline_loader(temp_dir, fetch, store)
+            self.assertRaises(ConnectionError, loader._get_data, COLOR_COMBINATIONS, False)
+            colors = COLOR_COMBINATIONS[:COLOR_COMBINATIONS.index('WUB')]
+            self.assertEqual(saves, [colors])
+            self.assertEqual(list(store.load_card_data(loader.get_folder_path(), COLOR_COMBINATIONS)), colors)
+
+            # Once everything is saved, it should be loaded as it was stored, without being made into json objects.
+            loader._fetch_data = lambda url, key: [dict(CARD_DATA[0], color=key)]
+            self.assertIsInstance(loader._get_data(COLOR_COMBINATIONS, False)[0], dict)
+            card_data = loader._get_data(COLOR_COMBINATIONS, False)[0]
+            self.assertIsInstance(card_data, CardTable)
+            self.assertEqual(list(card_data), COLOR_COMBINATIONS)
+            self.assertEqual(len(saves), 2)
+
     def test_file_validation(self):
         loader = DataLoader('DOM', 'PremierDraft', date(2022, 4, 1))
         self.assertEqual(loader.get_last_summary_update_time().date(), date(2022, 4, 24))
@@ -404,6 +949,80 @@ class TestDataLoader(unittest.TestCase):
         self.validate_returned_json(data, META_KEYS)
 
 
+class TestSummaryAggregator(unittest.TestCase):
+    def setUp(self):
+        self.aggregator = SummaryAggregator()
+        self.day_card_data = {'': CARD_DATA, 'WU': CARD_DATA[1:]}
+        self.aggregator.add_day('2023-02-08', self.day_card_data, META_DATA)
+
+    def test_add_day(self):
+        # A single day should match the data it was built from.
+        card_data = self.aggregator.get_card_data()
+        self.assertEqual(list(card_data), ['', 'WU'])
+        for key in CARD_KEYS:
+            self.assertAlmostEqual(card_data[''][0][key], CARD_DATA[0][key])
+        self.assertEqual(self.aggregator.get_meta_data(), META_DATA)
+
+        # Adding the same data again shouldn't change anything.
+        self.assertFalse(self.aggregator.add_day('2023-02-08', self.day_card_data, META_DATA))
+
+        # Counts should be summed, and averages weighted by their counts.
+        other_card = dict(CARD_DATA[0], game_count=1, win_rate=1.0, ever_drawn_win_rate=None)
+        self.assertTrue(self.aggregator.add_day('2023-02-09', {'': [other_card]}, META_DATA[:1]))
+        self.assertEqual(self.aggregator.DATES, ['2023-02-08', '2023-02-09'])
+        card = self.aggregator.get_card_data()[''][0]
+        self.assertEqual(card['game_count'], 20)
+        self.assertAlmostEqual(card['win_rate'], (19 * CARD_DATA[0]['win_rate'] + 1) / 20)
+        self.assertEqual(card['seen_count'], 2 * CARD_DATA[0]['seen_count'])
+        self.assertAlmostEqual(card['avg_seen'], CARD_DATA[0]['avg_seen'])
+        self.assertAlmostEqual(card['ever_drawn_win_rate'], CARD_DATA[0]['ever_drawn_win_rate'])
+        self.assertAlmostEqual(card['drawn_improvement_win_rate'],
+                               card['ever_drawn_win_rate'] - card['never_drawn_win_rate'])
+        self.assertEqual(self.aggregator.get_meta_data()[0]['games'], 2 * META_DATA[0]['games'])
+
+    def test_replace_day(self):
+        # Replacing a day's data should take the old data back out.
+        self.aggregator.add_day('2023-02-08', {'': CARD_DATA[:1]}, META_DATA[:1])
+        card_data = self.aggregator.get_card_data()
+        self.assertEqual(card_data[''][0]['game_count'], CARD_DATA[0]['game_count'])
+        self.assertEqual(card_data[''][1]['game_count'], 0)
+        self.assertIsNone(card_data[''][1]['win_rate'])
+        self.assertEqual(card_data['WU'][0]['seen_count'], 0)
+        self.assertEqual(self.aggregator.get_meta_data()[1]['wins'], 0)
+
+        self.aggregator.reset()
+        self.assertEqual(self.aggregator.DATES, list())
+        self.assertEqual(self.aggregator.get_card_data(), dict())
+
+
+class TestCumulativeFrame(unittest.TestCase):
+    def setUp(self):
+        index = MultiIndex.from_tuples([('2023-02-08', '', 'A'), ('2023-02-08', 'W', 'A'), ('2023-02-09', '', 'A'),
+                                        ('2023-02-09', '', 'B'), ('2023-02-10', 'W', 'A')],
+                                       names=['Date', 'Deck Colors', 'Name'])
+        self.frame = DataFrame({'Games': [1, 2, 4, 8, None], 'Rarity': ['C', 'C', 'C', 'R', 'U']}, index=index)
+        self.cumulative = CumulativeFrame(self.frame, ['Games'], ['Rarity'],
+                                          lambda groups: groups.get_level_values('Name').argsort(kind='stable'))
+
+    def test_sum(self):
+        summed = self.cumulative.sum()
+        self.assertEqual(list(summed.index), [('', 'A'), ('W', 'A'), ('', 'B')])
+        self.assertEqual(list(summed['Games']), [5, 2, 8])
+        self.assertEqual(list(summed['Rarity']), ['C', 'U', 'R'])
+
+        # Groups without data in the range should be left out.
+        summed = self.cumulative.sum(slice('2023-02-09', '2023-02-10'))
+        self.assertEqual(list(summed['Games']), [4, 0, 8])
+        self.assertEqual(list(self.cumulative.sum(slice('2023-02-10', None)).index), [('W', 'A')])
+        self.assertEqual(len(self.cumulative.sum(slice('2023-02-11', '2023-02-12'))), 0)
+
+        # Lists of dates and slices of groups should work like they do for `loc`.
+        summed = self.cumulative.sum(['2023-02-08', '2023-02-10'], (['W'], slice(None)))
+        self.assertEqual(list(summed['Games']), [2])
+        summed = self.cumulative.sum(slice(None), (slice(None), ['B']))
+        self.assertEqual(list(summed.index), [('', 'B')])
+
+
 class TestLoadedData(unittest.TestCase):
     def validate_returned_json(self, data, keys):
         self.assertIsInstance(data, list)
@@ -487,6 +1106,91 @@ class TestDataFramer(unittest.TestCase):
         self.assertListEqual(list(framer.SINGLE_ARCHETYPE_HISTORY_FRAME.columns), self.ARCHETYPE_COLS)
         self.assertListEqual(list(framer.CARD_HISTORY_FRAME.columns), self.CARD_COLS)
 
+        # Calling it again with no new data should leave the frames as they are.
+        card_frame = framer.CARD_HISTORY_FRAME
+        framer.gen_hist()
+        self.assertIs(framer.CARD_HISTORY_FRAME, card_frame)
+
+    def test_snapshot_keys(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            def gen_framer(card_info_fingerprint):
+                framer = DataFramer.__new__(DataFramer)
+                framer._format_metadata = SimpleNamespace(CARD_INFO_FINGERPRINT=card_info_fingerprint)
+                framer._snapshot_key = '1-full'
+                framer._HIST_SNAPSHOT = FrameSnapshot(temp_dir, 'history_frames', framer._snapshot_key)
+                framer._SUMMARY_SNAPSHOT = FrameSnapshot(temp_dir, 'summary_frames', framer._snapshot_key)
+                framer._update_snapshot_keys()
+                return framer
+
+            framer = gen_framer('a')
+            self.assertEqual(framer._HIST_SNAPSHOT.KEY, '1-full-a')
+            framer._HIST_SNAPSHOT.FINGERPRINTS = {'2023-02-08': 'x'}
+            framer._HIST_SNAPSHOT.save()
+            self.assertTrue(gen_framer('a')._HIST_SNAPSHOT.load())
+
+            # If the card info has changed, the saved frames were made with the old info, so can't be used.
+            framer = gen_framer('b')
+            self.assertFalse(framer._HIST_SNAPSHOT.load())
+
+            # The same goes for a framer whose card info changes after it has loaded a snapshot.
+            framer = gen_framer('a')
+            framer._HIST_SNAPSHOT.load()
+            framer._format_metadata.CARD_INFO_FINGERPRINT = 'b'
+            framer._update_snapshot_keys()
+            self.assertEqual(framer._HIST_SNAPSHOT.FINGERPRINTS, dict())
+
+    def test_gen_hist_concurrently(self):
+        dates = ['2023-02-08', '2023-02-09', '2023-02-10', '2023-02-11', '2023-02-12']
+        hist_card = {date: {'': CARD_DATA[::(-1) ** i], 'WU': CARD_DATA[i % 2:]} for i, date in enumerate(dates)}
+        hist_meta = {date: META_DATA for date in dates}
+        card_info = DataFrame({'CMC': [2, 3]}, index=Index(['Healing Grace', 'History of Benalia'], name='Name'))
+        card_info = card_info.reindex(columns=CARD_INFO_COL_NAMES)
+
+        # The framers are made without loading any data, and split the dates between two worker processes.
+        def gen_framer(concurrent: bool, compact: bool = False) -> DataFramer:
+            framer = DataFramer.__new__(DataFramer)
+            framer._SET, framer._FORMAT = 'DOM', 'PremierDraft'
+            framer._FETCHER = SimpleNamespace(get_historic_data=lambda *args: (hist_card, hist_meta))
+            framer._format_metadata = SimpleNamespace(CARD_INFO_FRAME=card_info)
+            framer.FRAME_SNAPSHOTS = False
+            framer.COMPACT_FRAMES = compact
+            framer.PANDAFY_WORKERS = 2
+            framer.concurrent = concurrent
+            framer.load_history = True
+            for name in DataFramer.HISTORY_FRAME_NAMES:
+                setattr(framer, f'_{name}', None)
+            framer._HIST_CARD_SOURCES, framer._HIST_META_SOURCES = dict(), dict()
+            framer.gen_hist()
+            return framer
+
+        # Making the frames in worker processes should give exactly the same frames as making them all at once.
+        for compact in [False, True]:
+            serial, concurrent = gen_framer(False, compact), gen_framer(True, compact)
+            for name in DataFramer.HISTORY_FRAME_NAMES:
+                self.assertIsInstance(getattr(concurrent, name), DataFrame)
+                assert_frame_equal(getattr(concurrent, name), getattr(serial, name))
+            dates_made = concurrent.CARD_HISTORY_FRAME.index.get_level_values('Date').unique()
+            self.assertListEqual([str(date)[:10] for date in dates_made], dates)
+
+    def test_merge_dates(self):
+        def gen_frame(dates, value):
+            return DataFrame({'Wins': [value] * len(dates)},
+                             index=MultiIndex.from_tuples([(d, 'WU') for d in dates], names=['Date', 'Name']))
+
+        frame = DataFramer._merge_dates(None, gen_frame(['2023-02-09', '2023-02-10'], 1), list())
+        self.assertEqual(list(frame.index.get_level_values('Date')), ['2023-02-09', '2023-02-10'])
+
+        # Dates added out of order should be sorted in, and replaced dates should have their rows swapped out.
+        frame = DataFramer._merge_dates(frame, gen_frame(['2023-02-08', '2023-02-10'], 2), ['2023-02-10'])
+        self.assertEqual(list(frame.index.get_level_values('Date')), ['2023-02-08', '2023-02-09', '2023-02-10'])
+        self.assertEqual(list(frame['Wins']), [2, 1, 2])
+
+        # Rows within a date should be sorted too, so the frame can be sliced by ranges of labels.
+        index = MultiIndex.from_tuples([('2023-02-11', 'WU'), ('2023-02-11', 'UB')], names=['Date', 'Name'])
+        frame = DataFramer._merge_dates(frame, DataFrame({'Wins': [3, 4]}, index=index), list())
+        self.assertTrue(frame.index.is_monotonic_increasing)
+        self.assertEqual(list(frame['Wins']), [2, 1, 2, 4, 3])
+
     def test_gen_summary(self):
         framer = DataFramer('DOM', 'PremierDraft')
         framer.gen_summary()
@@ -500,6 +1204,87 @@ class TestDataFramer(unittest.TestCase):
 
 
 class TestFramedData(unittest.TestCase):
+    @staticmethod
+    def _gen_card_framer() -> FramedData:
+        """
+        Makes a framer with a small card history, of three dates, two deck colours and two cards, without loading any
+        data. Every count differs, and one card wasn't played on one day, so its win rates there are missing.
+        """
+        index = MultiIndex.from_product([['2023-02-08', '2023-02-09', '2023-02-10'], ['', 'W'], ['A', 'B']],
+                                        names=['Date', 'Deck Colors', 'Name'])
+        rows = len(index)
+        history = DataFrame({col: [(i + 1) * (j + 2) for i in range(rows)]
+                             for j, col in enumerate(FramedData._COUNT_COLS)}, index=index)
+        for j, col in enumerate(WEIGHTED_STAT_DICT):
+            history[col] = [((i * 7 + j * 3) % 11) / 11 for i in range(rows)]
+        history.loc[('2023-02-09', 'W', 'B'), ['# GND', 'GND WR']] = [0, float('nan')]
+        history['Color'] = ['W' if name == 'A' else 'U' for name in index.get_level_values('Name')]
+        history['Rarity'] = ['C' if name == 'A' else 'R' for name in index.get_level_values('Name')]
+
+        framer = FramedData.__new__(FramedData)
+        framer.DATA = SimpleNamespace(CARD_HISTORY_FRAME=history)
+        framer._frame_order = lambda idx: sorted(range(len(idx)), key=lambda i: idx[i])
+        framer._card_cumulative = None
+        framer._card_cumulative_source = None
+        framer._lookups = dict()
+        return framer
+
+    @staticmethod
+    def _aggregate_per_group(frame: DataFrame) -> DataFrame:
+        """ Aggregates a card frame one group at a time, the way `aggregate_card_frame` used to. """
+        rows = dict()
+        for key, group in frame.groupby(level=['Deck Colors', 'Name']):
+            row = {col: group[col].sum() for col in FramedData._COUNT_COLS}
+            for col, count_col in WEIGHTED_STAT_DICT.items():
+                row[col] = (group[col] * group[count_col]).sum() / row[count_col]
+            row['IWD'] = row['GIH WR'] - row['GND WR']
+            row['Color'] = group['Color'].max()
+            row['Rarity'] = group['Rarity'].max()
+            rows[key] = row
+        aggregated = DataFrame.from_dict(rows, orient='index')[FramedData.SUMMARY_CARD_COLS]
+        aggregated.index.names = ['Deck Colors', 'Name']
+        return aggregated
+
+    def test_aggregate_card_frame(self):
+        framer = self._gen_card_framer()
+        history = framer.DATA.CARD_HISTORY_FRAME
+        expected = self._aggregate_per_group(history)
+
+        aggregated = framer.aggregate_card_frame(history)
+        self.assertListEqual(list(aggregated.index), sorted(expected.index))
+        assert_frame_equal(aggregated, expected.sort_index(), check_dtype=False)
+
+        # Compact frames have their colours and rarities as categories, which should be kept.
+        compact = history.astype({'Color': 'category', 'Rarity': 'category'})
+        aggregated = framer.aggregate_card_frame(compact)
+        self.assertEqual(aggregated['Rarity'].dtype, 'category')
+        assert_frame_equal(aggregated.astype({'Color': object, 'Rarity': object}), expected.sort_index(),
+                           check_dtype=False)
+
+    def test_summarize_card_frame(self):
+        framer = self._gen_card_framer()
+        history = framer.DATA.CARD_HISTORY_FRAME
+        dates = ['2023-02-09', '2023-02-10']
+        part = history.loc[dates]
+
+        # The sums over a range of dates should be the same as grouping and summing the rows in it.
+        summarized = framer.summarize_card_frame(date=tuple(dates)).sort_index()
+        summed = part.groupby(level=['Deck Colors', 'Name']).sum(numeric_only=True)
+        assert_frame_equal(summarized[FramedData._COUNT_COLS], summed[FramedData._COUNT_COLS], check_dtype=False)
+        for col, count_col in WEIGHTED_STAT_DICT.items():
+            weighted = (part[col] * part[count_col]).groupby(level=['Deck Colors', 'Name']).sum()
+            assert_series_equal(summarized[col], weighted / summed[count_col], check_names=False)
+        assert_frame_equal(summarized, framer.aggregate_card_frame(part).sort_index(), check_dtype=False)
+
+        # As should those over only some of the cards and deck colours.
+        summarized = framer.summarize_card_frame(name='B', deck_color='W', date=tuple(dates))
+        self.assertListEqual(list(summarized.index), [('W', 'B')])
+        self.assertListEqual(list(summarized['# GP']), [summed.loc[('W', 'B'), '# GP']])
+
+        # Without any history, there's nothing to summarize.
+        framer.DATA.CARD_HISTORY_FRAME = None
+        self.assertIsNone(framer.summarize_card_frame(date=tuple(dates)))
+
     # TODO: Complete this test.
     def test_(self):
         framer = FramedData('DOM', 'PremierDraft')
@@ -515,3 +1300,52 @@ class TestFramedData(unittest.TestCase):
         # framer.aggregate_card_frame()
 
         self.assertTrue(False)
+
+    def test_aggregate_archetype_frame(self):
+        index = MultiIndex.from_tuples([('2023-02-08', 'WU'), ('2023-02-08', 'WU'), ('2023-02-08', 'UB'),
+                                        ('2023-02-09', 'UB'), ('2023-02-09', 'WU')], names=['Date', 'Name'])
+        history = DataFrame({'Colors': ['WU', 'WU', 'UB', 'UB', 'WU'], 'Splash': [False, True, False, False, False],
+                             'Wins': [6, 1, 2, 3, 4], 'Games': [10, 2, 5, 5, 10]}, index=index)
+
+        # The framer only needs its history for aggregating, so it's made without loading any data.
+        framer = FramedData.__new__(FramedData)
+        framer.DATA = SimpleNamespace(SINGLE_ARCHETYPE_HISTORY_FRAME=history)
+        framer._archetype_cumulatives = dict()
+
+        aggregated = framer.aggregate_archetype_winrate_data(history)
+        self.assertListEqual(list(aggregated.columns), ['Colors', 'Splash', 'Wins', 'Games', 'Win %'])
+        self.assertListEqual(list(aggregated.index), ['WU', 'WU', 'UB'])
+        self.assertListEqual(list(aggregated['Splash']), [False, True, False])
+        self.assertListEqual(list(aggregated['Wins']), [10, 1, 5])
+        self.assertListEqual(list(aggregated['Win %']), [50.0, 50.0, 50.0])
+
+        # Summing from the cumulative sums should give the same results.
+        summarized = framer.summarize_deck_archetype_frame()
+        self.assertTrue(summarized.equals(aggregated))
+        summarized = framer.summarize_deck_archetype_frame(deck_color='Dimir', date='2023-02-09')
+        self.assertListEqual(list(summarized['Wins']), [3])
+        self.assertListEqual(list(summarized['Win %']), [60.0])
+
+        # Without any history, there's nothing to summarize.
+        framer.DATA.SINGLE_ARCHETYPE_HISTORY_FRAME = None
+        self.assertIsNone(framer.summarize_deck_archetype_frame())
+
+    def test_select(self):
+        index = MultiIndex.from_tuples([('2023-02-08', '', 'A'), ('2023-02-08', 'W', 'A'), ('2023-02-08', 'W', 'B'),
+                                        ('2023-02-09', '', 'A'), ('2023-02-09', 'W', 'B')],
+                                       names=['Date', 'Deck Colors', 'Name'])
+        history = DataFrame({'# GP': [1, 2, 4, 8, 16]}, index=index)
+        framer = FramedData.__new__(FramedData)
+        framer.DATA = SimpleNamespace(CARD_HISTORY_FRAME=history)
+        framer._lookups = dict()
+
+        # Single labels are looked up by position, and should give the same rows as `loc`.
+        for keys in [(['2023-02-08'], slice(None), ['A']), (slice(None), ['W'], ['B']), (['2023-02-09'], [''], ['A'])]:
+            self.assertIsNotNone(IndexLookup(history.index).get_positions(keys))
+            self.assertTrue(framer._select('CARD_HISTORY_FRAME', *keys).equals(history.loc(axis=0)[keys]))
+
+        # Ranges, and labels which aren't in the frame, should fall back to `loc`.
+        self.assertIsNone(IndexLookup(history.index).get_positions((slice('2023-02-08', '2023-02-09'), ['W'], ['B'])))
+        self.assertIsNone(IndexLookup(history.index).get_positions((slice(None), ['U'], slice(None))))
+        self.assertListEqual(list(framer._select('CARD_HISTORY_FRAME', slice(None), ['W'], ['A', 'B'])['# GP']),
+                             [2, 4, 16])
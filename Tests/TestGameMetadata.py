@@ -1,5 +1,6 @@
 import unittest
 from datetime import date, datetime
+from pandas import MultiIndex, DataFrame, Index
 
 from core.wubrg import COLOR_COMBINATIONS
 from core.game_metadata import SetMetadata, FormatMetadata, Card
@@ -31,6 +32,27 @@ class TestSetMetadata(unittest.TestCase):
     def test_get_metadata_invalid_constructor(self):
         self.assertRaises(Exception, SetMetadata, object(), 'NEO')
 
+    def test_card_info_frame(self):
+        meta = SetMetadata.get_metadata('NEO')
+        frame = meta.CARD_INFO_FRAME
+        self.assertEqual(len(frame), len(meta.CARD_DICT))
+        self.assertListEqual(list(frame.columns), list(SetMetadata.CARD_INFO_ATTRS))
+        self.assertEqual(frame.loc['Virus Beetle', 'CMC'], meta.CARD_DICT['Virus Beetle'].CMC)
+        self.assertIs(meta.CARD_INFO_FRAME, frame)
+
+    def test_card_info_fingerprint(self):
+        frame = DataFrame({'CMC': [1, 3], 'Types': [['Creature'], ['Instant']]},
+                          index=Index(['Virus Beetle', 'Tamiyo\'s Safekeeping'], name='Name'))
+        fingerprint = SetMetadata.gen_card_info_fingerprint(frame)
+        self.assertEqual(SetMetadata.gen_card_info_fingerprint(frame.copy()), fingerprint)
+
+        # Any change to the values, the cards or the columns should change the fingerprint.
+        changed = frame.assign(Types=[['Artifact', 'Creature'], ['Instant']])
+        self.assertNotEqual(SetMetadata.gen_card_info_fingerprint(changed), fingerprint)
+        self.assertNotEqual(SetMetadata.gen_card_info_fingerprint(frame.rename(index={'Virus Beetle': 'Ooze'})),
+                            fingerprint)
+        self.assertNotEqual(SetMetadata.gen_card_info_fingerprint(frame.rename(columns={'CMC': 'MV'})), fingerprint)
+
     def test_find_card(self):
         meta = SetMetadata.get_metadata('NEO')
         card_1 = meta.find_card('Boseiju Reaches Skyward')
@@ -100,6 +122,17 @@ class TestSetMetadata(unittest.TestCase):
         self.assertEqual(meta._frame_order_compare(tup_3, tup_2), -31)
         self.assertEqual(meta._frame_order_compare(tup_2, tup_3), 31)
 
+    def test_get_frame_order(self):
+        meta = SetMetadata.get_metadata('NEO')
+        pairs = [(COLOR_COMBINATIONS[-1], meta.CARD_LIST[-1].NAME), (COLOR_COMBINATIONS[0], meta.CARD_LIST[2].NAME),
+                 (COLOR_COMBINATIONS[0], 'Not A Card'), (COLOR_COMBINATIONS[0], meta.CARD_LIST[0].NAME)]
+
+        # The order should match sorting with FRAME_ORDER_KEY, with unknown cards after the known ones.
+        order = meta.get_frame_order(MultiIndex.from_tuples(pairs))
+        self.assertEqual(list(order), [3, 1, 2, 0])
+        known = [pair for pair in pairs if pair[1] != 'Not A Card']
+        self.assertEqual([pairs[pos] for pos in order if pos != 2], sorted(known, key=meta.FRAME_ORDER_KEY))
+
 
 class TestFormatMetadata(unittest.TestCase):
     def test_get_metadata(self):
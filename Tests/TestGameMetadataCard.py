@@ -1,5 +1,9 @@
 import unittest
 from typing import Union
+from types import SimpleNamespace
+import json
+import os
+import tempfile
 
 from core.data_requesting import RequestScryfall
 from core.game_metadata import CardLayouts, Card, CardFace, CardManager
@@ -1381,6 +1385,47 @@ class TestCardManager(unittest.TestCase):
         CardManager.load_cache_from_file()
         self.assertGreaterEqual(len(CardManager.CARDS), 5640)
 
+    def test_from_broken_file(self):
+        card_json = {'object': 'card', 'id': 'a', 'oracle_id': 'b', 'name': 'Virus Beetle', 'layout': 'normal',
+                     'mana_cost': '{1}{B}', 'cmc': 2.0, 'type_line': 'Artifact Creature — Insect',
+                     'oracle_text': 'When Virus Beetle enters the battlefield, each opponent discards a card.',
+                     'colors': ['B'], 'color_identity': ['B'], 'keywords': [], 'power': '1', 'toughness': '1',
+                     'rarity': 'common', 'set': 'neo', 'collector_number': '128', 'digital': False}
+        cache_dir, requester = CardManager.CACHE_DIR, CardManager.REQUESTER
+        requests = list()
+
+        def get_arena_cards():
+            requests.append('arena')
+            return [card_json]
+
+        try:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                CardManager.CACHE_DIR = temp_dir
+                CardManager.REQUESTER = SimpleNamespace(get_arena_cards=get_arena_cards)
+                CardManager.flush_cache()
+
+                # A missing cache isn't generated, as that's slow.
+                self.assertFalse(CardManager.load_cache_from_file())
+                self.assertListEqual(requests, list())
+
+                # A cut off cache shouldn't load only some of its cards, but be generated again, and then loaded.
+                with open(os.path.join(temp_dir, CardManager.CACHE_FILE_ARENA), 'w') as f:
+                    f.write(json.dumps([card_json, dict(card_json, name='Ninja Teen')])[:-20])
+                self.assertTrue(CardManager.load_cache_from_file())
+                self.assertListEqual(requests, ['arena'])
+                self.assertListEqual(list(CardManager.CARDS), ['Virus Beetle'])
+
+                # If it's still broken after trying to generate it again, nothing is loaded.
+                CardManager.flush_cache()
+                CardManager.REQUESTER = SimpleNamespace(get_arena_cards=lambda: [card_json, object()])
+                with open(os.path.join(temp_dir, CardManager.CACHE_FILE_ARENA), 'w') as f:
+                    f.write('[{"name": ')
+                self.assertFalse(CardManager.load_cache_from_file())
+                self.assertDictEqual(CardManager.CARDS, dict())
+        finally:
+            CardManager.CACHE_DIR, CardManager.REQUESTER = cache_dir, requester
+            CardManager.flush_cache()
+
     def test_from_set(self):
         cards = CardManager.from_set('NEO')
         self.assertIsInstance(cards, dict)
@@ -1390,6 +1435,22 @@ class TestCardManager(unittest.TestCase):
         card = CardManager.from_name('Shock')
         self.assertIsInstance(card, Card)
 
+    def test_from_names(self):
+        # Exact names are found in a batch, while misspelled names fall back to a fuzzy search.
+        names = ['Shock', 'Virus Beetle', 'Vires Beetle', 'Fable of the Mirror-Breaker', 'Shock',
+                 'Supercalifragilisticexpialidocious']
+        cards = CardManager.from_names(names)
+        self.assertEqual(len(cards), len(names))
+        self.assertEqual(cards[0].NAME, 'Shock')
+        self.assertIs(cards[1], cards[2])
+        self.assertEqual(cards[3].NAME, 'Fable of the Mirror-Breaker')
+        self.assertIs(cards[0], cards[4])
+        self.assertIsNone(cards[5])
+
+        # The cards should all be cached, and match a single lookup.
+        self.assertListEqual(CardManager.from_names(names), cards)
+        self.assertIs(CardManager.from_name('Virus Beetle'), cards[1])
+
     def test_relay_call(self):
         card_name = 'The Kami War'
         card_1 = CardManager.from_name(card_name)
@@ -1,13 +1,21 @@
 import datetime
+import time
 from typing import Optional
 import unittest
 import json
+import os
+import tempfile
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from requests import Response
 
 from core.utilities import validate_json
 from core.wubrg import COLOR_COMBINATIONS
-from core.data_requesting.utils.settings import TRIES, FAIL_DELAY, SUCCESS_DELAY
-from core.data_requesting import Requester, RequestScryfall, Request17Lands
+from core.data_requesting.utils.settings import TRIES, FAIL_DELAY, SUCCESS_DELAY, RATE_LIMITS, DEFAULT_RATE_LIMIT
+from core.data_requesting import Requester, RequestScryfall, Request17Lands, SessionManager, RateLimiter, RetryPolicy, \
+    ResponseCache, AsyncRequester, AsyncRequest17Lands, AsyncRequestScryfall, SingleFlight, AsyncSingleFlight, \
+    RequestTelemetry
 
 from Tests.settings import _tries, _fail_delay, _success_delay, TEST_MASS_DATA_PULL
 
@@ -43,8 +51,49 @@ class TestRequester(unittest.TestCase):
         ret = self.REQUESTER.request('Hello World')
         self.assertIsNone(ret)
 
+    def test_resolve_cached(self):
+        cached, fresh, not_modified = Response(), Response(), Response()
+        cached.status_code, fresh.status_code, not_modified.status_code = 200, 200, 304
+
+        # A '304' uses the cached copy, and a new valid response should be stored, but only if there's a cache.
+        with tempfile.TemporaryDirectory() as temp_dir:
+            requester = Requester(cache=ResponseCache(temp_dir))
+            self.assertEqual(requester._resolve_cached('url', not_modified, cached), (cached, False))
+            self.assertEqual(requester._resolve_cached('url', fresh, cached), (fresh, True))
+            self.assertEqual(requester._resolve_cached('url', fresh, None, cacheable=False), (fresh, False))
+        self.assertEqual(self.REQUESTER._resolve_cached('url', fresh, None), (fresh, False))
+
+    def test_shared_json(self):
+        # Callers sharing a request should each get their own json, so changing one doesn't change the others.
+        requester = Requester(_tries, _fail_delay, _success_delay)
+        calls = list()
+        release = threading.Event()
+
+        def slow_response(composed_url, payload=None):
+            calls.append(composed_url)
+            release.wait(1)
+            response = Response()
+            response.status_code, response._content = 200, b'[{"name": "Virus Beetle"}]'
+            return response
+
+        requester._get_response = slow_response
+        shared = Requester._RESPONSE_FLIGHTS.shared
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [executor.submit(requester.get_json_response, 'https://example.com/shared') for _ in range(2)]
+            deadline = time.time() + 1
+            while Requester._RESPONSE_FLIGHTS.shared < shared + 1 and time.time() < deadline:
+                time.sleep(0.01)
+            release.set()
+            first, second = [future.result() for future in futures]
+
+        first[0]['name'] = 'Changed'
+        second[0]['err_msg'] = 'Error'
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(first, [{'name': 'Changed'}])
+        self.assertEqual(second, [{'name': 'Virus Beetle', 'err_msg': 'Error'}])
+
     def test_get_response(self):
-        # Use a url which doesn't return a supported code to test the retry mechanism.
+        # Use a url which doesn't return a supported code. As it's a hard failure (400), it won't be retried.
         response = self.REQUESTER.get_response('https://api.scryfall.com/')
         self.assertIsNone(response)
 
@@ -117,6 +166,333 @@ class TestRequester(unittest.TestCase):
         self.assertIsInstance(response, list)
         self.assertIsInstance(response[0], dict)
 
+    def test_download_file(self):
+        # A file should be written to disk, with the same contents as the response.
+        url = 'https://api.scryfall.com/cards/5a70e8fa-b71d-441e-b049-dacb09a9a7af'
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self.assertTrue(self.REQUESTER.download_file(url, temp_dir, 'card.json', chunk_size=256))
+            with open(os.path.join(temp_dir, 'card.json'), 'r') as f:
+                self.assertEqual(json.load(f)['name'], 'Virus Beetle')
+
+            # A failed download shouldn't leave any files behind.
+            self.assertFalse(self.REQUESTER.download_file('https://api.scryfall.com/', temp_dir, 'bad.json'))
+            self.assertListEqual(os.listdir(temp_dir), ['card.json'])
+
+
+class TestSessionManager(unittest.TestCase):
+    def setUp(self):
+        SessionManager.close_all()
+
+    def tearDown(self):
+        SessionManager.close_all()
+
+    def test_get_session(self):
+        # Urls on the same host should share a session, regardless of path or case.
+        session_1 = SessionManager.get_session('https://api.scryfall.com/cards/named')
+        session_2 = SessionManager.get_session('https://API.scryfall.com/sets')
+        session_3 = SessionManager.get_session('https://www.17lands.com/data/colors')
+        self.assertIs(session_1, session_2)
+        self.assertIsNot(session_1, session_3)
+        self.assertSetEqual(set(SessionManager.get_stats()), {'api.scryfall.com', 'www.17lands.com'})
+
+    def test_close_session(self):
+        session_1 = SessionManager.get_session('https://api.scryfall.com/cards/named')
+        SessionManager.close_session('https://api.scryfall.com/sets')
+        session_2 = SessionManager.get_session('https://api.scryfall.com/cards/named')
+        self.assertIsNot(session_1, session_2)
+
+    def test_configure(self):
+        SessionManager.configure(pool_maxsize=3)
+        self.assertEqual(SessionManager.POOL_MAXSIZE, 3)
+        adapter = SessionManager.get_session('https://api.scryfall.com/').get_adapter('https://api.scryfall.com/')
+        self.assertEqual(adapter._pool_maxsize, 3)
+        SessionManager.configure()
+
+    def test_stats_empty(self):
+        # A session which hasn't sent anything shouldn't report any connections.
+        SessionManager.get_session('https://api.scryfall.com/')
+        stats = SessionManager.get_stats()['api.scryfall.com']
+        self.assertEqual(stats['connections'], 0)
+        self.assertEqual(stats['requests'], 0)
+        self.assertEqual(stats['reused'], 0)
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_init(self):
+        self.assertRaises(ValueError, RateLimiter, 0)
+        self.assertRaises(ValueError, RateLimiter, 1, 0)
+
+    def test_reserve(self):
+        # The initial burst should be free, after which each token is spaced out by the rate.
+        limiter = RateLimiter(10, 2)
+        self.assertEqual(limiter.reserve(), 0)
+        self.assertEqual(limiter.reserve(), 0)
+        self.assertAlmostEqual(limiter.reserve(), 0.1, delta=0.01)
+        self.assertAlmostEqual(limiter.reserve(), 0.2, delta=0.01)
+
+    def test_get_limiter(self):
+        # Limiters are shared per host, and use the configured rate for that host.
+        limiter_1 = RateLimiter.get_limiter('https://api.scryfall.com/cards/named')
+        limiter_2 = RateLimiter.get_limiter('https://api.scryfall.com/sets')
+        limiter_3 = RateLimiter.get_limiter('https://www.17lands.com/data/colors')
+        self.assertIs(limiter_1, limiter_2)
+        self.assertIsNot(limiter_1, limiter_3)
+        self.assertEqual((limiter_1.RATE, limiter_1.BURST), RATE_LIMITS['api.scryfall.com'])
+
+        # Unknown hosts fall back to the default, and hosts can be re-configured.
+        limiter_4 = RateLimiter.get_limiter('https://example.com/')
+        self.assertEqual((limiter_4.RATE, limiter_4.BURST), DEFAULT_RATE_LIMIT)
+        RateLimiter.configure('Example.com', 5, 3)
+        limiter_5 = RateLimiter.get_limiter('https://example.com/')
+        self.assertEqual((limiter_5.RATE, limiter_5.BURST), (5, 3))
+        del RateLimiter.LIMITERS['example.com']
+
+    def test_acquire(self):
+        limiter = RateLimiter(20)
+        start = time.monotonic()
+        for _ in range(3):
+            limiter.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+
+class TestRetryPolicy(unittest.TestCase):
+    @staticmethod
+    def _gen_response(status_code: int, retry_after: str = None) -> Response:
+        response = Response()
+        response.status_code = status_code
+        if retry_after is not None:
+            response.headers['Retry-After'] = retry_after
+        return response
+
+    def test_init(self):
+        self.assertRaises(ValueError, RetryPolicy, jitter=1.5)
+
+    def test_should_retry(self):
+        # Connection errors and temporary failures are retried, while hard failures are not.
+        policy = RetryPolicy()
+        self.assertTrue(policy.should_retry(None))
+        self.assertTrue(policy.should_retry(429))
+        self.assertTrue(policy.should_retry(503))
+        self.assertFalse(policy.should_retry(400))
+        self.assertFalse(policy.should_retry(404))
+
+    def test_get_delay(self):
+        # Without jitter, delays double each attempt, up to the cap.
+        policy = RetryPolicy(base_delay=1, max_delay=5, multiplier=2, jitter=0)
+        self.assertEqual([policy.get_delay(n) for n in range(1, 6)], [1, 2, 4, 5, 5])
+
+        # With jitter, delays are randomly shortened, but never by more than the jitter allows.
+        policy = RetryPolicy(base_delay=4, max_delay=60, multiplier=2, jitter=0.5)
+        for _ in range(20):
+            delay = policy.get_delay(1)
+            self.assertGreaterEqual(delay, 2)
+            self.assertLessEqual(delay, 4)
+
+    def test_retry_after(self):
+        # A server's 'Retry-After' takes priority over the backoff, whether in seconds or as a date.
+        policy = RetryPolicy(base_delay=1, max_delay=60, jitter=0)
+        self.assertEqual(policy.get_delay(1, self._gen_response(429, '30')), 30)
+        self.assertEqual(policy.get_delay(1, self._gen_response(503, 'Wed, 21 Oct 2015 07:28:00 GMT')), 0)
+        future = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(seconds=20)
+        header = future.strftime('%a, %d %b %Y %H:%M:%S GMT')
+        self.assertAlmostEqual(policy.get_delay(1, self._gen_response(429, header)), 20, delta=2)
+
+        # Long waits, whether in seconds or as a date, are capped.
+        self.assertEqual(policy.get_delay(1, self._gen_response(429, '86400')), 60)
+        future = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(days=30)
+        self.assertEqual(policy.get_delay(1, self._gen_response(429, future.strftime('%a, %d %b %Y %H:%M:%S GMT'))), 60)
+
+        # Missing or malformed headers fall back to the backoff.
+        self.assertEqual(policy.get_delay(2, self._gen_response(503)), 2)
+        self.assertEqual(policy.get_delay(2, self._gen_response(503, 'Soon')), 2)
+
+
+class TestResponseCache(unittest.TestCase):
+    URL = 'https://www.17lands.com/color_ratings/data?expansion=ONE&start_date=2023-02-07&end_date=2023-03-01'
+
+    @staticmethod
+    def _gen_response(headers: dict[str, str]) -> Response:
+        response = Response()
+        response.status_code = 200
+        response.encoding = 'utf-8'
+        response.headers.update(headers)
+        response._content = b'[{"name": "Ozolith, the Shattered Spire"}]'
+        return response
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = ResponseCache(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_store_and_load(self):
+        # Responses without validators can't be revalidated, so aren't stored.
+        self.assertFalse(self.cache.store(self.URL, self._gen_response({'Content-Type': 'application/json'})))
+        self.assertIsNone(self.cache.load(self.URL))
+
+        # Otherwise, the stored response should be rebuilt exactly.
+        response = self._gen_response({'ETag': '"abc"', 'Content-Encoding': 'gzip'})
+        self.assertTrue(self.cache.store(self.URL, response))
+        cached = self.cache.load(self.URL)
+        self.assertEqual(cached.status_code, 200)
+        self.assertEqual(cached.json(), response.json())
+        self.assertEqual(cached.headers['ETag'], '"abc"')
+        self.assertNotIn('Content-Encoding', cached.headers)
+
+        self.cache.clear()
+        self.assertIsNone(self.cache.load(self.URL))
+
+    def test_get_validators(self):
+        self.assertEqual(ResponseCache.get_validators(None), {})
+        response = self._gen_response({'ETag': '"abc"', 'Last-Modified': 'Wed, 01 Mar 2023 00:00:00 GMT'})
+        self.assertEqual(ResponseCache.get_validators(response), {
+            'If-None-Match': '"abc"',
+            'If-Modified-Since': 'Wed, 01 Mar 2023 00:00:00 GMT'
+        })
+
+    def test_full_url_key(self):
+        # Urls which only differ by a parameter, eg. the end date, shouldn't share an entry, or its validators.
+        self.cache.store(self.URL, self._gen_response({'ETag': '"abc"'}))
+        self.assertIsNotNone(self.cache.load(self.URL))
+        self.assertIsNone(self.cache.load(self.URL.replace('2023-03-01', '2023-03-02')))
+
+    def test_eviction(self):
+        # Each entry is the body, plus its metadata, so a limit of a little over two entries only keeps two.
+        response = self._gen_response({'ETag': '"abc"'})
+        self.cache.store(self.URL, response)
+        entry_size = sum(os.path.getsize(file) for file in self.cache._get_paths(self.URL))
+        cache = ResponseCache(self.temp_dir.name, max_bytes=entry_size * 2 + entry_size // 2)
+
+        urls = [self.URL.replace('2023-03-01', f'2023-03-0{day}') for day in range(1, 4)]
+        for i, url in enumerate(urls):
+            cache.store(url, response)
+            for file in cache._get_paths(url):
+                os.utime(file, ns=(i * 10 ** 9, i * 10 ** 9))
+        self.assertIsNone(cache.load(urls[0]))
+        self.assertIsNotNone(cache.load(urls[1]))
+        self.assertIsNotNone(cache.load(urls[2]))
+
+        # Loading an entry marks it as used, so the older entry is kept over the newer one which hasn't been used.
+        for i, url in enumerate(urls[1:]):
+            os.utime(cache._get_paths(url)[0], ns=(i * 10 ** 9, i * 10 ** 9))
+        cache.load(urls[1])
+        cache.store(urls[0], response)
+        self.assertIsNotNone(cache.load(urls[0]))
+        self.assertIsNotNone(cache.load(urls[1]))
+        self.assertIsNone(cache.load(urls[2]))
+
+        # Without a limit, nothing is removed.
+        for url in urls:
+            self.cache.store(url, response)
+        self.assertTrue(all(self.cache.load(url) is not None for url in urls))
+
+
+class TestSingleFlight(unittest.TestCase):
+    def test_shared_call(self):
+        # Calls with the same key, made while the first is running, should share its result.
+        flight = SingleFlight()
+        calls = list()
+        release = threading.Event()
+
+        def slow_call():
+            calls.append(1)
+            release.wait(1)
+            return {'result': len(calls)}
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            futures = [executor.submit(flight.do, 'key', slow_call) for _ in range(5)]
+            while flight.shared < 4:
+                time.sleep(0.01)
+            release.set()
+            results = [future.result() for future in futures]
+
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(result is results[0] for result in results))
+
+        # Once the call is finished, the next call runs again.
+        self.assertEqual(flight.do('key', slow_call), {'result': 2})
+
+    def test_shared_error(self):
+        # Exceptions are raised for every caller, and don't stop later calls.
+        flight = SingleFlight()
+
+        def bad_call():
+            raise ValueError('Failed')
+
+        self.assertRaises(ValueError, flight.do, 'key', bad_call)
+        self.assertEqual(flight.do('key', lambda: 1), 1)
+
+    def test_async_shared_call(self):
+        flight = AsyncSingleFlight()
+        calls = list()
+
+        async def slow_call():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return {'result': len(calls)}
+
+        async def run():
+            first = await asyncio.gather(*[flight.do('key', slow_call) for _ in range(5)])
+            second = await flight.do('key', slow_call)
+            return first, second
+
+        results, result = asyncio.run(run())
+        self.assertEqual(len(calls), 2)
+        self.assertTrue(all(r is results[0] for r in results))
+        self.assertEqual(result, {'result': 2})
+
+
+class TestRequestTelemetry(unittest.TestCase):
+    URL = 'https://example.com/data/test'
+
+    def setUp(self):
+        RequestTelemetry.reset()
+
+    def tearDown(self):
+        RequestTelemetry.reset()
+
+    def test_get_endpoint(self):
+        endpoint = RequestTelemetry.get_endpoint('https://Example.com/data/test?a=1&b=2')
+        self.assertEqual(endpoint, 'example.com/data/test')
+
+    def test_record(self):
+        # Urls which only differ by their parameters should be counted together.
+        RequestTelemetry.record_response(self.URL + '?a=1', 0.02, 200, 100)
+        RequestTelemetry.record_response(self.URL + '?a=2', 0.3, 503, 10)
+        RequestTelemetry.record_error(self.URL, 20)
+        RequestTelemetry.record_retry(self.URL, 1.5)
+        RequestTelemetry.record_rate_limit(self.URL, 0.5)
+        RequestTelemetry.record_cache(self.URL, True)
+        RequestTelemetry.record_cache(self.URL, False)
+
+        stats = RequestTelemetry.get_stats(self.URL)
+        self.assertEqual(stats['requests'], 2)
+        self.assertEqual(stats['errors'], 1)
+        self.assertEqual(stats['status_codes'], {'200': 1, '503': 1})
+        self.assertEqual(stats['bytes'], 110)
+        self.assertAlmostEqual(stats['latency']['total'], 20.32)
+        self.assertEqual(stats['latency']['max'], 20)
+        self.assertEqual(stats['latency']['histogram']['<=0.05s'], 1)
+        self.assertEqual(stats['latency']['histogram']['<=0.5s'], 1)
+        self.assertEqual(stats['latency']['histogram']['>10s'], 1)
+        self.assertEqual(stats['retries'], 1)
+        self.assertEqual(stats['slept'], {'total': 2.0, 'retry': 1.5, 'rate_limit': 0.5})
+        self.assertEqual(stats['cache'], {'hits': 1, 'misses': 1})
+
+    def test_get_stats(self):
+        RequestTelemetry.record_response(self.URL, 0.1, 200, 100)
+        RequestTelemetry.record_response('https://example.com/other', 0.1, 200, 100)
+        self.assertEqual(list(RequestTelemetry.get_stats().keys()), ['example.com/data/test', 'example.com/other'])
+        self.assertEqual(json.loads(RequestTelemetry.to_json()), RequestTelemetry.get_stats())
+
+        # Unseen endpoints should have empty stats, and nothing is recorded when disabled.
+        self.assertEqual(RequestTelemetry.get_stats('https://example.com/none')['requests'], 0)
+        RequestTelemetry.ENABLED = False
+        RequestTelemetry.record_response(self.URL, 0.1, 200, 100)
+        RequestTelemetry.ENABLED = True
+        self.assertEqual(RequestTelemetry.get_stats(self.URL)['requests'], 1)
+
 
 class TestRequestScryfall(unittest.TestCase):
     REQUESTER = RequestScryfall(_tries, _fail_delay, _success_delay)
@@ -194,6 +570,20 @@ class TestRequestScryfall(unittest.TestCase):
         self.assertIsInstance(card, dict)
         self.assertEqual(card['err_msg'], f'Error: Cannot find card "{name}"')
 
+    def test_gen_collection_batches(self):
+        # Names should be split into batches no larger than Scryfall allows.
+        names = [f'Card {i}' for i in range(160)]
+        batches = RequestScryfall._gen_collection_batches(names)
+        self.assertListEqual([len(batch['identifiers']) for batch in batches], [75, 75, 10])
+        self.assertEqual(batches[1]['identifiers'][0], {'name': 'Card 75'})
+
+    def test_get_cards_by_names(self):
+        names = ['Virus Beetle', 'Fable of the Mirror-Breaker', 'Supercalifragilisticexpialidocious']
+        cards, not_found = self.REQUESTER.get_cards_by_names(names)
+        self.assertListEqual([card['name'] for card in cards],
+                             ['Virus Beetle', 'Fable of the Mirror-Breaker // Reflection of Kiki-Jiki'])
+        self.assertListEqual(not_found, ['Supercalifragilisticexpialidocious'])
+
     @unittest.skipUnless(TEST_MASS_DATA_PULL, "Not testing mass data functions. 'TEST_MASS_DATA_PULL' set to False.")
     def test_get_bulk_data(self):
         data = self.REQUESTER.get_bulk_data()
@@ -434,3 +824,75 @@ class TestRequestRequest17Lands(unittest.TestCase):
         self.assertEqual(tiers[0]['flags']['sideboard'], False)
         self.assertEqual(tiers[0]['flags']['synergy'], False)
         self.assertEqual(tiers[0]['flags']['buildaround'], False)
+
+
+class TestAsyncRequester(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.REQUESTER = AsyncRequester(_tries, _fail_delay, _success_delay)
+
+    async def asyncTearDown(self):
+        await self.REQUESTER.close()
+
+    def test_init(self):
+        # Async requesters share their configuration with the blocking ones.
+        fetcher = AsyncRequester(2, 120, 10)
+        self.assertEqual(fetcher._TRIES, 2)
+        self.assertEqual(fetcher._FAIL_DELAY, 120)
+        self.assertEqual(fetcher._SUCCESS_DELAY, 10)
+
+    async def test_get_response(self):
+        # A hard failure isn't retried, and is scrubbed in favour of None.
+        response = await self.REQUESTER.get_response('https://api.scryfall.com/')
+        self.assertIsNone(response)
+
+        # A good url returns the same kind of Response a Requester would.
+        url = 'https://api.scryfall.com/cards/5a70e8fa-b71d-441e-b049-dacb09a9a7af'
+        response = await self.REQUESTER.get_response(url, {'format': 'json'})
+        self.assertIsInstance(response, Response)
+        self.assertEqual(response.json()['name'], 'Virus Beetle')
+
+    async def test_shared_json(self):
+        # Callers sharing a request should each get their own json, so changing one doesn't change the others.
+        calls = list()
+
+        async def slow_response(composed_url, payload=None):
+            calls.append(composed_url)
+            await asyncio.sleep(0.05)
+            response = Response()
+            response.status_code, response._content = 200, b'[{"name": "Virus Beetle"}]'
+            return response
+
+        self.REQUESTER._get_response = slow_response
+        first, second = await asyncio.gather(*[self.REQUESTER.get_json_response('https://example.com/shared')
+                                               for _ in range(2)])
+        first[0]['name'] = 'Changed'
+        second[0]['err_msg'] = 'Error'
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(first, [{'name': 'Changed'}])
+        self.assertEqual(second, [{'name': 'Virus Beetle', 'err_msg': 'Error'}])
+
+    async def test_gather(self):
+        # Requests can be gathered on a single loop, with results in the order requested.
+        scryfall = AsyncRequestScryfall(_tries, _fail_delay, _success_delay)
+        async with scryfall:
+            names = ['Virus Beetle', 'Vires Beetle', 'Bolt']
+            cards = await asyncio.gather(*[scryfall.get_card_by_name(name) for name in names])
+        self.assertEqual(cards[0]['name'], 'Virus Beetle')
+        self.assertEqual(cards[1]['name'], 'Virus Beetle')
+        self.assertEqual(cards[2]['err_msg'], 'Error: Multiple card matches for "Bolt"')
+
+
+class TestAsyncRequest17Lands(unittest.IsolatedAsyncioTestCase):
+    async def test_matches_blocking(self):
+        # The async requester should return exactly the same data as the blocking one.
+        _id = 'f5383f215c364c129632cdc559f0ac3a'
+        requester = Request17Lands(_tries, _fail_delay, _success_delay)
+        async with AsyncRequest17Lands(_tries, _fail_delay, _success_delay) as async_requester:
+            deck, draft, bad_deck = await asyncio.gather(
+                async_requester.get_deck(_id),
+                async_requester.get_draft(_id),
+                async_requester.get_deck('Fish')
+            )
+        self.assertEqual(deck, requester.get_deck(_id))
+        self.assertEqual(draft, requester.get_draft(_id))
+        self.assertIsNone(bad_deck)
@@ -1,9 +1,11 @@
 import logging
 import os
+import json
+import tempfile
 import unittest
 
 from core.utilities import validate_json, load_json_file, save_json_file, auto_logging, flatten_lists, invert_dict
-from core.utilities.funcs import reformat_json_file
+from core.utilities.funcs import reformat_json_file, iter_json_array
 
 
 class TestLogging(unittest.TestCase):
@@ -87,3 +89,43 @@ class TestFuncs(unittest.TestCase):
         }
 
         self.assertDictEqual(invert_dict(_in), _out)
+
+
+class TestIterJsonArray(unittest.TestCase):
+    DATA = [{'name': 'Virus Beetle', 'cmc': 2, 'colors': ['B']}, 12345, 'Shock', [], {'layout': None}, 2.5]
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def _write(self, filename: str, text: str) -> None:
+        with open(os.path.join(self.temp_dir.name, filename), 'w') as f:
+            f.write(text)
+
+    def test_matches_load(self):
+        # Items should be identical to loading the whole file, regardless of formatting and how it's chunked.
+        for indent in [None, 4]:
+            self._write('test.json', json.dumps(self.DATA, indent=indent))
+            for chunk_size in [1, 3, 64, 2 ** 16]:
+                items = list(iter_json_array(self.temp_dir.name, 'test.json', chunk_size))
+                self.assertListEqual(items, self.DATA)
+
+    def test_empty(self):
+        self._write('test.json', ' [ ] ')
+        self.assertListEqual(list(iter_json_array(self.temp_dir.name, 'test.json')), [])
+
+    def test_invalid(self):
+        # Invalid files are logged, and raised, so a broken file isn't mistaken for a shorter one.
+        self.assertRaises(FileNotFoundError, list, iter_json_array(self.temp_dir.name, 'missing.json'))
+        self._write('test.json', '{"test": "results"}')
+        self.assertRaises(ValueError, list, iter_json_array(self.temp_dir.name, 'test.json'))
+
+        # The items before the error are still given out.
+        self._write('test.json', '[1, 2, {"test"')
+        items = list()
+        with self.assertRaises(json.JSONDecodeError):
+            for item in iter_json_array(self.temp_dir.name, 'test.json', 4):
+                items.append(item)
+        self.assertListEqual(items, [1, 2])
@@ -0,0 +1,72 @@
+"""
+Holds card data as the Arrow table it was loaded from, so it only needs to be turned into json objects if it's used.
+"""
+
+from __future__ import annotations
+from typing import Optional, Iterable, Iterator
+from collections.abc import Mapping
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from core.data_fetching.utils.consts import CARD_DATA, WUBRG_CARD_DATA
+
+
+class CardTable(Mapping):
+    """
+    The card data for a number of colour filters, held in a single table with the filter as a column, the way the
+    ParquetDataStore keeps it. It can be used just like a dictionary of colours and their card data, but the rows are
+    only turned into json objects the first time any are asked for.
+
+    Frames should be made from `get_records` instead, which gives the data as a DataFrame straight from the table.
+    That's many times quicker than making the json objects, and then a frame from those.
+    """
+    def __init__(self, table: pa.Table, color_column: str, colors: Iterable[str]):
+        """
+        :param table: The table of card data.
+        :param color_column: The column which holds the colour filter of each row.
+        :param colors: The colour filters, in the order they should be given in. Only those with rows are included.
+        """
+        self.TABLE: pa.Table = table
+        self.COLOR_COLUMN: str = color_column
+        found = set(pc.unique(table[color_column]).to_pylist()) if table.num_rows else set()
+        self._COLORS: list[str] = [color for color in colors if color in found]
+        self._card_data: Optional[WUBRG_CARD_DATA] = None
+
+    def _get_card_data(self) -> WUBRG_CARD_DATA:
+        """
+        Turns the table into json objects, split out by colour. Every colour is done at once, as converting the whole
+        table is much quicker than converting each colour on its own.
+        :return: A dictionary of colours, and their card data.
+        """
+        if self._card_data is None:
+            card_data = {color: list() for color in self._COLORS}
+            for row in self.TABLE.to_pylist():
+                card_data[row.pop(self.COLOR_COLUMN)].append(row)
+            self._card_data = card_data
+        return self._card_data
+
+    def __getitem__(self, color: str) -> CARD_DATA:
+        if color not in self._COLORS:
+            raise KeyError(color)
+        return self._get_card_data()[color]
+
+    def __contains__(self, color: object) -> bool:
+        return color in self._COLORS
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._COLORS)
+
+    def __len__(self) -> int:
+        return len(self._COLORS)
+
+    def get_records(self, color_name: str = None) -> pd.DataFrame:
+        """
+        Gets the card data as a frame of records, with a column for each field, and one for the colour filter.
+        :param color_name: What to call the colour filter column. Default: None, which keeps COLOR_COLUMN.
+        :return: A DataFrame with a row for each card in each colour.
+        """
+        records = self.TABLE.to_pandas()
+        if color_name is not None:
+            records = records.rename(columns={self.COLOR_COLUMN: color_name})
+        return records
@@ -0,0 +1,114 @@
+"""
+Keeps running totals of a history frame along its dates, so it can be summed over any range of dates at once.
+"""
+
+from typing import Optional, Callable, Union
+import numpy as np
+import pandas as pd
+
+
+class CumulativeFrame:
+    """
+    Holds the cumulative sums of some columns of a history frame, for each group in it (eg. each deck colour and card)
+    along the 'Date' level. Summing the columns over a range of dates then only takes subtracting the totals at the
+    start of the range from those at the end, instead of grouping and summing every row in the range.
+
+    The sums are kept in a dense array of dates by groups, so every group has a total for every date, even the dates
+    it has no data for. How many rows each group has is also kept, so groups with no data in a range can be left out.
+    """
+    DATE_LEVEL: str = 'Date'
+
+    def __init__(self, frame: pd.DataFrame, sum_cols: list[str], static_cols: list[str] = None,
+                 order: Callable[[pd.Index], np.ndarray] = None):
+        """
+        :param frame: The history frame, with a 'Date' level in its index.
+        :param sum_cols: The columns to sum. Missing values are counted as 0.
+        :param static_cols: Columns which don't change between dates, eg. a card's rarity, to attach to the sums.
+        The latest value is used for each group. Default: None
+        :param order: A function which gives the positions that put the groups in order, eg. `get_frame_order`.
+        Default: None, which leaves the groups sorted by their labels.
+        """
+        self.SUM_COLS: list[str] = list(sum_cols)
+        self.STATIC_COLS: list[str] = list(static_cols or list())
+
+        # Turn the dates and groups into positions in the array, with the groups sorted so they can be sliced.
+        date_values = frame.index.get_level_values(self.DATE_LEVEL)
+        date_codes, dates = pd.factorize(date_values, sort=True)
+        group_index = frame.index.droplevel(self.DATE_LEVEL)
+        group_codes, groups = group_index.factorize(sort=True)
+        groups.names = group_index.names
+
+        self.DATES: np.ndarray = np.asarray(dates.strftime('%Y-%m-%d') if isinstance(dates, pd.DatetimeIndex)
+                                            else dates.astype(str))
+        self.GROUPS: pd.Index = groups
+
+        # Groups are looked up through a MultiIndex, even if they only have one level, so they're sliced the same way.
+        self._LOOKUP: pd.MultiIndex = groups if isinstance(groups, pd.MultiIndex) else \
+            pd.MultiIndex.from_arrays([groups])
+
+        # Each date's totals are stored one row down, so the first row is all zeroes, for ranges from the first date.
+        values = frame[self.SUM_COLS].apply(pd.to_numeric).fillna(0).to_numpy(dtype=np.float64)
+        self._SUMS: np.ndarray = np.zeros((len(dates) + 1, len(groups), len(self.SUM_COLS)))
+        self._SUMS[date_codes + 1, group_codes] = values
+        np.cumsum(self._SUMS, axis=0, out=self._SUMS)
+
+        self._ROWS: np.ndarray = np.zeros((len(dates) + 1, len(groups)), dtype=np.int32)
+        self._ROWS[date_codes + 1, group_codes] = 1
+        np.cumsum(self._ROWS, axis=0, out=self._ROWS)
+
+        # The latest row of each group holds its static values.
+        latest = ~group_index.duplicated(keep='last') if len(group_index) else np.zeros(0, dtype=bool)
+        static = frame.loc[latest, self.STATIC_COLS]
+        static.index = group_codes[latest]
+        self._STATIC: pd.DataFrame = static.sort_index()
+
+        # The order the groups are given in, as the position each group is placed at.
+        self._ORDER: np.ndarray = np.arange(len(groups))
+        if order is not None:
+            self._ORDER[order(groups)] = np.arange(len(groups))
+
+    def _get_date_ranges(self, date_slice: Union[slice, list[str]]) -> list[tuple[int, int]]:
+        """
+        Converts a date slice into ranges of rows in the cumulative arrays.
+        :param date_slice: A slice of dates, or a list of dates, like those from `get_date_slice`.
+        :return: A list of start and end rows, where the totals for a range are the end row minus the start row.
+        """
+        if isinstance(date_slice, slice):
+            start = 0 if date_slice.start is None else np.searchsorted(self.DATES, date_slice.start, side='left')
+            end = len(self.DATES) if date_slice.stop is None else \
+                np.searchsorted(self.DATES, date_slice.stop, side='right')
+            return [(int(start), int(max(start, end)))]
+
+        positions = np.searchsorted(self.DATES, date_slice, side='left')
+        return [(int(pos), int(pos) + 1) for pos, date in zip(positions, date_slice)
+                if pos < len(self.DATES) and self.DATES[pos] == date]
+
+    def sum(self, date_slice: Union[slice, list[str]] = slice(None), group_slice: Optional[tuple] = None) \
+            -> pd.DataFrame:
+        """
+        Sums the columns over a range of dates, for each group which has data in that range.
+        :param date_slice: A slice of dates, or a list of dates, like those from `get_date_slice`. Default: All dates
+        :param group_slice: A tuple of slices for the group levels, eg. `(color_slice, name_slice)`. Default: None,
+        which includes every group.
+        :return: A DataFrame of the sums and static columns, indexed by group.
+        """
+        positions = np.arange(len(self.GROUPS))
+        if group_slice is not None:
+            positions = positions[self._LOOKUP.get_locs(list(group_slice))]
+
+        sums = np.zeros((len(positions), len(self.SUM_COLS)))
+        rows = np.zeros(len(positions), dtype=np.int32)
+        for start, end in self._get_date_ranges(date_slice):
+            sums += self._SUMS[end, positions] - self._SUMS[start, positions]
+            rows += self._ROWS[end, positions] - self._ROWS[start, positions]
+
+        # Leave out the groups without data in the range, and put the rest in order.
+        keep = rows > 0
+        positions, sums = positions[keep], sums[keep]
+        order = np.argsort(self._ORDER[positions], kind='stable')
+        positions, sums = positions[order], sums[order]
+
+        frame = pd.DataFrame(sums, index=self.GROUPS[positions], columns=self.SUM_COLS)
+        for col in self.STATIC_COLS:
+            frame[col] = self._STATIC[col].array[positions]
+        return frame
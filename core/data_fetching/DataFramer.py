@@ -1,7 +1,17 @@
+from typing import Optional, Any, Union
+from concurrent.futures import ProcessPoolExecutor
+import os
 import pandas as pd
 
 from core.utilities.auto_logging import logging
-from core.data_fetching.utils.pandafy import gen_card_frame, gen_meta_frame, append_card_info, get_stats_grades
+from core.data_fetching.utils.consts import META_DATA, WUBRG_CARD_DATA
+from core.data_fetching.utils.settings import DATA_DIR_LOC, DATA_DIR_NAME, COMPACT_FRAMES, FRAME_SNAPSHOTS, \
+    CONCURRENT_PANDAFY, PANDAFY_WORKERS
+from core.data_fetching.utils.pandafy import gen_card_frames, gen_card_frames_from_records, gen_meta_frame, \
+    gen_hist_frames, append_card_info, get_stats_grades, compact_frame, PANDAFY_VERSION
+from core.data_fetching.CardTable import CardTable
+from core.data_fetching.DataWarehouse import DataWarehouse
+from core.data_fetching.FrameSnapshot import FrameSnapshot
 from core.data_fetching.LoadedData import LoadedData
 from core.game_metadata import FormatMetadata
 
@@ -10,9 +20,32 @@ class DataFramer:
     """
     DataFramer is responsible for converting the data aggregated by LoadedData into Pandas DataFrames.
     Once it does, it contains all summary and historical data for a given set and format.
+
+    When COMPACT_FRAMES is set, the frames are converted to compact types as they're made, to save memory.
+
+    When FRAME_SNAPSHOTS is set, the frames are saved to disk once they're made, with the fingerprints of the files
+    they were made from. The next time the frames are needed, they're loaded from the snapshot instead, and only the
+    dates whose files have changed, or which are new, are loaded and made again.
+
+    When CONCURRENT_PANDAFY is set, the dates of the history frames are split between a pool of PANDAFY_WORKERS
+    processes, instead of all being made in this one.
     """
+    COMPACT_FRAMES: bool = COMPACT_FRAMES
+    FRAME_SNAPSHOTS: bool = FRAME_SNAPSHOTS
+    CONCURRENT_PANDAFY: bool = CONCURRENT_PANDAFY
+    PANDAFY_WORKERS: int = PANDAFY_WORKERS
+
+    HISTORY_FRAME_NAMES: list[str] = ['GROUPED_ARCHETYPE_HISTORY_FRAME', 'SINGLE_ARCHETYPE_HISTORY_FRAME',
+                                      'CARD_HISTORY_FRAME']
+    SUMMARY_FRAME_NAMES: list[str] = ['GROUPED_ARCHETYPE_SUMMARY_FRAME', 'SINGLE_ARCHETYPE_SUMMARY_FRAME',
+                                      'CARD_SUMMARY_FRAME']
+
+    # Stands in for the data of the dates in the history frames which were loaded from a snapshot.
+    _SNAPSHOT_SOURCE: object = object()
+    _SUMMARY_KEY: str = DataWarehouse.SUMMARY_DATE
 
-    def __init__(self, set_code: str, format_name: str, load_summary: bool = True, load_history: bool = True):
+    def __init__(self, set_code: str, format_name: str, load_summary: bool = True, load_history: bool = True,
+                 concurrent: bool = None):
         self._SET = set_code
         self._FORMAT = format_name
         self._FETCHER = LoadedData(set_code, format_name)
@@ -20,15 +53,27 @@ class DataFramer:
 
         self.load_summary = load_summary
         self.load_history = load_history
+        self.concurrent: bool = self.CONCURRENT_PANDAFY if concurrent is None else concurrent
 
         self._GROUPED_ARCHETYPE_HISTORY_FRAME = None
         self._SINGLE_ARCHETYPE_HISTORY_FRAME = None
         self._CARD_HISTORY_FRAME = None
 
+        # The data each date in the history frames was made from, to tell which dates are new or have changed.
+        self._HIST_CARD_SOURCES: dict[str, WUBRG_CARD_DATA] = dict()
+        self._HIST_META_SOURCES: dict[str, META_DATA] = dict()
+
         self._GROUPED_ARCHETYPE_SUMMARY_FRAME = None
         self._SINGLE_ARCHETYPE_SUMMARY_FRAME = None
         self._CARD_SUMMARY_FRAME = None
 
+        # Snapshots are only used if the frames in them were made the same way as they would be now.
+        #  Their keys are finished with the card info once it's needed, see `_update_snapshot_keys`.
+        snapshot_folder = os.path.join(DATA_DIR_LOC, DATA_DIR_NAME, set_code, format_name)
+        self._snapshot_key = f"{PANDAFY_VERSION}-{'compact' if self.COMPACT_FRAMES else 'full'}"
+        self._HIST_SNAPSHOT = FrameSnapshot(snapshot_folder, 'history_frames', self._snapshot_key)
+        self._SUMMARY_SNAPSHOT = FrameSnapshot(snapshot_folder, 'summary_frames', self._snapshot_key)
+
     @property
     def SET(self) -> str:  # pragma: no cover
         """The draft set."""
@@ -81,47 +126,256 @@ class DataFramer:
             self.gen_summary()
         return self._CARD_SUMMARY_FRAME
 
+    @staticmethod
+    def _sort_frame(frame: pd.DataFrame) -> pd.DataFrame:
+        """
+        Sorts a frame by its index, so it can be sliced by ranges of labels without pandas searching every row.
+        :param frame: The frame to sort.
+        :return: The sorted frame, or the same frame if it was already sorted.
+        """
+        # A MultiIndex is only sorted for slicing if its levels are too, which joining frames doesn't keep.
+        is_sorted = frame.index.is_monotonic_increasing
+        if isinstance(frame.index, pd.MultiIndex):
+            is_sorted = is_sorted and all(level.is_monotonic_increasing for level in frame.index.levels)
+        return frame if is_sorted else frame.sort_index(kind='stable')
+
+    @classmethod
+    def _merge_dates(cls, frame: Optional[pd.DataFrame], new_frame: pd.DataFrame, replaced: list[str]) \
+            -> pd.DataFrame:
+        """
+        Adds the rows for some dates to a history frame, keeping the rows sorted by their index.
+        :param frame: The existing history frame, or None if there isn't one yet.
+        :param new_frame: The rows for the dates being added.
+        :param replaced: The dates already in the frame, whose rows should be replaced.
+        :return: The updated history frame.
+        """
+        if frame is None:
+            return cls._sort_frame(new_frame)
+
+        if replaced:
+            frame = frame[~frame.index.get_level_values('Date').isin(replaced)]
+
+        # Adding later dates keeps the frame sorted, so it's only sorted again if a date was added out of order.
+        return cls._sort_frame(pd.concat([frame, new_frame]))
+
+    def _add_hist_rows(self, frame: Optional[pd.DataFrame], new_frame: pd.DataFrame, replaced: list[str],
+                       name: str) -> pd.DataFrame:
+        """
+        Adds the rows for some dates to a history frame, compacting them first if COMPACT_FRAMES is set.
+        :param frame: The existing history frame, or None if there isn't one yet.
+        :param new_frame: The rows for the dates being added.
+        :param replaced: The dates already in the frame, whose rows should be replaced.
+        :param name: What to call the frame when logging.
+        :return: The updated history frame.
+        """
+        if not self.COMPACT_FRAMES:
+            return self._merge_dates(frame, new_frame, replaced)
+
+        # Categories which don't match are joined as plain values, so the joined frame is compacted again.
+        new_frame = compact_frame(new_frame, f'new {name} rows')
+        return compact_frame(self._merge_dates(frame, new_frame, replaced), name)
+
+    def _get_frames(self, names: list[str]) -> dict[str, Optional[pd.DataFrame]]:
+        """
+        Gets the frames which have been made, without making any which haven't.
+        :param names: The names of the frames to get.
+        :return: A dictionary of the frame names, and the frames, or None for those which haven't been made.
+        """
+        return {name: getattr(self, f'_{name}') for name in names}
+
+    def get_memory_usage(self) -> dict[str, int]:
+        """
+        Gets how much memory each of the frames which have been made are using.
+        :return: A dictionary of the frame names, and the number of bytes they use.
+        """
+        frames = self._get_frames(self.HISTORY_FRAME_NAMES + self.SUMMARY_FRAME_NAMES)
+        return {name: int(frame.memory_usage(deep=True).sum()) for name, frame in frames.items() if frame is not None}
+
+    def _update_snapshot_keys(self) -> None:
+        """
+        Adds the fingerprint of the card info to the keys of the snapshots. The card info is part of every card frame,
+        so if it has changed, eg. as a card's Scryfall data was updated, none of the saved frames can be used.
+        """
+        key = f'{self._snapshot_key}-{self._format_metadata.CARD_INFO_FINGERPRINT}'
+        for snapshot in [self._HIST_SNAPSHOT, self._SUMMARY_SNAPSHOT]:
+            if snapshot.KEY != key:
+                snapshot.KEY = key
+                snapshot.FINGERPRINTS = dict()
+
+    def _restore_hist_snapshot(self) -> list[str]:
+        """
+        Fills in the history frames from the saved snapshot, keeping only the dates whose files haven't changed since.
+        Nothing is restored if the history frames have already been made.
+        :return: The dates which were restored.
+        """
+        if any(frame is not None for frame in self._get_frames(self.HISTORY_FRAME_NAMES).values()):
+            return list()
+        if not self._HIST_SNAPSHOT.load():
+            return list()
+
+        dates = self._HIST_SNAPSHOT.get_valid_keys(self._FETCHER.get_fingerprints())
+        if not dates:
+            return list()
+
+        for name, frame in self._HIST_SNAPSHOT.FRAMES.items():
+            if frame is not None:
+                frame = frame[frame.index.get_level_values('Date').isin(dates)]
+            setattr(self, f'_{name}', frame)
+        self._HIST_CARD_SOURCES = {date: self._SNAPSHOT_SOURCE for date in dates}
+        self._HIST_META_SOURCES = {date: self._SNAPSHOT_SOURCE for date in dates}
+
+        logging.verbose(f'Restored {len(dates)} dates of {self.SET} {self.FORMAT} from the history snapshot.')
+        return dates
+
+    def _get_changed_dates(self, sources: dict[str, Any], data: dict[str, Any], snapshot_dates: set[str]) \
+            -> list[str]:
+        """
+        Gets the dates which are new, or whose data has changed since they were added to the history frames.
+        :param sources: The data each date in the history frames was made from.
+        :param data: The current data for each date.
+        :param snapshot_dates: The dates in the history snapshot whose files haven't changed since it was saved.
+        :return: The dates which are new or changed, in order.
+        """
+        dates = list()
+        for date in sorted(data):
+            # LoadedData only replaces the data for a date when it's loaded again, so anything else is unchanged.
+            if sources.get(date) is data[date]:
+                continue
+
+            # Dates restored from a snapshot weren't made from the data, but are unchanged if their files are.
+            if sources.get(date) is self._SNAPSHOT_SOURCE and date in snapshot_dates:
+                sources[date] = data[date]
+                continue
+            dates.append(date)
+        return dates
+
+    @staticmethod
+    def _update_snapshot(snapshot: FrameSnapshot, frames: dict[str, Optional[pd.DataFrame]],
+                         fingerprints: dict[str, Optional[str]]) -> None:
+        """
+        Saves the frames to a snapshot, with the fingerprints of the parts of them which have been made again.
+        :param snapshot: The snapshot to save.
+        :param frames: The frames to save.
+        :param fingerprints: The fingerprints of the files for each part which has been made again.
+        """
+        snapshot.FRAMES = frames
+        for key, fingerprint in fingerprints.items():
+            # Parts made without any files, eg. as the data couldn't be fetched, are made again next time.
+            if fingerprint is None:
+                snapshot.FINGERPRINTS.pop(key, None)
+            else:
+                snapshot.FINGERPRINTS[key] = fingerprint
+        snapshot.save()
+
+    @staticmethod
+    def _get_card_records(card_data: dict[str, WUBRG_CARD_DATA]) -> dict[str, Union[WUBRG_CARD_DATA, pd.DataFrame]]:
+        """
+        Swaps the card data of any dates loaded as a CardTable for a frame of its records, straight from the table,
+        so the frames are made without turning it into json objects.
+        :param card_data: A dictionary of dates, and their card data.
+        :return: A dictionary of dates, and their card data or a frame of its records.
+        """
+        return {date: data.get_records('Deck Colors') if isinstance(data, CardTable) else data
+                for date, data in card_data.items()}
+
+    def _gen_hist_frames_concurrently(self, card_data: dict[str, Union[WUBRG_CARD_DATA, pd.DataFrame]],
+                                      meta_data: dict[str, META_DATA]) \
+            -> tuple[Optional[pd.DataFrame], Optional[pd.DataFrame], Optional[pd.DataFrame]]:
+        """
+        Makes the history frames for a number of dates, by splitting the dates between a pool of worker processes.
+        Each worker is given a run of consecutive dates, so joining their frames in order keeps them ordered by date.
+        :param card_data: A dictionary of dates, and their card data, or frames of its records.
+        :param meta_data: A dictionary of dates, and their archetype data.
+        :return: The grouped archetype, single archetype and card frames, or None for those with no dates.
+        """
+        dates = sorted(set(card_data) | set(meta_data))
+        workers = min(self.PANDAFY_WORKERS or os.cpu_count() or 1, len(dates))
+        card_info = self._format_metadata.CARD_INFO_FRAME
+        if workers <= 1:
+            return gen_hist_frames(card_data, meta_data, card_info)
+
+        chunks = [dates[len(dates) * i // workers: len(dates) * (i + 1) // workers] for i in range(workers)]
+
+        # Workers compact their frames if they'll be compacted anyway, as smaller frames are quicker to send back.
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(gen_hist_frames,
+                                       {date: card_data[date] for date in chunk if date in card_data},
+                                       {date: meta_data[date] for date in chunk if date in meta_data},
+                                       card_info, self.COMPACT_FRAMES)
+                       for chunk in chunks]
+            results = [future.result() for future in futures]
+
+        # Each result holds one of each frame, or None for the frames its dates had no data for.
+        frames = [[frame for frame in frames if frame is not None] for frames in zip(*results)]
+        return tuple(pd.concat(frame_list) if frame_list else None for frame_list in frames)
+
     def gen_hist(self, reload: bool = False, overwrite: bool = False) -> None:
-        """Populates and updates the three 'HISTORY' properties."""
-        hist_card, hist_meta = self._FETCHER.get_historic_data(reload, overwrite)
-        if (not hist_card) and (not hist_meta):  # pragma: no cover
+        """
+        Populates and updates the three 'HISTORY' properties.
+        Only the dates which are new, or whose data has changed, are converted and added to the existing frames.
+        """
+        # Dates restored from the snapshot don't need their data loaded, unless it's being reloaded anyway.
+        if self.FRAME_SNAPSHOTS:
+            self._update_snapshot_keys()
+        use_snapshot = self.FRAME_SNAPSHOTS and not (reload or overwrite)
+        restored = self._restore_hist_snapshot() if use_snapshot else list()
+
+        hist_card, hist_meta = self._FETCHER.get_historic_data(reload, overwrite, restored)
+        if (not hist_card) and (not hist_meta) and (not restored):  # pragma: no cover
             logging.warning(f"{self.SET} {self.FORMAT} returned no data for 'hist_card' or 'hist_meta'")
             return
 
-        # TODO: Attempt to handle this in a way so the entire history frames
-        #  aren't reloaded each time this function is called.
+        fingerprints = self._FETCHER.get_fingerprints() if self.FRAME_SNAPSHOTS else dict()
+        snapshot_dates = set(self._HIST_SNAPSHOT.get_valid_keys(fingerprints)) if use_snapshot else set()
+        meta_dates = self._get_changed_dates(self._HIST_META_SOURCES, hist_meta, snapshot_dates)
+        card_dates = self._get_changed_dates(self._HIST_CARD_SOURCES, hist_card, snapshot_dates)
+        if not meta_dates and not card_dates:
+            logging.verbose(f'Historical data for {self.SET} {self.FORMAT} is up to date.')
+            return
 
-        grouped_arch_frame_dict: dict[str, pd.DataFrame] = dict()
-        single_arch_frame_dict: dict[str, pd.DataFrame] = dict()
-        card_frame_dict: dict[str, pd.DataFrame] = dict()
+        changed_dates = set(meta_dates) | set(card_dates)
+        logging.verbose(f'Pandafying historical data for {len(changed_dates)} dates of {self.SET} {self.FORMAT}...')
 
-        logging.verbose(f'Pandafying historical data for {self.SET} {self.FORMAT}...')
+        # Making the frames for a single date isn't worth the cost of starting the worker processes.
+        card_data = {date: hist_card[date] for date in card_dates}
+        meta_data = {date: hist_meta[date] for date in meta_dates}
+        card_records = self._get_card_records(card_data)
+        if self.concurrent and len(changed_dates) > 1:
+            grouped_arch_frame, single_arch_frame, card_frame = \
+                self._gen_hist_frames_concurrently(card_records, meta_data)
+        else:
+            grouped_arch_frame, single_arch_frame, card_frame = \
+                gen_hist_frames(card_records, meta_data, self._format_metadata.CARD_INFO_FRAME)
 
-        for date in hist_meta:
-            grouped, single = gen_meta_frame(hist_meta[date])
-            grouped_arch_frame_dict[date] = grouped
-            single_arch_frame_dict[date] = single
-        grouped_arch_frame = pd.concat(grouped_arch_frame_dict, names=["Date", "Name"])
-        single_arch_frame = pd.concat(single_arch_frame_dict, names=["Date", "Name"])
+        if meta_dates:
+            replaced = [date for date in meta_dates if date in self._HIST_META_SOURCES]
+            self._GROUPED_ARCHETYPE_HISTORY_FRAME = self._add_hist_rows(self._GROUPED_ARCHETYPE_HISTORY_FRAME,
+                                                                        grouped_arch_frame, replaced,
+                                                                        'grouped archetype history')
+            self._SINGLE_ARCHETYPE_HISTORY_FRAME = self._add_hist_rows(self._SINGLE_ARCHETYPE_HISTORY_FRAME,
+                                                                       single_arch_frame, replaced,
+                                                                       'single archetype history')
+            self._HIST_META_SOURCES.update(meta_data)
 
-        for date in hist_card:
-            color_dict: dict[str, pd.DataFrame] = dict()
-            for color in hist_card[date]:
-                frame = gen_card_frame(hist_card[date][color])
-                frame = append_card_info(frame, self._format_metadata.CARD_DICT)
-                frame = get_stats_grades(frame)
-                color_dict[color] = frame
-            card_frame_dict[date] = pd.concat(color_dict, names=["Deck Colors", "Name"])
-        card_frame = pd.concat(card_frame_dict, names=["Date", "Deck Colors", "Name"])
+        if card_dates:
+            replaced = [date for date in card_dates if date in self._HIST_CARD_SOURCES]
+            self._CARD_HISTORY_FRAME = self._add_hist_rows(self._CARD_HISTORY_FRAME, card_frame, replaced,
+                                                           'card history')
+            self._HIST_CARD_SOURCES.update(card_data)
 
-        logging.verbose(f'Finished pandafying data.')
+        if self.FRAME_SNAPSHOTS:
+            self._update_snapshot(self._HIST_SNAPSHOT, self._get_frames(self.HISTORY_FRAME_NAMES),
+                                  {date: fingerprints.get(date) for date in changed_dates})
 
-        self._GROUPED_ARCHETYPE_HISTORY_FRAME = grouped_arch_frame
-        self._SINGLE_ARCHETYPE_HISTORY_FRAME = single_arch_frame
-        self._CARD_HISTORY_FRAME = card_frame
+        logging.verbose(f'Finished pandafying data.')
 
     def gen_summary(self, reload: bool = False, overwrite: bool = False) -> None:
         """Populates and updates the three 'SUMMARY' properties."""
+        if self.FRAME_SNAPSHOTS:
+            self._update_snapshot_keys()
+        if self.FRAME_SNAPSHOTS and not (reload or overwrite) and self._restore_summary_snapshot():
+            return
+
         summ_card, summ_meta = self._FETCHER.get_summary_data(reload, overwrite)
         if (not summ_card) and (not summ_meta):  # pragma: no cover
             logging.warning(f"{self.SET} {self.FORMAT} returned no data for 'summ_card' or 'summ_meta'")
@@ -129,18 +383,52 @@ class DataFramer:
 
         grouped_arch_frame, single_arch_frame = gen_meta_frame(summ_meta)
 
-        color_dict = dict()
-        for color in summ_card:
-            frame = gen_card_frame(summ_card[color])
-            frame = append_card_info(frame, self._format_metadata.CARD_DICT)
-            frame = get_stats_grades(frame)
-            color_dict[color] = frame
-        card_frame = pd.concat(color_dict, names=["Deck Colors", "Name"])
+        names = ["Deck Colors"]
+        if isinstance(summ_card, CardTable):
+            card_frame = gen_card_frames_from_records(summ_card.get_records(names[-1]), names)
+        else:
+            card_frame = gen_card_frames({(color,): summ_card[color] for color in summ_card}, names)
+        card_frame = append_card_info(card_frame, self._format_metadata.CARD_INFO_FRAME)
+        card_frame = get_stats_grades(card_frame, names)
+
+        grouped_arch_frame = self._sort_frame(grouped_arch_frame)
+        single_arch_frame = self._sort_frame(single_arch_frame)
+        card_frame = self._sort_frame(card_frame)
+
+        if self.COMPACT_FRAMES:
+            grouped_arch_frame = compact_frame(grouped_arch_frame, 'grouped archetype summary')
+            single_arch_frame = compact_frame(single_arch_frame, 'single archetype summary')
+            card_frame = compact_frame(card_frame, 'card summary')
 
         self._GROUPED_ARCHETYPE_SUMMARY_FRAME = grouped_arch_frame
         self._SINGLE_ARCHETYPE_SUMMARY_FRAME = single_arch_frame
         self._CARD_SUMMARY_FRAME = card_frame
 
+        # The summary is made again every time, so it's only saved when the files it was made from have changed.
+        if self.FRAME_SNAPSHOTS:
+            fingerprint = self._FETCHER.get_summary_fingerprint()
+            if reload or overwrite or self._SUMMARY_SNAPSHOT.FINGERPRINTS.get(self._SUMMARY_KEY) != fingerprint:
+                self._update_snapshot(self._SUMMARY_SNAPSHOT, self._get_frames(self.SUMMARY_FRAME_NAMES),
+                                      {self._SUMMARY_KEY: fingerprint})
+
+    def _restore_summary_snapshot(self) -> bool:
+        """
+        Fills in the summary frames from the saved snapshot, if the files they were made from haven't changed since.
+        Nothing is restored if the summary frames have already been made.
+        :return: Whether the summary frames were restored.
+        """
+        if any(frame is not None for frame in self._get_frames(self.SUMMARY_FRAME_NAMES).values()):
+            return False
+        if not self._SUMMARY_SNAPSHOT.load():
+            return False
+        if not self._SUMMARY_SNAPSHOT.get_valid_keys({self._SUMMARY_KEY: self._FETCHER.get_summary_fingerprint()}):
+            return False
+
+        for name, frame in self._SUMMARY_SNAPSHOT.FRAMES.items():
+            setattr(self, f'_{name}', frame)
+        logging.verbose(f'Restored the summary of {self.SET} {self.FORMAT} from its snapshot.')
+        return True
+
     def check_for_updates(self) -> None:  # pragma: no cover
         """Populates and updates data properties, filling in missing selected data."""
         logging.sparse(f'Checking for missing {self.SET} {self.FORMAT} data...')
@@ -1,16 +1,23 @@
 from __future__ import annotations
-from typing import Optional, Union
+from typing import Optional, Union, Callable, TypeVar
 from core.data_fetching.utils import CARD_DATA, META_DATA, WUBRG_CARD_DATA
 import os
 from datetime import date, datetime, time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from core.wubrg import COLOR_COMBINATIONS
 from core.utilities.auto_logging import logging
-from core.utilities import save_json_file, load_json_file
 
 from core.data_requesting.Requester import Requester
+from core.data_requesting.ResponseCache import ResponseCache
 from core.game_metadata import CardManager
-from core.data_fetching.utils.settings import DATA_DIR_LOC, DATA_DIR_NAME
+from core.data_fetching.utils.settings import DATA_DIR_LOC, DATA_DIR_NAME, CONCURRENT_FETCH, FETCH_WORKERS, \
+    USE_WAREHOUSE, HTTP_CACHE_NAME, HTTP_CACHE_SIZE, MIGRATE_JSON
+from core.data_fetching.DataStore import DataStore, JsonDataStore
+from core.data_fetching.DataWarehouse import DataWarehouse
+from core.data_fetching.DataManifest import DataManifest
+
+T = TypeVar('T')
 
 
 class DataLoader:
@@ -19,18 +26,38 @@ class DataLoader:
     data based on whether it exists locally or not.
     """
 
-    # TODO: This could be made more space efficient by converting fetched data into a csv format before saving.
     # TODO: Add a check to handle instances of getting back "dummy" data (where all values are 0)
     _DEFAULT_DATE: date = date(2020, 1, 1)
     _BASE_URL: str = 'https://www.17lands.com/'
-    _MIN_FILE_SIZE: int = 265
 
-    def __init__(self, set_name: str, format_name: str, target_date: date = None):
+    # Controls how data for a whole day is fetched. Requests are still paced by the rate limit
+    #  for 17Lands, which is shared by every Requester, so more workers won't exceed it.
+    CONCURRENT_FETCH: bool = CONCURRENT_FETCH
+    FETCH_WORKERS: int = FETCH_WORKERS
+    _META_TASK_KEY: str = 'ColorRatings'
+
+    # Summary responses are revalidated with 17Lands before being re-downloaded.
+    #  Data for a single day is only fetched once, and is already saved by the store, so it isn't cached.
+    _RESPONSE_CACHE: ResponseCache = ResponseCache(os.path.join(DATA_DIR_LOC, HTTP_CACHE_NAME), HTTP_CACHE_SIZE)
+
+    # Json is always available to import and export data, whichever store is used.
+    #  Json files saved before switching store are only imported into the new one if MIGRATE_JSON is set.
+    _JSON_STORE: JsonDataStore = JsonDataStore()
+    MIGRATE_JSON: bool = MIGRATE_JSON
+
+    # Whether all data loaded or fetched is also saved into the shared DataWarehouse.
+    USE_WAREHOUSE: bool = USE_WAREHOUSE
+
+    def __init__(self, set_name: str, format_name: str, target_date: date = None, store: DataStore = None,
+                 warehouse: DataWarehouse = None):
         self.SET: str = set_name
         self.FORMAT: str = format_name
         self.DATE: Optional[date] = target_date
-        os.makedirs(self.get_folder_path(), exist_ok=True)
-        self._fetcher: Requester = Requester()
+        self._MANIFEST: DataManifest = DataManifest.get_manifest(set_name, format_name)
+        self._fetcher: Requester = Requester(cache=self._RESPONSE_CACHE if target_date is None else None)
+        self._STORE: DataStore = store or DataStore.get_store()
+        self._WAREHOUSE: Optional[DataWarehouse] = warehouse or \
+            (DataWarehouse.get_warehouse() if self.USE_WAREHOUSE else None)
 
     def _get_date_filter(self) -> str:
         """Generates a piece of the url to isolate data to a certain date range."""
@@ -54,120 +81,260 @@ class DataLoader:
         url += self._get_date_filter()
         return url
 
-    def get_folder_path(self) -> str:
-        """Returns the appropriate folder path, based on the properties of the object."""
-        path = os.path.join(DATA_DIR_LOC, DATA_DIR_NAME, self.SET, self.FORMAT)
+    def get_date_key(self) -> str:
+        """Returns the date the data is for as a string, or 'ALL' for summary data."""
         if self.DATE:
-            return os.path.join(path, str(self.DATE))
+            return str(self.DATE)
         else:
-            return os.path.join(path, 'ALL')
+            return DataWarehouse.SUMMARY_DATE
+
+    def get_folder_path(self) -> str:
+        """Returns the appropriate folder path, based on the properties of the object."""
+        return os.path.join(DATA_DIR_LOC, DATA_DIR_NAME, self.SET, self.FORMAT, self.get_date_key())
 
     def get_file_path(self, filename: str) -> str:
         """Returns the full file path for a given file name, based on `get_folder_path`"""
         return os.path.join(self.get_folder_path(), filename)
 
     def file_exists(self, filename: str) -> bool:
-        """Checks if a file exists in the appropriate directory for the object."""
-        return os.path.isfile(self.get_file_path(filename))
+        """Checks if a file exists in the appropriate directory for the object, according to the manifest."""
+        return self._MANIFEST.get_entry(self.get_date_key(), filename) is not None
 
     def get_last_summary_update_time(self) -> datetime:
         """
         Returns a UTC datetime object for the last write time of the managed files.
         :return: A datetime object.
         """
-        wrt_tm = datetime.utcnow()
-        try:
-            files = os.listdir(self.get_folder_path())
-            for file in files:
-                sum_path = os.path.abspath(self.get_file_path(file))
-                wrt_tm = min(datetime.utcfromtimestamp(os.path.getmtime(sum_path)), wrt_tm)
-        except FileNotFoundError:  # pragma: no cover
+        # Only the files of the store being used count, unless it has none, and json files are read in their place.
+        wrt_tm = self._MANIFEST.get_fetch_time(self.get_date_key(), self._STORE)
+        if wrt_tm is None and not isinstance(self._STORE, JsonDataStore):
+            wrt_tm = self._MANIFEST.get_fetch_time(self.get_date_key(), self._JSON_STORE)
+
+        # If nothing has been saved, treat the data as being as old as possible, so it's always stale.
+        if wrt_tm is None:
             wrt_tm = datetime.combine(self._DEFAULT_DATE, time(0, 0))
         logging.debug(f'Last write-time: {wrt_tm}')
         return wrt_tm
 
-    def _file_valid(self, filename: str) -> bool:
+    def _save_data(self, store: DataStore, card_data: WUBRG_CARD_DATA, meta_data: Optional[META_DATA] = None,
+                   fetched: datetime = None) -> None:
+        """
+        Saves data into a store, and records the files written in the manifest. Only those files are checked.
+        :param store: The store to save the data in
+        :param card_data: A dictionary of colours and their card data
+        :param meta_data: The archetype data, if any
+        :param fetched: When the data was fetched from 17Lands. Default: None, which uses the current time
+        """
+        folder = self.get_folder_path()
+        os.makedirs(folder, exist_ok=True)
+        if card_data:
+            store.save_card_data(folder, card_data)
+        if meta_data is not None:
+            store.save_meta_data(folder, meta_data)
+        filenames = store.get_data_files(card_data or dict(), meta_data is not None)
+        self._MANIFEST.update(self.get_date_key(), store, fetched, filenames)
+
+    def _get_json_fetch_time(self) -> Optional[datetime]:
         """
-        Checks if a file contains actual data related to the game, or if it was created with no data.
-        :param filename: The name of the file to check.
-        :return: True if the file is not an empty list. False, if no real data exists.
+        Gets when the json files in the folder were fetched, from when the oldest of them was last written to.
+        Used when importing them, so the imported data isn't recorded as being fetched just now.
+        :return: A UTC datetime, or None if there are no json files.
         """
-        file_path = self.get_file_path(filename)
-        valid = os.path.getsize(file_path) > self._MIN_FILE_SIZE
-        if not valid:  # pragma: no cover
-            logging.debug(f'{filename} contained no data!')
-        return valid
+        folder = self.get_folder_path()
+        times = [os.path.getmtime(os.path.join(folder, file)) for file in self._JSON_STORE.get_files(folder)]
+        return datetime.utcfromtimestamp(min(times)) if times else None
 
-    def _get_data(self, url: str, filename: str, overwrite: bool = False) -> \
-            Union[CARD_DATA, META_DATA]:  # pragma: no cover
+    def _fetch_data(self, url: str, name: str) -> Optional[Union[CARD_DATA, META_DATA]]:  # pragma: no cover
         """
-        Automatically gets the appropriate data. If it saved locally, it will query 17Lands for the data
-        and then save it to a file. Otherwise, it will load it from the file.
+        Queries 17Lands for data, and corrects the card names in it.
         :param url: The url to get the data from
-        :param filename: The file to load/save data from/to
-        :param overwrite: Forcibly overwrite the data in the file
-        :return: A dictionary of the data.
-        """
-        fetch = overwrite or (not self.file_exists(filename)) or (not self._file_valid(filename))
-        if fetch:
-            if overwrite:
-                logging.verbose(f"Updating data for '{filename}'. Fetching from 17Lands site...")
-            else:
-                logging.verbose(f"Data for '{filename}' not found in saved data. Fetching from 17Lands site...")
-            raw_data = self._fetcher.get_json_response(url)
-
-            if raw_data is None:
-                logging.error(f"Data fetched for '{filename}' returned None! Returning empty CARD_DATA struct")
-                return CARD_DATA
-
-            # Handles correcting data from 17Lands, since data coming back from MTGA can't be trusted.
-            for data in raw_data:
-                if 'name' in data:
-                    name = data['name']
-                    card_obj = CardManager.from_name(name)
-                    data['name'] = card_obj.NAME
-
-            save_json_file(self.get_folder_path(), filename, raw_data)
-        else:
-            raw_data = load_json_file(self.get_folder_path(), filename)
+        :param name: The name of the data, for logging
+        :return: The data, or None if it couldn't be fetched.
+        """
+        logging.verbose(f"Fetching data for '{name}' from 17Lands site...")
+        raw_data = self._fetcher.get_json_response(url)
+
+        if raw_data is None:
+            logging.error(f"Data fetched for '{name}' returned None!")
+            return None
+
+        # Handles correcting data from 17Lands, since data coming back from MTGA can't be trusted.
+        #  All the names are looked up at once, so unknown cards are fetched in batches.
+        named_data = [data for data in raw_data if 'name' in data]
+        card_objs = CardManager.from_names([data['name'] for data in named_data])
+        for data, card_obj in zip(named_data, card_objs):
+            data['name'] = card_obj.NAME
+
         return raw_data
 
+    def _save_to_warehouse(self, card_data: WUBRG_CARD_DATA, meta_data: Optional[META_DATA] = None) -> None:
+        """
+        Saves data into the warehouse, if one is being used.
+        :param card_data: A dictionary of colours and their card data
+        :param meta_data: The archetype data, if any
+        """
+        if self._WAREHOUSE is None:
+            return
+        self._WAREHOUSE.save_card_data(self.SET, self.FORMAT, self.get_date_key(), card_data)
+        if meta_data is not None:
+            self._WAREHOUSE.save_meta_data(self.SET, self.FORMAT, self.get_date_key(), meta_data)
+
+    def _load_data(self, colors: list[str], meta: bool) -> tuple[WUBRG_CARD_DATA, Optional[META_DATA]]:
+        """
+        Loads any of the requested data which is saved locally. If the store doesn't have it, but json files
+        from before the store was changed do, they're read instead, and imported into the store if MIGRATE_JSON is set.
+        :param colors: The colour filters to load card data for
+        :param meta: Whether to load the archetype data
+        :return: A dictionary of the colours found and their card data, and the archetype data if found. The card data
+        is whatever the store loads it as, eg. a CardTable, so it should only be read.
+        """
+        # If the manifest has no files with data, there's nothing to load, so don't touch the disk.
+        if not self._MANIFEST.get_files(self.get_date_key(), valid_only=True):
+            return dict(), None
+
+        folder = self.get_folder_path()
+        card_data = self._STORE.load_card_data(folder, colors)
+        meta_data = self._STORE.load_meta_data(folder) if meta else None
+
+        if not isinstance(self._STORE, JsonDataStore):
+            missing = [color for color in colors if color not in card_data]
+            legacy = self._JSON_STORE.load_card_data(folder, missing)
+            legacy_meta = self._JSON_STORE.load_meta_data(folder) if meta and meta_data is None else None
+            if (legacy or legacy_meta is not None) and self.MIGRATE_JSON:
+                logging.verbose(f'Importing json data for {len(legacy)} colours.')
+                self._save_data(self._STORE, legacy, legacy_meta, self._get_json_fetch_time())
+            card_data = {**card_data, **legacy} if legacy else card_data
+            meta_data = meta_data if legacy_meta is None else legacy_meta
+
+        return card_data, meta_data
+
+    def _get_data(self, colors: list[str], meta: bool, overwrite: bool = False, concurrent: bool = False) \
+            -> tuple[WUBRG_CARD_DATA, META_DATA]:
+        """
+        Automatically gets the appropriate data. Whatever is saved locally is loaded, and anything else is
+        fetched from 17Lands and then saved.
+        :param colors: The colour filters to get card data for
+        :param meta: Whether to get the archetype data
+        :param overwrite: Forcibly overwrite the saved data
+        :param concurrent: Fetch the missing data with a pool of workers
+        :return: A dictionary of colours and their card data, and the archetype data.
+        """
+        if overwrite:
+            card_data, meta_data = dict(), None
+        else:
+            card_data, meta_data = self._load_data(colors, meta)
+
+        # Add anything saved locally which the warehouse doesn't have yet. Fetched data is added as it's saved.
+        if self._WAREHOUSE is not None and (card_data or meta_data is not None):
+            loaded = self._WAREHOUSE.get_loaded(self.SET, self.FORMAT, self.get_date_key())
+            self._save_to_warehouse({color: data for color, data in card_data.items() if color not in loaded},
+                                    meta_data if None not in loaded else None)
+
+        # Work out what still needs to be fetched.
+        urls = {color: self.get_card_rating_url(color) for color in colors if color not in card_data}
+        if meta and meta_data is None:
+            urls[self._META_TASK_KEY] = self.get_color_rating_url()
+
+        if urls:
+            # Fetch the archetype data alongside the card data, instead of waiting for all the cards to finish.
+            #  Everything fetched is saved together once fetching stops, so the day's files are only written once,
+            #  and anything fetched before a failure part way through is still kept.
+            tasks = {key: (lambda u=url, k=key: self._fetch_data(u, k)) for key, url in urls.items()}
+            fetched = dict()
+            try:
+                if concurrent:
+                    fetched.update(self._run_concurrently(tasks))
+                else:
+                    for key, task in tasks.items():
+                        fetched[key] = task()
+            finally:
+                fetched = {key: data for key, data in fetched.items() if data is not None}
+                fetched_meta = fetched.pop(self._META_TASK_KEY, None)
+                if fetched or fetched_meta is not None:
+                    self._save_data(self._STORE, fetched, fetched_meta)
+                    self._save_to_warehouse(fetched, fetched_meta)
+
+            card_data = {**card_data, **fetched} if fetched else card_data
+            if fetched_meta is not None:
+                meta_data = fetched_meta
+
+        # Anything which couldn't be gotten is returned empty. When everything was loaded, it's returned as it was,
+        #  so data the store keeps as a table, eg. a CardTable, isn't turned into json objects unless it's used.
+        if list(card_data) != list(colors):
+            card_data = {color: card_data.get(color, list()) for color in colors}
+        return card_data, meta_data or list()
+
     def get_card_data(self, color: str = '', overwrite: bool = False) -> CARD_DATA:
         """
         Get the data on individual card performance.
         :param color: The colours to filter card performance on
-        :param overwrite: Forcibly overwrite the data in the file
+        :param overwrite: Forcibly overwrite the saved data
         :return: A list of dictionaries with card value mapping to their data.
         """
-        return self._get_data(self.get_card_rating_url(color), f'{color}CardRatings.json', overwrite)
+        return self._get_data([color], False, overwrite)[0][color]
 
     def get_meta_data(self, overwrite: bool = False) -> META_DATA:
         """
         Gets data on archetype performance.
-        :param overwrite: Forcibly overwrite the data in the file
+        :param overwrite: Forcibly overwrite the saved data
         :return: A dictionary, with archetype names as keys
         """
-        return self._get_data(self.get_color_rating_url(), f'ColorRatings.json', overwrite)
+        return self._get_data(list(), True, overwrite)[1]
+
+    def _run_concurrently(self, tasks: dict[str, Callable[[], T]]) -> dict[str, T]:
+        """
+        Runs the provided tasks on a bounded pool of workers, collecting their results as they finish.
+        A task which raises an error is logged and left out, so it doesn't lose the results of the others.
+        :param tasks: A dictionary of keys, and the functions to run for them.
+        :return: A dictionary of the keys whose tasks finished, mapped to the results of their functions.
+        """
+        results = dict()
+        with ThreadPoolExecutor(max_workers=self.FETCH_WORKERS, thread_name_prefix='DataLoader') as executor:
+            futures = {executor.submit(task): key for key, task in tasks.items()}
+            for future in as_completed(futures):
+                try:
+                    results[futures[future]] = future.result()
+                except Exception as ex:
+                    logging.error(f"Failed to get data for '{futures[future]}'. ({ex!r})")
+        return results
 
-    def get_all_card_data(self, overwrite: bool = False) -> WUBRG_CARD_DATA:  # pragma: no cover
+    def get_all_card_data(self, overwrite: bool = False, concurrent: bool = None) \
+            -> WUBRG_CARD_DATA:  # pragma: no cover
         """
         Gets data on card performance for all colour combinations.
-        :param overwrite: Forcibly overwrite the data in the file
+        :param overwrite: Forcibly overwrite the saved data
+        :param concurrent: Fetch the colour combinations with a pool of workers. Default: CONCURRENT_FETCH
         :return: A dictionary of dictionaries, with deck colours as keys
         """
-        all_card_data = dict()
-        for color in COLOR_COMBINATIONS:
-            all_card_data[color] = self.get_card_data(color, overwrite)
-
-        return all_card_data
+        concurrent = self.CONCURRENT_FETCH if concurrent is None else concurrent
+        return self._get_data(COLOR_COMBINATIONS, False, overwrite, concurrent)[0]
 
-    def get_day_data(self, overwrite: bool = False) -> tuple[WUBRG_CARD_DATA, META_DATA]:  # pragma: no cover
+    def get_day_data(self, overwrite: bool = False, concurrent: bool = None) \
+            -> tuple[WUBRG_CARD_DATA, META_DATA]:  # pragma: no cover
         """
         Gets all data available for the day.
-        :param overwrite: Forcibly overwrite the data in the file
+        :param overwrite: Forcibly overwrite the saved data
+        :param concurrent: Fetch the data with a pool of workers. Default: CONCURRENT_FETCH
         :return: A tuple of dictionaries containing data from 17Lands
         """
-        card_data = self.get_all_card_data(overwrite)
-        meta_data = self.get_meta_data(overwrite)
+        concurrent = self.CONCURRENT_FETCH if concurrent is None else concurrent
+        return self._get_data(COLOR_COMBINATIONS, True, overwrite, concurrent)
 
-        return card_data, meta_data
+    def import_json(self) -> bool:
+        """
+        Imports any json files in the folder into the store being used.
+        :return: Whether any data was imported.
+        """
+        fetched = self._get_json_fetch_time()
+        imported = self._JSON_STORE.copy_to(self.get_folder_path(), self._STORE, COLOR_COMBINATIONS)
+        self._MANIFEST.update(self.get_date_key(), self._STORE, fetched)
+        return imported
+
+    def export_json(self) -> bool:
+        """
+        Exports the data in the folder to json files, with one file per response, as they come from 17Lands.
+        :return: Whether any data was exported.
+        """
+        exported = self._STORE.copy_to(self.get_folder_path(), self._JSON_STORE, COLOR_COMBINATIONS)
+        self._MANIFEST.update(self.get_date_key(), self._JSON_STORE)
+        return exported
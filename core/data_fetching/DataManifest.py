@@ -0,0 +1,331 @@
+"""
+An index of the data files saved for a set and format, so they don't need to be checked on disk every time.
+"""
+
+from __future__ import annotations
+from typing import Optional, Any, Iterable, Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from hashlib import sha1
+from threading import Lock
+import json
+import os
+import tempfile
+
+from core.utilities.auto_logging import logging
+
+from core.data_fetching.utils.settings import DATA_DIR_LOC, DATA_DIR_NAME
+from core.data_fetching.DataStore import DataStore
+
+
+class DataManifest:
+    """
+    Records the files saved for a set and format, with when each was fetched, its size, checksum and whether it has
+    any data. Entries are grouped by the folder (date) the files are in. The manifest is kept in memory, and saved
+    atomically as 'manifest.json' in the format's folder whenever it changes. Inside a `batch`, it's only saved once,
+    when the batch ends, so working through many dates doesn't re-write it for each one.
+
+    If no manifest has been saved, one is built by scanning the folder once. A folder which isn't in the manifest,
+    eg. as it was saved by an older version or copied in by hand, is scanned the first time it's asked about.
+    Checksums are only worked out when a fingerprint first needs them, so building the manifest doesn't read every
+    file. Other changes to files outside of the DataLoader aren't noticed, so `rebuild` should be used after them.
+
+    The class also acts as a global repository of manifests, with one per set and format.
+    """
+    MANIFESTS: dict[str, DataManifest] = dict()
+    _LOCK: Lock = Lock()
+
+    FILENAME: str = 'manifest.json'
+    _CHUNK_SIZE: int = 2 ** 16
+
+    @classmethod
+    def get_manifest(cls, set_code: str, format_name: str) -> DataManifest:
+        """
+        Returns the shared manifest for a set and format, loading or building it if needed.
+        :param set_code: The set the manifest is for.
+        :param format_name: The format the manifest is for.
+        :return: The DataManifest for the set and format.
+        """
+        folder = os.path.join(DATA_DIR_LOC, DATA_DIR_NAME, set_code, format_name)
+        with cls._LOCK:
+            if folder not in cls.MANIFESTS:
+                cls.MANIFESTS[folder] = cls(folder)
+            return cls.MANIFESTS[folder]
+
+    def __init__(self, folder: str):
+        self.FOLDER: str = folder
+        self._lock: Lock = Lock()
+        self._entries: dict[str, dict[str, dict[str, Any]]] = dict()
+
+        # The folders missing from the manifest which have been scanned, so they're only looked for on disk once.
+        self._scanned: set[str] = set()
+
+        # How many batches are open, and whether the manifest has changed during them.
+        self._batches: int = 0
+        self._changed: bool = False
+
+        if not self._load():
+            self.rebuild()
+
+    @property
+    def file_path(self) -> str:
+        """ The path the manifest is saved to. """
+        return os.path.join(self.FOLDER, self.FILENAME)
+
+    def _load(self) -> bool:
+        """
+        Loads the saved manifest.
+        :return: Whether the manifest was loaded.
+        """
+        try:
+            with open(self.file_path, 'r', encoding='utf-8') as f:
+                self._entries = json.load(f)
+            return True
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError) as ex:
+            logging.warning(f'Failed to load manifest for {self.FOLDER}, it will be rebuilt. ({ex})')
+            return False
+
+    def _save(self) -> bool:
+        """
+        Saves the manifest to a temporary file, then moves it into place.
+        :return: Whether the manifest was saved.
+        """
+        os.makedirs(self.FOLDER, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.FOLDER, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, indent=4, sort_keys=True)
+            os.replace(tmp_path, self.file_path)
+            return True
+        except OSError as ex:
+            logging.error(f'Failed to save manifest for {self.FOLDER}. ({ex})')
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
+
+    def _mark_changed(self) -> None:
+        """
+        Saves the manifest after it has changed, or once the open batches end if there are any.
+        Must be called while holding the lock.
+        """
+        if self._batches:
+            self._changed = True
+        else:
+            self._save()
+
+    @contextmanager
+    def batch(self) -> Iterator[DataManifest]:
+        """
+        Holds off saving the manifest until the end of the batch, eg. while loading or fetching many dates.
+        Batches can be nested, and the manifest is saved when the outermost one ends, if anything changed.
+        :return: A context manager, which gives the manifest.
+        """
+        with self._lock:
+            self._batches += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batches -= 1
+                if not self._batches and self._changed:
+                    self._changed = False
+                    self._save()
+
+    @classmethod
+    def _gen_entry(cls, file_path: str, store: DataStore, fetched: datetime = None) -> dict[str, Any]:
+        """
+        Describes a file, for the manifest.
+        :param file_path: The path of the file.
+        :param store: The store the file belongs to.
+        :param fetched: When the file was fetched. Default: None, which uses when the file was last modified.
+        :return: A dictionary with details on the file. The checksum is left as None, until it's needed.
+        """
+        stat = os.stat(file_path)
+        return {
+            'fetched': (fetched or datetime.utcfromtimestamp(stat.st_mtime)).isoformat(),
+            'size': stat.st_size,
+            'mtime': stat.st_mtime,
+            'checksum': None,
+            'valid': store.is_file_valid(file_path),
+            'store': store.NAME,
+        }
+
+    @classmethod
+    def _get_checksum(cls, file_path: str) -> Optional[str]:
+        """
+        Works out the checksum of a file.
+        :param file_path: The path of the file.
+        :return: A hex digest of the file's contents, or None if it couldn't be read.
+        """
+        checksum = sha1()
+        try:
+            with open(file_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(cls._CHUNK_SIZE), b''):
+                    checksum.update(chunk)
+        except OSError as ex:
+            logging.warning(f'Failed to read {file_path} for its checksum. ({ex})')
+            return None
+        return checksum.hexdigest()
+
+    def _scan_folder(self, date_key: str) -> dict[str, dict[str, Any]]:
+        """
+        Describes every data file in a folder, for the manifest.
+        :param date_key: The folder (date) to scan.
+        :return: A dictionary of filenames, and their details.
+        """
+        folder = os.path.join(self.FOLDER, date_key)
+        entries = dict()
+        for store in [store() for store in DataStore.get_stores()]:
+            for filename in store.get_files(folder):
+                entries[filename] = self._gen_entry(os.path.join(folder, filename), store)
+        return entries
+
+    def _get_entries(self, date_key: str) -> dict[str, dict[str, Any]]:
+        """
+        Gets the entries for the files in a folder. If the folder isn't in the manifest, it's scanned for any files
+        which were saved without being recorded. Must be called while holding the lock.
+        :param date_key: The folder (date) to get the entries for.
+        :return: A dictionary of filenames, and their details, which is empty if the folder has no files.
+        """
+        if date_key not in self._entries and date_key not in self._scanned:
+            self._scanned.add(date_key)
+            entries = self._scan_folder(date_key)
+            if entries:
+                logging.debug(f'Added {len(entries)} files in {date_key} which were missing from the manifest.')
+                self._entries[date_key] = entries
+                self._mark_changed()
+        return self._entries.get(date_key, dict())
+
+    def rebuild(self) -> None:
+        """ Rebuilds the manifest, by scanning every data file for the set and format. """
+        try:
+            folders = [name for name in os.listdir(self.FOLDER) if os.path.isdir(os.path.join(self.FOLDER, name))]
+        except FileNotFoundError:
+            folders = list()
+
+        entries = {date_key: self._scan_folder(date_key) for date_key in folders}
+        entries = {date_key: files for date_key, files in entries.items() if files}
+
+        with self._lock:
+            self._entries = entries
+            self._scanned = set(folders)
+            if entries:
+                logging.debug(f'Rebuilt manifest for {self.FOLDER}, with {len(entries)} folders.')
+                self._mark_changed()
+
+    def update(self, date_key: str, store: DataStore, fetched: datetime = None, filenames: Iterable[str] = None) \
+            -> None:
+        """
+        Records the files a store has saved in a folder, after they've been written to.
+        Only files which have changed since they were last recorded are read, and any of them which no longer exist
+        are removed.
+        :param date_key: The folder (date) the files are in.
+        :param store: The store which saved the files.
+        :param fetched: When the data in the changed files was fetched, eg. for data imported from older files.
+        Default: None, which uses the current time.
+        :param filenames: The files which were written. Default: None, which checks all of the store's files in the
+        folder, and removes any which no longer exist.
+        """
+        folder = os.path.join(self.FOLDER, date_key)
+        now = fetched or datetime.utcnow()
+
+        with self._lock:
+            # Any files in the folder which were saved without being recorded are picked up first.
+            self._get_entries(date_key)
+            entries = self._entries.setdefault(date_key, dict())
+            if filenames is None:
+                filenames = store.get_files(folder)
+                checked = [filename for filename, entry in entries.items() if entry['store'] == store.NAME]
+                checked = set(filenames) | set(checked)
+            else:
+                checked = set(filenames)
+
+            changed = False
+            removed = list()
+            for filename in sorted(checked):
+                file_path = os.path.join(folder, filename)
+                try:
+                    stat = os.stat(file_path)
+                except FileNotFoundError:
+                    # Remove the files which have been deleted, so they aren't loaded or counted in the fingerprint.
+                    if entries.pop(filename, None) is not None:
+                        removed.append(filename)
+                    continue
+
+                entry = entries.get(filename)
+                if entry is None or entry['size'] != stat.st_size or entry['mtime'] != stat.st_mtime:
+                    entries[filename] = self._gen_entry(file_path, store, now)
+                    changed = True
+
+            if not entries:
+                del self._entries[date_key]
+            if changed or removed:
+                self._mark_changed()
+
+    def get_entry(self, date_key: str, filename: str) -> Optional[dict[str, Any]]:
+        """
+        Gets the details of a file.
+        :param date_key: The folder (date) the file is in.
+        :param filename: The name of the file.
+        :return: A dictionary with details of the file, or None if it's not in the manifest.
+        """
+        with self._lock:
+            return self._get_entries(date_key).get(filename)
+
+    def get_files(self, date_key: str, store: DataStore = None, valid_only: bool = False) -> list[str]:
+        """
+        Gets the files recorded in a folder.
+        :param date_key: The folder (date) to get files for.
+        :param store: A store to limit the files to. Default: None, which includes the files of every store.
+        :param valid_only: Whether to only include files which have data. Default: False
+        :return: A sorted list of filenames.
+        """
+        with self._lock:
+            entries = self._get_entries(date_key)
+            return sorted(filename for filename, entry in entries.items()
+                          if (store is None or entry['store'] == store.NAME) and (entry['valid'] or not valid_only))
+
+    def get_fingerprint(self, date_key: str) -> Optional[str]:
+        """
+        Gets a fingerprint of the files with data in a folder, which changes whenever any of them do.
+        :param date_key: The folder (date) to get the fingerprint for.
+        :return: A hex digest of the files' names and checksums, or None if there are no files with data.
+        """
+        with self._lock:
+            entries = self._get_entries(date_key)
+            files = {filename: entry for filename, entry in entries.items() if entry['valid']}
+        if not files:
+            return None
+
+        # Work out any checksums which haven't been yet, and save them so they're only read once.
+        checksums = {filename: self._get_checksum(os.path.join(self.FOLDER, date_key, filename))
+                     for filename, entry in files.items() if entry['checksum'] is None}
+        checksums = {filename: checksum for filename, checksum in checksums.items() if checksum is not None}
+        if checksums:
+            with self._lock:
+                for filename, checksum in checksums.items():
+                    files[filename]['checksum'] = checksum
+                self._mark_changed()
+
+        files = sorted((filename, entry['checksum']) for filename, entry in files.items())
+
+        fingerprint = sha1()
+        for filename, checksum in files:
+            fingerprint.update(f'{filename}:{checksum};'.encode('utf-8'))
+        return fingerprint.hexdigest()
+
+    def get_fetch_time(self, date_key: str, store: DataStore = None) -> Optional[datetime]:
+        """
+        Gets when the oldest file in a folder was fetched.
+        :param date_key: The folder (date) to check.
+        :param store: A store to limit the files to. Default: None, which includes the files of every store.
+        :return: A UTC datetime, or None if there are no files.
+        """
+        with self._lock:
+            entries = self._get_entries(date_key)
+            times = [entry['fetched'] for entry in entries.values() if store is None or entry['store'] == store.NAME]
+        if not times:
+            return None
+        return datetime.fromisoformat(min(times))
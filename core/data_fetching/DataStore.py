@@ -0,0 +1,305 @@
+"""
+Handles how the data fetched from 17Lands is saved to and loaded from disk.
+"""
+
+from __future__ import annotations
+from typing import Optional, Iterable
+from abc import ABC, abstractmethod
+from inspect import isabstract
+from threading import Lock
+import os
+import tempfile
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from core.utilities.auto_logging import logging
+from core.utilities import save_json_file, load_json_file
+
+from core.data_fetching.utils.consts import CARD_DATA, META_DATA, WUBRG_CARD_DATA
+from core.data_fetching.utils.settings import DATA_STORE, PARQUET_COMPRESSION
+from core.data_fetching.CardTable import CardTable
+
+
+class DataStore(ABC):
+    """
+    The base for the ways data for a set, format and date can be stored. Each instance of data lives in its own folder,
+    and a store decides which files it's kept in, and how. A store which doesn't implement every abstract method fails
+    when it's created, rather than part way through saving data.
+
+    Stores are picked by their NAME, using `get_store`, so the format can be changed in the settings.
+    """
+    NAME: str = ''
+
+    @classmethod
+    def get_stores(cls) -> list[type[DataStore]]:
+        """
+        Gets every kind of store which can be used, leaving out any which don't implement every method.
+        :return: A list of store classes.
+        """
+        return [store for store in cls.__subclasses__() if not isabstract(store)]
+
+    @classmethod
+    def get_store(cls, name: str = None) -> DataStore:
+        """
+        Gets a store based on its name.
+        :param name: The name of the store. Default: DATA_STORE
+        :return: An instance of the store.
+        """
+        name = name or DATA_STORE
+        for store in cls.get_stores():
+            if store.NAME == name:
+                return store()
+        raise ValueError(f"'{name}' is not a valid data store.")
+
+    @abstractmethod
+    def owns_file(self, filename: str) -> bool:
+        """
+        Checks if a file is one this store keeps data in.
+        :param filename: The name of the file.
+        :return: Whether the file belongs to this store.
+        """
+
+    @abstractmethod
+    def is_file_valid(self, file_path: str) -> bool:
+        """
+        Checks if a file belonging to this store contains actual data, rather than being created with none.
+        :param file_path: The path of the file.
+        :return: Whether the file has data.
+        """
+
+    def get_files(self, folder: str) -> list[str]:
+        """
+        Gets the files in a folder which hold data for this store.
+        :param folder: The folder to check.
+        :return: A list of filenames.
+        """
+        try:
+            return sorted(file for file in os.listdir(folder) if self.owns_file(file))
+        except FileNotFoundError:
+            return list()
+
+    @abstractmethod
+    def get_data_files(self, colors: Iterable[str], meta: bool) -> list[str]:
+        """
+        Gets the files which saving some data writes to, so only those need to be checked afterwards.
+        :param colors: The colour filters of the card data being saved.
+        :param meta: Whether archetype data is being saved.
+        :return: A list of filenames.
+        """
+
+    @abstractmethod
+    def load_card_data(self, folder: str, colors: Iterable[str]) -> WUBRG_CARD_DATA:
+        """
+        Loads the card data for a number of colour filters.
+        :param folder: The folder to load the data from.
+        :param colors: The colour filters to load data for.
+        :return: A dictionary of the colours which have data, and their card data.
+        """
+
+    @abstractmethod
+    def save_card_data(self, folder: str, card_data: WUBRG_CARD_DATA) -> bool:
+        """
+        Saves the card data for a number of colour filters, replacing any existing data for those colours.
+        :param folder: The folder to save the data in.
+        :param card_data: A dictionary of colours, and their card data.
+        :return: Whether the data was saved.
+        """
+
+    @abstractmethod
+    def load_meta_data(self, folder: str) -> Optional[META_DATA]:
+        """
+        Loads the archetype data.
+        :param folder: The folder to load the data from.
+        :return: The archetype data, or None if there is none.
+        """
+
+    @abstractmethod
+    def save_meta_data(self, folder: str, meta_data: META_DATA) -> bool:
+        """
+        Saves the archetype data, replacing any existing data.
+        :param folder: The folder to save the data in.
+        :param meta_data: The archetype data.
+        :return: Whether the data was saved.
+        """
+
+    def copy_to(self, folder: str, store: DataStore, colors: Iterable[str]) -> bool:
+        """
+        Copies the data in a folder into another store, eg. to import or export json files.
+        :param folder: The folder which holds the data.
+        :param store: The store to copy the data to.
+        :param colors: The colour filters to copy card data for.
+        :return: Whether any data was copied.
+        """
+        card_data = self.load_card_data(folder, colors)
+        meta_data = self.load_meta_data(folder)
+        if card_data:
+            store.save_card_data(folder, card_data)
+        if meta_data:
+            store.save_meta_data(folder, meta_data)
+        return bool(card_data) or bool(meta_data)
+
+
+class JsonDataStore(DataStore):
+    """
+    Stores each response from 17Lands as its own json file, exactly as it was received.
+    Files which were saved without any real data are ignored, so they get fetched again.
+    """
+    NAME: str = 'json'
+    _MIN_FILE_SIZE: int = 265
+    _CARD_SUFFIX: str = 'CardRatings.json'
+    _META_FILE: str = 'ColorRatings.json'
+
+    def owns_file(self, filename: str) -> bool:
+        return filename.endswith(self._CARD_SUFFIX) or filename == self._META_FILE
+
+    def is_file_valid(self, file_path: str) -> bool:
+        return os.path.getsize(file_path) > self._MIN_FILE_SIZE
+
+    def get_data_files(self, colors: Iterable[str], meta: bool) -> list[str]:
+        return [f'{color}{self._CARD_SUFFIX}' for color in colors] + ([self._META_FILE] if meta else list())
+
+    def _load(self, folder: str, filename: str) -> Optional[list[dict]]:
+        """
+        Loads a json file, if it contains actual data related to the game.
+        :param folder: The folder the file is in.
+        :param filename: The name of the file to load.
+        :return: The data in the file, or None if it doesn't exist or was created with no data.
+        """
+        file_path = os.path.join(folder, filename)
+        if not os.path.isfile(file_path):
+            return None
+
+        if not self.is_file_valid(file_path):
+            logging.debug(f'{filename} contained no data!')
+            return None
+        return load_json_file(folder, filename)
+
+    def load_card_data(self, folder: str, colors: Iterable[str]) -> WUBRG_CARD_DATA:
+        card_data = {color: self._load(folder, f'{color}{self._CARD_SUFFIX}') for color in colors}
+        return {color: data for color, data in card_data.items() if data is not None}
+
+    def save_card_data(self, folder: str, card_data: WUBRG_CARD_DATA) -> bool:
+        saved = [save_json_file(folder, f'{color}{self._CARD_SUFFIX}', data) for color, data in card_data.items()]
+        return all(saved)
+
+    def load_meta_data(self, folder: str) -> Optional[META_DATA]:
+        return self._load(folder, self._META_FILE)
+
+    def save_meta_data(self, folder: str, meta_data: META_DATA) -> bool:
+        return save_json_file(folder, self._META_FILE, meta_data)
+
+
+class ParquetDataStore(DataStore):
+    """
+    Stores the data for a day as typed, compressed columnar files. The card data for every colour filter is kept in
+    a single file, with the filter as a column, and the archetype data is kept in another.
+
+    Files are re-written as a whole when data is added, so the DataLoader saves a day's data together. Writes to each
+    file are serialised, and made atomically so a crash mid-write never leaves a broken file behind.
+    """
+    NAME: str = 'parquet'
+    CARD_FILE: str = 'CardRatings.parquet'
+    META_FILE: str = 'ColorRatings.parquet'
+    COLOR_COLUMN: str = 'deck_colors'
+    _LOCKS: dict[str, Lock] = dict()
+    _LOCK: Lock = Lock()
+
+    def __init__(self, compression: str = None):
+        self.COMPRESSION: str = compression or PARQUET_COMPRESSION
+
+    def owns_file(self, filename: str) -> bool:
+        return filename in (self.CARD_FILE, self.META_FILE)
+
+    def is_file_valid(self, file_path: str) -> bool:
+        # Empty data is never written, so any file which exists has data.
+        return os.path.isfile(file_path)
+
+    def get_data_files(self, colors: Iterable[str], meta: bool) -> list[str]:
+        return ([self.CARD_FILE] if list(colors) else list()) + ([self.META_FILE] if meta else list())
+
+    @staticmethod
+    def _to_table(rows: list[dict]) -> pa.Table:
+        """
+        Converts a list of json objects into a table, with a column for every key found.
+        :param rows: The json objects.
+        :return: The table.
+        """
+        # Collect the keys from every row, as not every row is guaranteed to have the same ones.
+        keys = list(dict.fromkeys(key for row in rows for key in row))
+        return pa.Table.from_pydict({key: [row.get(key) for row in rows] for key in keys})
+
+    @classmethod
+    def _get_lock(cls, file_path: str) -> Lock:
+        """
+        Gets the lock for writing to a file, so files for different days, sets and formats can be written at once.
+        :param file_path: The path of the file.
+        :return: The lock for the file.
+        """
+        file_path = os.path.abspath(file_path)
+        with cls._LOCK:
+            if file_path not in cls._LOCKS:
+                cls._LOCKS[file_path] = Lock()
+            return cls._LOCKS[file_path]
+
+    def _write(self, folder: str, filename: str, table: pa.Table) -> bool:
+        """
+        Writes a table to a temporary file, then moves it into place.
+        :param folder: The folder to save the file in.
+        :param filename: The name of the file.
+        :param table: The table to write.
+        :return: Whether the file was saved.
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=folder, suffix='.tmp')
+        os.close(fd)
+        try:
+            pq.write_table(table, tmp_path, compression=self.COMPRESSION)
+            os.replace(tmp_path, os.path.join(folder, filename))
+            logging.verbose(f'File {filename} written to.')
+            return True
+        except Exception as ex:
+            logging.error(f'Error writing to parquet file {filename}')
+            logging.error(ex)
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
+
+    def load_card_data(self, folder: str, colors: Iterable[str]) -> WUBRG_CARD_DATA:
+        colors = list(colors)
+        file_path = os.path.join(folder, self.CARD_FILE)
+        if not colors or not os.path.isfile(file_path):
+            return dict()
+
+        # Only read the rows for the requested colours. They're kept as a table, so frames can be made from it.
+        table = pq.read_table(file_path, filters=[(self.COLOR_COLUMN, 'in', colors)])
+        return CardTable(table, self.COLOR_COLUMN, colors)
+
+    def save_card_data(self, folder: str, card_data: WUBRG_CARD_DATA) -> bool:
+        rows = [dict(row, **{self.COLOR_COLUMN: color}) for color, data in card_data.items() for row in data]
+        if not rows:
+            return True
+
+        file_path = os.path.join(folder, self.CARD_FILE)
+        with self._get_lock(file_path):
+            table = self._to_table(rows)
+
+            # Keep the existing data for any other colours, widening column types if they don't match.
+            if os.path.isfile(file_path):
+                existing = pq.read_table(file_path)
+                replaced = pc.is_in(existing[self.COLOR_COLUMN], value_set=pa.array(list(card_data), pa.string()))
+                existing = existing.filter(pc.invert(replaced))
+                table = pa.concat_tables([existing, table], promote_options='permissive')
+
+            return self._write(folder, self.CARD_FILE, table)
+
+    def load_meta_data(self, folder: str) -> Optional[META_DATA]:
+        file_path = os.path.join(folder, self.META_FILE)
+        if not os.path.isfile(file_path):
+            return None
+        return pq.read_table(file_path).to_pylist() or None
+
+    def save_meta_data(self, folder: str, meta_data: META_DATA) -> bool:
+        if not meta_data:
+            return True
+        with self._get_lock(os.path.join(folder, self.META_FILE)):
+            return self._write(folder, self.META_FILE, self._to_table(meta_data))
@@ -0,0 +1,271 @@
+"""
+An SQLite database which holds all of the data fetched from 17Lands, so it can be queried across sets and dates.
+"""
+
+from __future__ import annotations
+from typing import Optional, Iterable, Any
+from datetime import datetime
+from threading import Lock
+import json
+import os
+import sqlite3
+
+from core.utilities.auto_logging import logging
+
+from core.data_fetching.utils.consts import META_DATA, WUBRG_CARD_DATA
+from core.data_fetching.utils.settings import DATA_DIR_LOC, WAREHOUSE_NAME
+
+
+class DataWarehouse:
+    """
+    Holds the card and archetype data for every set, format and date in a single SQLite database. Rows are keyed by
+    set, format, date and deck colours, and keep their original json, so they're returned exactly as they were saved.
+    Summary data is stored under the date 'ALL'.
+
+    Which data has been saved is tracked separately from the rows themselves, so colours which had no data are still
+    known to be loaded. Each database file is shared by every user in the process, through `get_warehouse`.
+    """
+    WAREHOUSES: dict[str, DataWarehouse] = dict()
+    _LOCK: Lock = Lock()
+
+    SUMMARY_DATE: str = 'ALL'
+    _CARD_KIND: str = 'card'
+    _META_KIND: str = 'meta'
+
+    # Loading up to this many dates passes them to the query as parameters, as SQLite limits how many it can have.
+    #  Longer lists of dates are put in a temporary table instead.
+    _MAX_DATE_PARAMS: int = 256
+
+    _SCHEMA: str = """
+        CREATE TABLE IF NOT EXISTS card_ratings (
+            set_code TEXT NOT NULL,
+            format TEXT NOT NULL,
+            date TEXT NOT NULL,
+            deck_colors TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            name TEXT,
+            data TEXT NOT NULL,
+            PRIMARY KEY (set_code, format, date, deck_colors, position)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS card_ratings_by_name ON card_ratings (name, deck_colors, set_code, format, date);
+
+        CREATE TABLE IF NOT EXISTS meta_ratings (
+            set_code TEXT NOT NULL,
+            format TEXT NOT NULL,
+            date TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            data TEXT NOT NULL,
+            PRIMARY KEY (set_code, format, date, position)
+        ) WITHOUT ROWID;
+
+        CREATE TABLE IF NOT EXISTS loaded_data (
+            set_code TEXT NOT NULL,
+            format TEXT NOT NULL,
+            date TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            deck_colors TEXT NOT NULL,
+            row_count INTEGER NOT NULL,
+            updated TEXT NOT NULL,
+            PRIMARY KEY (set_code, format, date, kind, deck_colors)
+        ) WITHOUT ROWID;
+    """
+
+    @classmethod
+    def get_warehouse(cls, path: str = None) -> DataWarehouse:
+        """
+        Returns the shared warehouse for a database file, opening it if needed.
+        :param path: The path of the database file. Default: WAREHOUSE_NAME, in DATA_DIR_LOC
+        :return: The DataWarehouse for the file.
+        """
+        path = os.path.abspath(path or os.path.join(DATA_DIR_LOC, WAREHOUSE_NAME))
+        with cls._LOCK:
+            if path not in cls.WAREHOUSES:
+                cls.WAREHOUSES[path] = cls(path)
+            return cls.WAREHOUSES[path]
+
+    def __init__(self, path: str):
+        self.PATH: str = path
+        self._lock: Lock = Lock()
+
+        # A single connection is shared between threads, with the lock making sure only one uses it at a time.
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._conn: sqlite3.Connection = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(self._SCHEMA)
+
+    def close(self) -> None:
+        """ Closes the connection to the database. """
+        with self._lock:
+            self._conn.close()
+
+    def _query(self, sql: str, params: Iterable[Any] = ()) -> list[tuple]:
+        """
+        Runs a query, and returns all of its rows.
+        :param sql: The query to run.
+        :param params: The parameters for the query.
+        :return: A list of rows.
+        """
+        with self._lock:
+            return self._conn.execute(sql, tuple(params)).fetchall()
+
+    def save_card_data(self, set_code: str, format_name: str, date_key: str, card_data: WUBRG_CARD_DATA) -> None:
+        """
+        Saves the card data for a number of colour filters, replacing any existing data for those colours.
+        :param set_code: The set the data is for.
+        :param format_name: The format the data is for.
+        :param date_key: The date the data is for, or SUMMARY_DATE.
+        :param card_data: A dictionary of colours, and their card data.
+        """
+        if not card_data:
+            return
+
+        key = (set_code, format_name, date_key)
+        updated = datetime.utcnow().isoformat()
+        rows = [key + (color, i, row.get('name'), json.dumps(row))
+                for color, data in card_data.items() for i, row in enumerate(data)]
+
+        with self._lock, self._conn:
+            self._conn.executemany('DELETE FROM card_ratings '
+                                   'WHERE set_code=? AND format=? AND date=? AND deck_colors=?',
+                                   [key + (color,) for color in card_data])
+            self._conn.executemany('INSERT INTO card_ratings VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+            self._conn.executemany('INSERT OR REPLACE INTO loaded_data VALUES (?, ?, ?, ?, ?, ?, ?)',
+                                   [key + (self._CARD_KIND, color, len(data), updated)
+                                    for color, data in card_data.items()])
+
+    def save_meta_data(self, set_code: str, format_name: str, date_key: str, meta_data: META_DATA) -> None:
+        """
+        Saves the archetype data, replacing any existing data.
+        :param set_code: The set the data is for.
+        :param format_name: The format the data is for.
+        :param date_key: The date the data is for, or SUMMARY_DATE.
+        :param meta_data: The archetype data.
+        """
+        key = (set_code, format_name, date_key)
+        updated = datetime.utcnow().isoformat()
+
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM meta_ratings WHERE set_code=? AND format=? AND date=?', key)
+            self._conn.executemany('INSERT INTO meta_ratings VALUES (?, ?, ?, ?, ?)',
+                                   [key + (i, json.dumps(row)) for i, row in enumerate(meta_data)])
+            self._conn.execute('INSERT OR REPLACE INTO loaded_data VALUES (?, ?, ?, ?, ?, ?, ?)',
+                               key + (self._META_KIND, '', len(meta_data), updated))
+
+    def get_loaded(self, set_code: str, format_name: str, date_key: str) -> set[Optional[str]]:
+        """
+        Gets which data is saved for a date.
+        :param set_code: The set to check.
+        :param format_name: The format to check.
+        :param date_key: The date to check, or SUMMARY_DATE.
+        :return: The colour filters with card data saved, and None if the archetype data is saved.
+        """
+        rows = self._query('SELECT kind, deck_colors FROM loaded_data WHERE set_code=? AND format=? AND date=?',
+                           (set_code, format_name, date_key))
+        return {color if kind == self._CARD_KIND else None for kind, color in rows}
+
+    def get_loaded_dates(self, set_code: str, format_name: str, colors: Iterable[str]) -> list[str]:
+        """
+        Gets the dates which have all of their data saved, ie. the archetype data, and card data for every colour.
+        :param set_code: The set to check.
+        :param format_name: The format to check.
+        :param colors: The colour filters which should have card data.
+        :return: A sorted list of dates.
+        """
+        colors = set(colors)
+        loaded = dict()
+        rows = self._query('SELECT date, kind, deck_colors FROM loaded_data WHERE set_code=? AND format=?',
+                           (set_code, format_name))
+        for date_key, kind, color in rows:
+            loaded.setdefault(date_key, set()).add(color if kind == self._CARD_KIND else None)
+        return sorted(date_key for date_key, found in loaded.items() if None in found and colors <= found)
+
+    def _gen_date_filter(self, dates: Optional[list[str]]) -> tuple[str, tuple[str, ...]]:
+        """
+        Makes the part of a query which limits it to some dates. Must be called while holding the lock, and the query
+        run before it's released, as long lists of dates are put in a temporary table, which the next call replaces.
+        :param dates: The dates to limit the query to, or None for every date.
+        :return: The condition to add to the query, and its parameters.
+        """
+        if dates is None:
+            return '', ()
+        if len(dates) <= self._MAX_DATE_PARAMS:
+            return f" AND date IN ({', '.join(['?'] * len(dates))})", tuple(dates)
+
+        with self._conn:
+            self._conn.execute('CREATE TEMP TABLE IF NOT EXISTS load_dates (date TEXT PRIMARY KEY) WITHOUT ROWID')
+            self._conn.execute('DELETE FROM temp.load_dates')
+            self._conn.executemany('INSERT INTO temp.load_dates VALUES (?)', [(date_key,) for date_key in dates])
+        return ' AND date IN (SELECT date FROM temp.load_dates)', ()
+
+    def load_data(self, set_code: str, format_name: str, dates: Iterable[str] = None) \
+            -> tuple[dict[str, WUBRG_CARD_DATA], dict[str, META_DATA]]:
+        """
+        Loads the card and archetype data for a set and format, with a single query for each.
+        :param set_code: The set to load data for.
+        :param format_name: The format to load data for.
+        :param dates: The dates to load data for. Default: None, which loads every date.
+        :return: Dictionaries of dates to their card data by colour, and their archetype data.
+        """
+        dates = None if dates is None else sorted(set(dates))
+        card_data, meta_data = dict(), dict()
+        if dates == list():
+            return card_data, meta_data
+
+        # The dates are filtered by the queries, so only the rows for them are read.
+        with self._lock:
+            date_filter, date_params = self._gen_date_filter(dates)
+            params = (set_code, format_name) + date_params
+            loaded_rows = self._conn.execute('SELECT date, kind, deck_colors FROM loaded_data '
+                                             f'WHERE set_code=? AND format=?{date_filter}', params).fetchall()
+            card_rows = self._conn.execute('SELECT date, deck_colors, data FROM card_ratings '
+                                           f'WHERE set_code=? AND format=?{date_filter} '
+                                           'ORDER BY date, deck_colors, position', params).fetchall()
+            meta_rows = self._conn.execute('SELECT date, data FROM meta_ratings '
+                                           f'WHERE set_code=? AND format=?{date_filter} '
+                                           'ORDER BY date, position', params).fetchall()
+
+        # Include empty colours and archetype data, since they were still loaded.
+        for date_key, kind, color in loaded_rows:
+            if kind == self._CARD_KIND:
+                card_data.setdefault(date_key, dict())[color] = list()
+            else:
+                meta_data[date_key] = list()
+
+        for date_key, color, data in card_rows:
+            if date_key in card_data:
+                card_data[date_key][color].append(json.loads(data))
+
+        for date_key, data in meta_rows:
+            if date_key in meta_data:
+                meta_data[date_key].append(json.loads(data))
+
+        return card_data, meta_data
+
+    def get_card_ratings(self, name: str, deck_colors: str = '', set_code: str = None, format_name: str = None,
+                         include_summary: bool = False) -> list[dict[str, Any]]:
+        """
+        Gets a card's data across every set, format and date it was saved for, using the index on card names.
+        :param name: The name of the card.
+        :param deck_colors: The colour filter to get data for. Default: '', which is all decks.
+        :param set_code: A set to limit the data to. Default: None
+        :param format_name: A format to limit the data to. Default: None
+        :param include_summary: Whether to include summary data, with the date SUMMARY_DATE. Default: False
+        :return: A list of card data, with the 'set_code', 'format' and 'date' it's for added.
+        """
+        sql = 'SELECT set_code, format, date, data FROM card_ratings WHERE name=? AND deck_colors=?'
+        params = [name, deck_colors]
+        if set_code is not None:
+            sql += ' AND set_code=?'
+            params.append(set_code)
+        if format_name is not None:
+            sql += ' AND format=?'
+            params.append(format_name)
+        if not include_summary:
+            sql += ' AND date!=?'
+            params.append(self.SUMMARY_DATE)
+        sql += ' ORDER BY set_code, format, date'
+
+        rows = self._query(sql, params)
+        logging.debug(f"Found {len(rows)} rows of data for '{name}'.")
+        return [dict(json.loads(data), set_code=set_code, format=format_name, date=date_key)
+                for set_code, format_name, date_key, data in rows]
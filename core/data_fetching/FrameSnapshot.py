@@ -0,0 +1,89 @@
+"""
+Saves the frames made for a set and format to disk, so they don't need to be made from the data again.
+"""
+
+from __future__ import annotations
+from typing import Optional
+import os
+import pickle
+import tempfile
+import pandas as pd
+
+from core.utilities.auto_logging import logging
+
+
+class FrameSnapshot:
+    """
+    A binary snapshot of some frames, along with the fingerprints of the files each part of them was made from, eg.
+    the fingerprint of each date in the history frames. Comparing the fingerprints to the current ones tells which
+    parts of the frames are still valid, and which need to be made again.
+
+    Snapshots are pickled, and saved atomically in the format's folder. Each is saved with a KEY, which describes how
+    the frames were made, eg. the version of pandafy. A snapshot with a different KEY is ignored, and replaced when
+    the snapshot is next saved.
+    """
+    _EXTENSION: str = '.pkl'
+
+    def __init__(self, folder: str, name: str, key: str):
+        self.FOLDER: str = folder
+        self.NAME: str = name
+        self.KEY: str = key
+        self.FINGERPRINTS: dict[str, str] = dict()
+        self.FRAMES: dict[str, Optional[pd.DataFrame]] = dict()
+
+    @property
+    def file_path(self) -> str:
+        """ The path the snapshot is saved to. """
+        return os.path.join(self.FOLDER, f'{self.NAME}{self._EXTENSION}')
+
+    def load(self) -> bool:
+        """
+        Loads the saved snapshot, if it was made the same way.
+        :return: Whether the snapshot was loaded.
+        """
+        try:
+            with open(self.file_path, 'rb') as f:
+                snapshot = pickle.load(f)
+        except FileNotFoundError:
+            return False
+        except Exception as ex:
+            logging.warning(f'Failed to load the {self.NAME} snapshot in {self.FOLDER}, it will be remade. ({ex})')
+            return False
+
+        if snapshot.get('key') != self.KEY:
+            logging.verbose(f'The {self.NAME} snapshot in {self.FOLDER} is out of date, it will be remade.')
+            return False
+
+        self.FINGERPRINTS = snapshot['fingerprints']
+        self.FRAMES = snapshot['frames']
+        logging.verbose(f'Loaded the {self.NAME} snapshot in {self.FOLDER}.')
+        return True
+
+    def save(self) -> bool:
+        """
+        Saves the snapshot to a temporary file, then moves it into place.
+        :return: Whether the snapshot was saved.
+        """
+        snapshot = {'key': self.KEY, 'fingerprints': self.FINGERPRINTS, 'frames': self.FRAMES}
+        os.makedirs(self.FOLDER, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.FOLDER, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.file_path)
+            logging.verbose(f'Saved the {self.NAME} snapshot in {self.FOLDER}.')
+            return True
+        except Exception as ex:
+            logging.error(f'Failed to save the {self.NAME} snapshot in {self.FOLDER}. ({ex})')
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
+
+    def get_valid_keys(self, fingerprints: dict[str, Optional[str]]) -> list[str]:
+        """
+        Gets the parts of the snapshot which were made from the same files as now.
+        :param fingerprints: The current fingerprints of the files for each part, eg. each date.
+        :return: A sorted list of the parts which are still valid.
+        """
+        return sorted(key for key, fingerprint in self.FINGERPRINTS.items()
+                      if fingerprint is not None and fingerprints.get(key) == fingerprint)
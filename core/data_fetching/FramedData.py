@@ -2,13 +2,15 @@ import logging
 from typing import Callable, Optional
 import numpy as np
 import pandas as pd
-from scipy.stats import norm
 
 from core.game_metadata import SetMetadata
 
-from core.data_fetching.utils.consts import FORMAT_NICKNAME_DICT, rank_to_tier, range_map_vals
+from core.data_fetching.utils.consts import FORMAT_NICKNAME_DICT, WEIGHTED_STAT_DICT
 from core.data_fetching.utils.index_slice_helper import get_name_slice, get_color_slice, get_date_slice
+from core.data_fetching.utils.pandafy import get_stats_grades as pandafy_stats_grades
 from core.data_fetching.DataFramer import DataFramer
+from core.data_fetching.CumulativeFrame import CumulativeFrame
+from core.data_fetching.IndexLookup import IndexLookup
 
 
 class FramedData:
@@ -16,20 +18,41 @@ class FramedData:
     Acts as a wrapper for DataFramer, adding some extended functionality in how data can bet accessed and handled.
     One of its primary features is the ability to compress data over a given range into a summary, allowing data to be
     examined over certain parts of a format (After week 2, first meta shift, under-drafted colour becomes good, etc.)
+
+    Queries for single labels, eg. one card in one deck colour, are looked up by position through an IndexLookup of
+    each frame, which is kept until the frame changes. Other queries are sliced with `loc`, on the sorted index.
+
+    Summaries over a range of dates are made from cumulative sums of the history, which are kept until the history
+    changes, so each summary only takes a subtraction, rather than grouping all of the rows in the range.
     """
+    # TODO: Update this to contain the new information taken from Scryfall, and calculated from raw data.
+    SUMMARY_CARD_COLS: list[str] = ['# Seen', 'ALSA', '# Picked', 'ATA', '# GP', 'GP WR', '# OH', 'OH WR', '# GD',
+                                    'GD WR', '# GIH', 'GIH WR', '# GND', 'GND WR', 'IWD', 'Color', 'Rarity']
+    _COUNT_COLS: list[str] = list(dict.fromkeys(WEIGHTED_STAT_DICT.values()))
+    ARCHETYPE_COLS: list[str] = ['Colors', 'Splash', 'Wins', 'Games', 'Win %']
+    _SPLASH_COL: str = 'Splash'
 
-    def __init__(self, set_code: str, format_name: str, load_summary: bool = True, load_history: bool = True):
+    def __init__(self, set_code: str, format_name: str, load_summary: bool = True, load_history: bool = True,
+                 concurrent: bool = None):
         self._set_metadata = SetMetadata.get_metadata(set_code)
         self.SET: str = set_code
         self.SET_NAME: str = self._set_metadata.FULL_NAME
         self.FORMAT: str = format_name
         self.FORMAT_ALIAS: str = FORMAT_NICKNAME_DICT[self.FORMAT].upper()
-        self.DATA: DataFramer = DataFramer(set_code, format_name, load_summary, load_history)
-        self._compare_key: Callable = self._set_metadata.FRAME_ORDER_KEY
+        self.DATA: DataFramer = DataFramer(set_code, format_name, load_summary, load_history, concurrent)
+        self._frame_order: Callable = self._set_metadata.get_frame_order
 
         self.load_summary: bool = load_summary
         self.load_history: bool = load_history
 
+        # The cumulative sums of the card history, and the frame they were made from, to tell when to make them again.
+        self._card_cumulative: Optional[CumulativeFrame] = None
+        self._card_cumulative_source: Optional[pd.DataFrame] = None
+        self._archetype_cumulatives: dict[str, tuple[pd.DataFrame, CumulativeFrame]] = dict()
+
+        # The lookups of each frame, and the frames they were made for, to tell when to make them again.
+        self._lookups: dict[str, tuple[pd.DataFrame, IndexLookup]] = dict()
+
     def check_for_updates(self) -> None:  # pragma: no cover
         """Populates and updates all data properties, filling in missing data."""
         self.DATA.check_for_updates()
@@ -38,15 +61,35 @@ class FramedData:
         """Populates and updates all data properties, reloading all data."""
         self.DATA.reload_data()
 
+    def _select(self, frame_name: str, *keys) -> pd.DataFrame:
+        """
+        Gets the rows of a frame which match a query, by position if the query only picks single labels.
+        :param frame_name: The name of the frame, eg. 'CARD_HISTORY_FRAME'.
+        :param keys: A slice or list for each level of the frame's index.
+        :return: The matching rows, the same as from `loc`.
+        """
+        frame = getattr(self.DATA, frame_name)
+
+        # DataFramer replaces its frames whenever they change, so the lookup is current if it's for the same frame.
+        source, lookup = self._lookups.get(frame_name, (None, None))
+        if frame is not source:
+            lookup = IndexLookup(frame.index)
+            self._lookups[frame_name] = (frame, lookup)
+
+        positions = lookup.get_positions(keys)
+        if positions is None:
+            return frame.loc(axis=0)[keys if len(keys) > 1 else keys[0]]
+        return frame.iloc[positions]
+
     def deck_group_frame(self, name=None, date=None, summary=False) -> pd.DataFrame:
         """Returns a subset of the 'GROUPED_ARCHETYPE' data as a DataFrame."""
         name_slice = get_name_slice(name)
         date_slice = get_date_slice(date)
 
         if summary:
-            return self.DATA.GROUPED_ARCHETYPE_SUMMARY_FRAME.loc(axis=0)[name_slice]
+            return self._select('GROUPED_ARCHETYPE_SUMMARY_FRAME', name_slice)
         else:
-            return self.DATA.GROUPED_ARCHETYPE_HISTORY_FRAME.loc(axis=0)[date_slice, name_slice]
+            return self._select('GROUPED_ARCHETYPE_HISTORY_FRAME', date_slice, name_slice)
 
     def deck_archetype_frame(self, deck_color=None, date=None, summary=False) -> pd.DataFrame:
         """Returns a subset of the 'SINGLE_ARCHETYPE' data as a DataFrame."""
@@ -54,9 +97,9 @@ class FramedData:
         date_slice = get_date_slice(date)
 
         if summary:
-            return self.DATA.SINGLE_ARCHETYPE_SUMMARY_FRAME.loc(axis=0)[deck_color_slice]
+            return self._select('SINGLE_ARCHETYPE_SUMMARY_FRAME', deck_color_slice)
         else:
-            return self.DATA.SINGLE_ARCHETYPE_HISTORY_FRAME.loc(axis=0)[date_slice, deck_color_slice]
+            return self._select('SINGLE_ARCHETYPE_HISTORY_FRAME', date_slice, deck_color_slice)
 
     def card_frame(self, name=None, deck_color=None, date=None, summary=False) -> pd.DataFrame:
         """Returns a subset of the 'CARD' data as a DataFrame."""
@@ -65,88 +108,197 @@ class FramedData:
         date_slice = get_date_slice(date)
 
         if summary:
-            return self.DATA.CARD_SUMMARY_FRAME.loc(axis=0)[deck_color_slice, name_slice]
+            return self._select('CARD_SUMMARY_FRAME', deck_color_slice, name_slice)
         else:
-            return self.DATA.CARD_HISTORY_FRAME.loc(axis=0)[date_slice, deck_color_slice, name_slice]
+            return self._select('CARD_HISTORY_FRAME', date_slice, deck_color_slice, name_slice)
 
     def get_stats_grades(self, deck_color: str = '') -> Optional[pd.DataFrame]:
         # Get the non-colour specific card stats, then normalize GIH WR to from 0-100 for each card.
         frame = self.card_frame(deck_color=deck_color, summary=True).copy()
 
-        # Get all of the rows where GIH WR is non NaN, convert it to a float, cancelling if none exist.
-        available_rows = frame[~frame['GIH WR'].isna()].copy()
-        if len(available_rows) == 0:
+        # Cancel if there are no rows where GIH WR is non NaN.
+        if frame['GIH WR'].isna().all():
             logging.warning(f"{self.SET}'s {self.FORMAT_ALIAS} Dataframe had no valid data.")
             return None
-        available_gih = np.array(available_rows['GIH WR'], dtype=float)
-
-        # Get the stats, and use it to normalize the data, assigning it back to the available rows.
-        mu, std = norm.fit(available_gih)
-        available_rows['Percentile'] = norm.cdf(available_gih, mu, std).round(4) * 100
 
-        # Re-map the available rows back to the main frame by reindexing, making empty rows.
-        available_rows = available_rows.reindex(frame.index, fill_value=None)
-        frame['Percentile'] = available_rows['Percentile']
-
-        # For each "Percentile", use a pre-defined mapping to assign that a tier, and in turn, a letter grade.
-        range_map = [frame['Percentile'].between(start, end) for start, end in range_map_vals]
-        frame['Tier'] = np.select(range_map, [i for i in range(0, len(range_map))], 0)
-        frame['Rank'] = frame['Tier'].map(rank_to_tier)
-
-        # Reset any ranks and tiers which weren't originally found.
-        mask = frame['Percentile'].isna()
-        frame.loc[mask, 'Tier'] = None
-        frame.loc[mask, 'Rank'] = None
-        return frame
+        # Every card with a GIH WR is graded, without a minimum number of games.
+        return pandafy_stats_grades(frame, min_games_ratio=0)
 
     # region Dataframe Creation
-    def aggregate_card_frame(self, frame: pd.DataFrame) -> pd.DataFrame:  # pragma: no cover
+    def aggregate_card_frame(self, frame: pd.DataFrame) -> pd.DataFrame:
         """
         Summarizes card data over a provided set of time.
-        :param frame: The frame to run the aggregation operation on.
+        :param frame: The frame to run the aggregation operation on. It isn't changed.
         :return: A DataFrame with aggregated data across the date range
         """
+        # Calculate helper stats to recalculate value later, by weighting each average by its count.
+        helpers = {f'{col} SUM': pd.to_numeric(frame[col] * frame[count_col])
+                   for col, count_col in WEIGHTED_STAT_DICT.items()}
+        frame = frame[self._COUNT_COLS + ['Color', 'Rarity']].assign(**helpers)
+
+        # Compact frames have categories, which pandas can't reduce quickly, so they're reduced by their codes instead.
+        categories = {col: frame[col].dtype for col in ['Color', 'Rarity'] if frame[col].dtype == 'category'}
+        frame = frame.assign(**{col: frame[col].cat.codes for col in categories})
+
+        # Sum the frame by deck colours and cards, keeping the colour and rarity of each card.
+        #  They're the same on every row of a card, and taking the last value is much quicker than the max of text.
+        reducers = {col: 'sum' for col in self._COUNT_COLS + list(helpers)}
+        reducers.update({'Color': 'last', 'Rarity': 'last'})
+        frame = frame.groupby(level=['Deck Colors', 'Name'], sort=False).agg(reducers)
+        frame = frame.assign(**{col: pd.Categorical.from_codes(frame[col], dtype=dtype)
+                                for col, dtype in categories.items()})
+
+        # Re-calculate the stats based on the processing from above.
+        for col, count_col in WEIGHTED_STAT_DICT.items():
+            frame[col] = pd.to_numeric(frame[f'{col} SUM'] / frame[count_col])
+        frame['IWD'] = frame['GIH WR'] - frame['GND WR']
+
+        # Trim the helper columns from the expanded frame, and put the cards in order.
+        summed = frame[self.SUMMARY_CARD_COLS]
+        return summed.iloc[self._frame_order(summed.index)]
+
+    def _get_card_cumulative(self) -> Optional[CumulativeFrame]:
+        """
+        Gets the cumulative sums of the card history, making them again if the history has changed.
+        :return: The cumulative sums, or None if there's no card history.
+        """
+        frame = self.DATA.CARD_HISTORY_FRAME
+        if frame is None:
+            return None
 
-        # The columns which have win percents.
-        percent_cols = ['GP', 'OH', 'GD', 'GIH', 'GND']
+        # DataFramer replaces the history frame whenever it changes, so the sums are current if it's the same frame.
+        if frame is not self._card_cumulative_source:
+            sums = frame[self._COUNT_COLS].copy()
+            for col, count_col in WEIGHTED_STAT_DICT.items():
+                sums[f'{col} SUM'] = pd.to_numeric(frame[col] * frame[count_col])
+            sums[['Color', 'Rarity']] = frame[['Color', 'Rarity']]
 
-        # Calculate helper stats to recalculate value later.
-        frame['ALSA SUM'] = frame['ALSA'] * frame['# Seen']
-        frame['ATA SUM'] = frame['ATA'] * frame['# Picked']
-        for col in percent_cols:
-            frame[f'# {col} WINS'] = pd.to_numeric(frame[f'# {col}'] * frame[f'{col} WR'])
+            self._card_cumulative = CumulativeFrame(sums, [col for col in sums if col not in ('Color', 'Rarity')],
+                                                    ['Color', 'Rarity'], self._frame_order)
+            self._card_cumulative_source = frame
+        return self._card_cumulative
 
-        # Take the expanded frame, and drop the dates.
-        frame = frame.reset_index(level=0)
-        frame = frame.drop('Date', axis=1)
+    def summarize_card_frame(self, name=None, deck_color=None, date=None) -> Optional[pd.DataFrame]:
+        """
+        Summarizes the card history over a range of dates, eg. `date=('2023-02-08', '2023-02-15')`.
+        Gives the same results as `aggregate_card_frame` on the same part of the history, without grouping its rows.
+        :param name: The cards to summarize, like `card_frame`. Default: All cards
+        :param deck_color: The deck colours to summarize, like `card_frame`. Default: All deck colours
+        :param date: The dates to summarize, like `card_frame`. Default: All dates
+        :return: A DataFrame with the data summed over the dates, or None if there's no card history.
+        """
+        cumulative = self._get_card_cumulative()
+        if cumulative is None:
+            return None
 
-        # Sum the frame by deck colours and cards.
-        temp = frame.groupby(['Deck Colors', 'Name']).max()  # Used to preserve color and rarity.
-        frame = frame.groupby(['Deck Colors', 'Name']).sum()
-        frame['Color'] = temp['Color']
-        frame['Rarity'] = temp['Rarity']
+        frame = cumulative.sum(get_date_slice(date), (get_color_slice(deck_color), get_name_slice(name)))
+        frame[self._COUNT_COLS] = frame[self._COUNT_COLS].round().astype(int)
 
-        # Re-calculate the stats based on the processing from above.
-        frame['ALSA'] = frame['ALSA SUM'] / frame['# Seen']
-        frame['ATA'] = frame['ATA SUM'] / frame['# Picked']
-        for col in ['GP', 'OH', 'GD', 'GIH', 'GND']:
-            frame[f'{col} WR'] = pd.to_numeric(frame[f'# {col} WINS'] / frame[f'# {col}'])
+        # Re-calculate the stats from the sums of their helper stats and counts.
+        for col, count_col in WEIGHTED_STAT_DICT.items():
+            with np.errstate(divide='ignore', invalid='ignore'):
+                frame[col] = frame[f'{col} SUM'] / frame[count_col]
         frame['IWD'] = frame['GIH WR'] - frame['GND WR']
+        return frame[self.SUMMARY_CARD_COLS]
 
-        # Trim the helper columns from the expanded frame.
-        # TODO: Update this to contain the new information taken from Scryfall, and calculated from raw data.
-        summed = frame[['# Seen', 'ALSA', '# Picked', 'ATA', '# GP', 'GP WR', '# OH', 'OH WR', '# GD', 'GD WR',
-                        '# GIH', 'GIH WR', '# GND', 'GND WR', 'IWD', 'Color', 'Rarity']]
-        idx = list(summed.index)
-        idx.sort(key=self._compare_key)
-        summed = summed.set_index([idx])
+    @classmethod
+    def _finish_archetype_frame(cls, frame: pd.DataFrame) -> pd.DataFrame:
+        """
+        Turns summed archetype data, indexed by name and whether it's splashed, back into the shape of the frames.
+        :param frame: The summed data, with the 'Colors', 'Wins' and 'Games' columns.
+        :return: A DataFrame with the 'Win %' re-calculated, indexed by name.
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            frame['Win %'] = round((frame['Wins'] / frame['Games']) * 100, 2)
+        frame = frame.reset_index(level=cls._SPLASH_COL)
+        return frame[cls.ARCHETYPE_COLS]
 
-        return summed
+    def aggregate_archetype_frame(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """
+        Summarizes archetype data over a provided set of time, for either the grouped or single archetype history.
+        Splashed and non-splashed decks of the same colours are kept separate, like they are each day.
+        :param frame: The frame to run the aggregation operation on. It isn't changed.
+        :return: A DataFrame with aggregated data across the date range, in the order the archetypes first appear.
+        """
+        names = frame.index.get_level_values('Name')
+        frame = frame.groupby([names, frame[self._SPLASH_COL]], sort=False).agg(
+            {'Colors': 'last', 'Wins': 'sum', 'Games': 'sum'})
+        return self._finish_archetype_frame(frame)
+
+    def aggregate_archetype_winrate_data(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """
+        Summarizes the data for each deck archetype over a provided set of time, eg. from `deck_archetype_frame`.
+        :param frame: The frame to run the aggregation operation on. It isn't changed.
+        :return: A DataFrame with aggregated data across the date range.
+        """
+        return self.aggregate_archetype_frame(frame)
 
-    # TODO: Create aggregation functions for the other data structures.
-    def aggregate_archetype_winrate_data(self, frame: pd.DataFrame) -> pd.DataFrame:  # pragma: no cover
-        return frame
+    def aggregate_archetype_summary_data(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """
+        Summarizes the data for decks grouped by number of colours over a provided set of time, eg. from
+        `deck_group_frame`.
+        :param frame: The frame to run the aggregation operation on. It isn't changed.
+        :return: A DataFrame with aggregated data across the date range.
+        """
+        return self.aggregate_archetype_frame(frame)
+
+    def _get_archetype_cumulative(self, frame_name: str) -> Optional[CumulativeFrame]:
+        """
+        Gets the cumulative sums of an archetype history frame, making them again if the history has changed.
+        :param frame_name: The name of the history frame, eg. 'SINGLE_ARCHETYPE_HISTORY_FRAME'.
+        :return: The cumulative sums, or None if there's no history.
+        """
+        frame = getattr(self.DATA, frame_name)
+        if frame is None:
+            return None
 
-    def aggregate_archetype_summary_data(self, frame: pd.DataFrame) -> pd.DataFrame:  # pragma: no cover
-        return frame
+        source, cumulative = self._archetype_cumulatives.get(frame_name, (None, None))
+        if frame is not source:
+            # Splashed decks share names with the decks they splash from, so are kept as their own groups.
+            sums = frame.set_index(self._SPLASH_COL, append=True)
+
+            # Archetypes are kept in the order they first appear, like they are when aggregating the frame.
+            first_seen = sums.index.droplevel('Date').unique()
+            cumulative = CumulativeFrame(sums, ['Wins', 'Games'], ['Colors'],
+                                         lambda groups: np.argsort(first_seen.get_indexer(groups), kind='stable'))
+            self._archetype_cumulatives[frame_name] = (frame, cumulative)
+        return cumulative
+
+    def _summarize_archetype_frame(self, frame_name: str, name_slice, date_slice) -> Optional[pd.DataFrame]:
+        """
+        Summarizes an archetype history frame over a range of dates, from its cumulative sums.
+        :param frame_name: The name of the history frame, eg. 'SINGLE_ARCHETYPE_HISTORY_FRAME'.
+        :param name_slice: The archetypes to summarize.
+        :param date_slice: The dates to summarize.
+        :return: A DataFrame with the data summed over the dates, or None if there's no history.
+        """
+        cumulative = self._get_archetype_cumulative(frame_name)
+        if cumulative is None:
+            return None
+
+        frame = cumulative.sum(date_slice, (name_slice, slice(None)))
+        frame[['Wins', 'Games']] = frame[['Wins', 'Games']].round().astype(int)
+        return self._finish_archetype_frame(frame)
+
+    def summarize_deck_group_frame(self, name=None, date=None) -> Optional[pd.DataFrame]:
+        """
+        Summarizes the 'GROUPED_ARCHETYPE' history over a range of dates, eg. `date=('2023-02-08', '2023-02-15')`.
+        Gives the same results as `aggregate_archetype_summary_data` on the same part of the history.
+        :param name: The groups to summarize, like `deck_group_frame`. Default: All groups
+        :param date: The dates to summarize, like `deck_group_frame`. Default: All dates
+        :return: A DataFrame with the data summed over the dates, or None if there's no history.
+        """
+        return self._summarize_archetype_frame('GROUPED_ARCHETYPE_HISTORY_FRAME', get_name_slice(name),
+                                               get_date_slice(date))
+
+    def summarize_deck_archetype_frame(self, deck_color=None, date=None) -> Optional[pd.DataFrame]:
+        """
+        Summarizes the 'SINGLE_ARCHETYPE' history over a range of dates, eg. `date=('2023-02-08', '2023-02-15')`.
+        Gives the same results as `aggregate_archetype_winrate_data` on the same part of the history.
+        :param deck_color: The archetypes to summarize, like `deck_archetype_frame`. Default: All archetypes
+        :param date: The dates to summarize, like `deck_archetype_frame`. Default: All dates
+        :return: A DataFrame with the data summed over the dates, or None if there's no history.
+        """
+        return self._summarize_archetype_frame('SINGLE_ARCHETYPE_HISTORY_FRAME', get_color_slice(deck_color),
+                                               get_date_slice(date))
     # endregion Dataframe Creation
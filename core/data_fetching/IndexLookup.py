@@ -0,0 +1,68 @@
+"""
+Maps the labels in a frame's index to the positions of their rows, so rows can be picked without searching the index.
+"""
+
+from typing import Any, Optional
+import numpy as np
+import pandas as pd
+
+
+class IndexLookup:
+    """
+    Holds, for each level of an index, a map from each label to the positions of the rows which have it. A query for
+    single labels, eg. one card or one deck colour, then only takes finding the positions which all of its labels share,
+    instead of slicing the index with `loc`.
+
+    Each level is only mapped the first time it's used. Dates are mapped by their 'YYYY-MM-DD' strings, so compacted
+    frames, whose dates are real dates, are looked up the same way as those from `get_date_slice`.
+    """
+    def __init__(self, index: pd.Index):
+        """
+        :param index: The index to look up rows in.
+        """
+        self.INDEX: pd.Index = index
+        self._LEVELS: dict[int, dict[Any, np.ndarray]] = dict()
+
+    def _map_level(self, level: int) -> dict[Any, np.ndarray]:
+        """
+        Maps the labels of a level to the positions of the rows which have them.
+        :param level: The number of the level.
+        :return: A dictionary of the labels, and the positions of their rows in order.
+        """
+        if isinstance(self.INDEX, pd.MultiIndex):
+            codes, labels = self.INDEX.codes[level], self.INDEX.levels[level]
+        else:
+            codes, labels = pd.factorize(self.INDEX)
+        if isinstance(labels, pd.DatetimeIndex):
+            labels = labels.strftime('%Y-%m-%d')
+
+        # A stable sort of the codes groups the rows of each label together, while keeping them in order.
+        #  Rows without a label have a code of -1, so they're sorted first, and left out.
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(labels) + 1))
+        return {label: order[bounds[i]: bounds[i + 1]] for i, label in enumerate(labels) if bounds[i] < bounds[i + 1]}
+
+    def get_positions(self, keys: tuple) -> Optional[np.ndarray]:
+        """
+        Gets the positions of the rows which match a query, if it only picks single labels.
+        :param keys: A slice or list for each level, like those from `get_name_slice`, `get_color_slice`, etc.
+        :return: The positions of the matching rows in order, or None if the query can't be looked up this way, eg.
+        as it has a range of labels, or a label which isn't in the index, and should be run with `loc` instead.
+        """
+        if len(keys) != self.INDEX.nlevels:
+            return None
+
+        positions = None
+        for level, key in enumerate(keys):
+            if isinstance(key, slice) and key == slice(None):
+                continue
+            if not isinstance(key, list) or len(key) != 1:
+                return None
+
+            if level not in self._LEVELS:
+                self._LEVELS[level] = self._map_level(level)
+            found = self._LEVELS[level].get(key[0])
+            if found is None:
+                return None
+            positions = found if positions is None else np.intersect1d(positions, found, assume_unique=True)
+        return positions
@@ -1,10 +1,17 @@
 from core.data_fetching.utils import META_DATA, WUBRG_CARD_DATA
+from typing import Optional, Iterable
 from datetime import time, date, datetime, timedelta
+from hashlib import sha1
 
+from core.wubrg import COLOR_COMBINATIONS
 from core.utilities.auto_logging import logging
 from core.game_metadata import FormatMetadata
 
 from core.data_fetching.utils.date_helper import get_prev_17lands_update_time
+from core.data_fetching.utils.settings import LOCAL_SUMMARY
+from core.data_fetching.DataWarehouse import DataWarehouse
+from core.data_fetching.DataManifest import DataManifest
+from core.data_fetching.SummaryAggregator import SummaryAggregator
 from core.data_fetching.DataLoader import DataLoader
 
 
@@ -13,18 +20,24 @@ class LoadedData:
     LoadedData is meant as an intermediary step between getting the data and converting it into Pandas
     DataFrames. It's been left separate to reduce the size of classes, along with allowing for ways to access and
     handle data without the use of Pandas - though that's not recommended.
+
+    When LOCAL_SUMMARY is set, the summary data is built from the data for each day, rather than fetched.
     """
+    LOCAL_SUMMARY: bool = LOCAL_SUMMARY
 
-    def __init__(self, set_code: str, format_name: str):
+    def __init__(self, set_code: str, format_name: str, warehouse: DataWarehouse = None):
         self.SET: str = set_code
         self.FORMAT: str = format_name
         self._format_metadata: FormatMetadata = FormatMetadata.get_metadata(set_code, format_name)
+        self._WAREHOUSE: Optional[DataWarehouse] = warehouse or \
+            (DataWarehouse.get_warehouse() if DataLoader.USE_WAREHOUSE else None)
 
         self._CARD_DATA_DICT: dict[str, WUBRG_CARD_DATA] = dict()
         self._META_DATA_DICT: dict[str, META_DATA] = dict()
 
         self._CARD_SUMMARY_DICTS: WUBRG_CARD_DATA = dict()
         self._META_SUMMARY_DICT: META_DATA = list()
+        self._SUMMARY_AGGREGATOR: SummaryAggregator = SummaryAggregator()
 
     def get_day_data(self, check_date: date, reload: bool = False, overwrite: bool = False) \
             -> tuple[WUBRG_CARD_DATA, META_DATA]:
@@ -42,7 +55,7 @@ class LoadedData:
         update: bool = data_missing or reload
 
         if update:
-            loader: DataLoader = DataLoader(self.SET, self.FORMAT, check_date)
+            loader: DataLoader = DataLoader(self.SET, self.FORMAT, check_date, warehouse=self._WAREHOUSE)
             logging.info(f'Getting data for {self.SET} {self.FORMAT}, date: {str_date}')
             card_data, meta_data = loader.get_day_data(overwrite)
 
@@ -51,11 +64,27 @@ class LoadedData:
             if not meta_data:  # pragma: no cover
                 logging.verbose(f'`meta_data` for {str_date} is empty.')
 
-            self._CARD_DATA_DICT[str_date] = {color: card_data[color] for color in card_data}
+            # The data is kept as it was loaded, so a CardTable isn't turned into json objects unless it's used.
+            self._CARD_DATA_DICT[str_date] = card_data
             self._META_DATA_DICT[str_date] = meta_data
 
         return self._CARD_DATA_DICT[str_date], self._META_DATA_DICT[str_date]
 
+    def _load_warehouse_data(self) -> None:
+        """
+        Loads every date the warehouse has complete data for, which isn't already loaded, with a single query.
+        """
+        loaded_dates = self._WAREHOUSE.get_loaded_dates(self.SET, self.FORMAT, COLOR_COMBINATIONS)
+        dates = [date_key for date_key in loaded_dates if date_key != DataWarehouse.SUMMARY_DATE and
+                 (date_key not in self._CARD_DATA_DICT or date_key not in self._META_DATA_DICT)]
+        if not dates:
+            return
+
+        logging.info(f'Loading data for {len(dates)} dates of {self.SET} {self.FORMAT} from the warehouse.')
+        card_data, meta_data = self._WAREHOUSE.load_data(self.SET, self.FORMAT, dates)
+        self._CARD_DATA_DICT.update(card_data)
+        self._META_DATA_DICT.update(meta_data)
+
     def _is_historic_data_available(self, requested_date: datetime, last_17l_update: datetime) -> bool:
         # Data for a given day will be exist at 2am UTC the following day.
         update_date: datetime = datetime.combine(requested_date, time(2, 0)) + timedelta(days=1)
@@ -70,13 +99,35 @@ class LoadedData:
 
         return has_updated and is_active
 
-    def get_historic_data(self, reload: bool = False, overwrite: bool = False) \
+    def get_available_dates(self) -> list[str]:
+        """
+        Gets the dates which 17Lands should have data for, for the set and format.
+        :return: A list of dates, as strings, in order.
+        """
+        if not self._format_metadata.has_data:  # pragma: no cover
+            return list()
+
+        # Initialize the relevant dates to determine if data is available.
+        requested_date: datetime = datetime.combine(self._format_metadata.START_DATE, time(0, 0))
+        last_17l_update_date: datetime = get_prev_17lands_update_time()
+
+        # If the update date is before the last time 17Lands updated, the data could exist so,
+        dates = list()
+        while requested_date <= last_17l_update_date:
+            # Check if data is available for the requested_date.
+            if self._is_historic_data_available(requested_date, last_17l_update_date):
+                dates.append(str(requested_date.date()))
+            requested_date += timedelta(days=1)
+        return dates
+
+    def get_historic_data(self, reload: bool = False, overwrite: bool = False, skip_dates: Iterable[str] = ()) \
             -> tuple[dict[str, WUBRG_CARD_DATA], dict[str, META_DATA]]:
         """
         Gets all of the data by day for the set and format.
         If any data does not exist locally, it will be fetched from 17Lands and saved locally.
         :param reload: Forces reload data from the file
         :param overwrite: Forces overwrite the data in the file
+        :param skip_dates: Dates which don't need to be loaded, eg. as they're in a saved snapshot.
         :return: A tuple of dictionaries filled with the archetype data and card data
         """
 
@@ -85,19 +136,49 @@ class LoadedData:
             logging.info(f'{self.SET} {self.FORMAT} has no historic data to get!')
             return dict(), dict()
 
-        # Initialize the relevant dates to determine if data is available.
-        requested_date: datetime = datetime.combine(self._format_metadata.START_DATE, time(0, 0))
-        last_17l_update_date: datetime = get_prev_17lands_update_time()
+        skip_dates = set(skip_dates)
+        dates = [date_key for date_key in self.get_available_dates() if date_key not in skip_dates]
 
-        # If the update date is before the last time 17Lands updated, the data could exist so,
-        while requested_date <= last_17l_update_date:
-            # Check if data is available for the requested_date, and if so do the update.
-            if self._is_historic_data_available(requested_date, last_17l_update_date):
-                self.get_day_data(requested_date.date(), reload, overwrite)
-            requested_date += timedelta(days=1)
+        # If there's a warehouse, load all of the dates it has at once, so they don't each need to be loaded.
+        if self._WAREHOUSE is not None and dates and not (reload or overwrite):
+            self._load_warehouse_data()
+
+        # The manifest is only saved once all of the dates are loaded, rather than after each date which changes it.
+        with DataManifest.get_manifest(self.SET, self.FORMAT).batch():
+            for date_key in dates:
+                self.get_day_data(date.fromisoformat(date_key), reload, overwrite)
 
         return self._CARD_DATA_DICT, self._META_DATA_DICT
 
+    def get_fingerprints(self) -> dict[str, Optional[str]]:
+        """
+        Gets the fingerprints of the files saved for each date which should have data.
+        :return: A dictionary of dates, and their fingerprints, or None for dates with no files.
+        """
+        manifest = DataManifest.get_manifest(self.SET, self.FORMAT)
+        with manifest.batch():
+            return {date_key: manifest.get_fingerprint(date_key) for date_key in self.get_available_dates()}
+
+    def get_summary_fingerprint(self) -> Optional[str]:
+        """
+        Gets a fingerprint of the files the summary data is made from, if they're up to date.
+        :return: The fingerprint, or None if there are no files, or the summary data is stale.
+        """
+        if not self._format_metadata.has_data:  # pragma: no cover
+            return None
+
+        # Local summaries are made from every date, so they change when any date does, or when a new one is added.
+        if self.LOCAL_SUMMARY:
+            fingerprints = self.get_fingerprints()
+            if not fingerprints or None in fingerprints.values():
+                return None
+            return sha1(';'.join(f'{key}:{val}' for key, val in fingerprints.items()).encode('utf-8')).hexdigest()
+
+        loader = DataLoader(self.SET, self.FORMAT, None, warehouse=self._WAREHOUSE)
+        if self._is_summary_data_stale(loader.get_last_summary_update_time(), get_prev_17lands_update_time()):
+            return None
+        return DataManifest.get_manifest(self.SET, self.FORMAT).get_fingerprint(loader.get_date_key())
+
     def _is_summary_data_stale(self, last_write: datetime, last_17l_update: datetime) \
             -> bool:
         # Check if the data has been updated since last write and that the format is still open.
@@ -113,6 +194,29 @@ class LoadedData:
 
         return data_updated and data_live
 
+    def _get_local_summary_data(self, reload: bool = False) -> tuple[WUBRG_CARD_DATA, META_DATA]:
+        """
+        Builds the summary data from the data for each day, getting any days which haven't been loaded yet.
+        Only days which are new, or whose data has changed, are added to the existing summary.
+        Days are only re-fetched by the history, so forcing an update shows in the summary the next time it's built.
+        :param reload: Forces the summary to be rebuilt from every day
+        :return: A tuple of dictionaries filled with the archetype data and card data
+        """
+        if reload:
+            self._SUMMARY_AGGREGATOR.reset()
+
+        card_data, meta_data = self.get_historic_data()
+        added = [date_key for date_key in sorted(card_data)
+                 if self._SUMMARY_AGGREGATOR.add_day(date_key, card_data[date_key], meta_data.get(date_key))]
+
+        if added or reload or not self._CARD_SUMMARY_DICTS:
+            logging.info(f'Building overall data for {self.SET} {self.FORMAT} from {len(card_data)} days, '
+                         f'{len(added)} of them new.')
+            self._CARD_SUMMARY_DICTS = self._SUMMARY_AGGREGATOR.get_card_data()
+            self._META_SUMMARY_DICT = self._SUMMARY_AGGREGATOR.get_meta_data()
+
+        return self._CARD_SUMMARY_DICTS, self._META_SUMMARY_DICT
+
     def get_summary_data(self, reload: bool = False, overwrite: bool = False) -> \
             tuple[WUBRG_CARD_DATA, META_DATA]:
         """
@@ -128,8 +232,11 @@ class LoadedData:
             logging.info(f'{self.SET} {self.FORMAT} has no summary data to get!')
             return dict(), list()
 
+        if self.LOCAL_SUMMARY:
+            return self._get_local_summary_data(reload)
+
         # Initialize the loader
-        loader = DataLoader(self.SET, self.FORMAT, None)
+        loader = DataLoader(self.SET, self.FORMAT, None, warehouse=self._WAREHOUSE)
 
         # Determine the object is missing data.
         data_unloaded = (not self._META_SUMMARY_DICT) or (not self._CARD_SUMMARY_DICTS)
@@ -0,0 +1,137 @@
+"""
+Builds the summary data for a set and format out of its daily data, instead of fetching it from 17Lands.
+"""
+
+from typing import Any, Optional
+
+from core.utilities import invert_dict
+
+from core.data_fetching.utils.consts import META_DATA, WUBRG_CARD_DATA, STAT_NAME_DICT, WEIGHTED_STAT_DICT
+
+
+# The averages in the 17Lands data, and the counts they're weighted by, using the same weighting as the frames.
+#  Sideboard stats aren't used anywhere, but are kept so the summary has the same fields as the data from 17Lands.
+_RAW_STAT_NAMES: dict[str, str] = invert_dict(STAT_NAME_DICT)
+WEIGHTED_RAW_STATS: dict[str, str] = {_RAW_STAT_NAMES[col]: _RAW_STAT_NAMES[count_col]
+                                      for col, count_col in WEIGHTED_STAT_DICT.items()}
+WEIGHTED_RAW_STATS['sideboard_win_rate'] = 'sideboard_game_count'
+
+
+class SummaryAggregator:
+    """
+    Combines the card and archetype data for each day of a format into summary data, in the same shape as the summary
+    data from 17Lands. Counts are summed, and averages are weighted by their counts, like `aggregate_card_frame`.
+
+    Running totals are kept, so each day is only added once. If a day's data is replaced, eg. by re-fetching it, the
+    old data is taken back out of the totals before the new data is added.
+    """
+    INFO_KEYS: list[str] = ['name', 'color', 'rarity', 'url', 'url_back']
+    IWD_KEY: str = 'drawn_improvement_win_rate'
+    _GIH_KEY: str = 'ever_drawn_win_rate'
+    _GND_KEY: str = 'never_drawn_win_rate'
+
+    def __init__(self):
+        self._DAYS: dict[str, tuple[WUBRG_CARD_DATA, META_DATA]] = dict()
+        self._CARD_TOTALS: dict[str, dict[str, dict[str, Any]]] = dict()
+        self._META_TOTALS: dict[tuple[bool, str], dict[str, int]] = dict()
+
+    @property
+    def DATES(self) -> list[str]:
+        """ The dates which have been added to the summary, in order. """
+        return sorted(self._DAYS)
+
+    def reset(self) -> None:
+        """ Clears all of the data added to the summary. """
+        self._DAYS = dict()
+        self._CARD_TOTALS = dict()
+        self._META_TOTALS = dict()
+
+    def _add_card(self, totals: dict[str, Any], card: dict[str, Any], sign: int) -> None:
+        """
+        Adds a card's data for a day to its running totals, or takes it out.
+        :param totals: The running totals for the card.
+        :param card: The card's data.
+        :param sign: 1 to add the data, or -1 to take it out.
+        """
+        for key in self.INFO_KEYS:
+            if sign > 0 and key in card:
+                totals[key] = card[key]
+
+        # Averages are kept as a weighted sum and the count they were weighted by, so missing values don't skew them.
+        for col, count_col in WEIGHTED_RAW_STATS.items():
+            count = card.get(count_col) or 0
+            totals[count_col] = totals.get(count_col, 0) + sign * count
+            if card.get(col) is not None and count:
+                weighted = totals.setdefault(col, [0.0, 0])
+                weighted[0] += sign * card[col] * count
+                weighted[1] += sign * count
+
+    def _apply(self, card_data: WUBRG_CARD_DATA, meta_data: Optional[META_DATA], sign: int) -> None:
+        """
+        Adds a day's data to the running totals, or takes it out.
+        :param card_data: The day's card data, by colour.
+        :param meta_data: The day's archetype data.
+        :param sign: 1 to add the data, or -1 to take it out.
+        """
+        for color, data in card_data.items():
+            color_totals = self._CARD_TOTALS.setdefault(color, dict())
+            for card in data:
+                self._add_card(color_totals.setdefault(card['name'], dict()), card, sign)
+
+        for archetype in meta_data or list():
+            totals = self._META_TOTALS.setdefault((archetype['is_summary'], archetype['color_name']),
+                                                  {'wins': 0, 'games': 0})
+            totals['wins'] += sign * archetype['wins']
+            totals['games'] += sign * archetype['games']
+
+    def add_day(self, date_key: str, card_data: WUBRG_CARD_DATA, meta_data: Optional[META_DATA]) -> bool:
+        """
+        Adds the data for a day to the summary, replacing the data previously added for that day.
+        :param date_key: The date the data is for.
+        :param card_data: The day's card data, by colour.
+        :param meta_data: The day's archetype data.
+        :return: Whether the summary changed, which it won't if the same data was already added for the day.
+        """
+        if date_key in self._DAYS:
+            old_card_data, old_meta_data = self._DAYS[date_key]
+            if old_card_data is card_data and old_meta_data is meta_data:
+                return False
+            self._apply(old_card_data, old_meta_data, -1)
+
+        self._apply(card_data, meta_data, 1)
+        self._DAYS[date_key] = (card_data, meta_data)
+        return True
+
+    def _gen_card(self, totals: dict[str, Any]) -> dict[str, Any]:
+        """
+        Turns the running totals for a card back into the fields 17Lands uses.
+        :param totals: The running totals for the card.
+        :return: The card's summary data.
+        """
+        card = {key: totals.get(key) for key in self.INFO_KEYS}
+        for col, count_col in WEIGHTED_RAW_STATS.items():
+            card[count_col] = totals[count_col]
+            weighted = totals.get(col)
+            card[col] = weighted[0] / weighted[1] if weighted and weighted[1] else None
+
+        if card[self._GIH_KEY] is not None and card[self._GND_KEY] is not None:
+            card[self.IWD_KEY] = card[self._GIH_KEY] - card[self._GND_KEY]
+        else:
+            card[self.IWD_KEY] = None
+        return card
+
+    def get_card_data(self) -> WUBRG_CARD_DATA:
+        """
+        Gets the summary card data, for every colour which has been added.
+        :return: A dictionary of colours, and their card data.
+        """
+        return {color: [self._gen_card(totals) for totals in color_totals.values()]
+                for color, color_totals in self._CARD_TOTALS.items()}
+
+    def get_meta_data(self) -> META_DATA:
+        """
+        Gets the summary archetype data.
+        :return: The archetype data.
+        """
+        return [{'is_summary': is_summary, 'color_name': color_name, 'wins': totals['wins'], 'games': totals['games']}
+                for (is_summary, color_name), totals in self._META_TOTALS.items()]
@@ -3,9 +3,17 @@ This package helps simplify dealing with the the data surrounding Cards and Draf
 """
 
 from core.data_fetching.utils import *
+from core.data_fetching.CardTable import *
+from core.data_fetching.DataStore import *
+from core.data_fetching.DataWarehouse import *
+from core.data_fetching.DataManifest import *
+from core.data_fetching.FrameSnapshot import *
+from core.data_fetching.SummaryAggregator import *
 from core.data_fetching.DataLoader import *
 from core.data_fetching.LoadedData import *
 from core.data_fetching.DataFramer import *
+from core.data_fetching.CumulativeFrame import *
+from core.data_fetching.IndexLookup import *
 from core.data_fetching.FramedData import *
 from core.data_fetching.SetManager import *
 
@@ -20,14 +28,32 @@ from_utils = ['FORMAT_NICKNAME_DICT', 'STAT_FORMAT_STRINGS',
               'compose_filters', 'filter_frame',
               'get_name_slice', 'get_color_slice', 'get_date_slice']
 
+from_card_table = ['CardTable']
+
+from_data_store = ['DataStore', 'JsonDataStore', 'ParquetDataStore']
+
+from_data_warehouse = ['DataWarehouse']
+
+from_data_manifest = ['DataManifest']
+
+from_frame_snapshot = ['FrameSnapshot']
+
+from_summary_aggregator = ['SummaryAggregator']
+
 from_data_loader = ['DataLoader']
 
 from_loaded_data = ['LoadedData']
 
 from_data_framer = ['DataFramer']
 
+from_cumulative_frame = ['CumulativeFrame']
+
+from_index_lookup = ['IndexLookup']
+
 from_framed_data = ['FramedData']
 
 from_set_manager = ['SetManager']
 
-__all__ = from_utils + from_data_loader + from_loaded_data + from_data_framer + from_framed_data + from_set_manager
+__all__ = from_utils + from_card_table + from_data_store + from_data_warehouse + from_data_manifest + \
+          from_frame_snapshot + from_summary_aggregator + from_data_loader + from_loaded_data + from_data_framer + \
+          from_cumulative_frame + from_index_lookup + from_framed_data + from_set_manager
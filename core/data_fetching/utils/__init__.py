@@ -11,7 +11,7 @@ from core.data_fetching.utils.settings import *
 
 
 from_consts = ['FORMAT_NICKNAME_DICT', 'STAT_NAME_DICT', 'META_COLS_ALIAS_DICT', 'STAT_FORMAT_STRINGS',
-               'PERCENT_COLUMNS', 'STAT_COL_NAMES', 'SHARED_COL_NAMES', 'CARD_INFO_COL_NAMES',
+               'PERCENT_COLUMNS', 'WEIGHTED_STAT_DICT', 'STAT_COL_NAMES', 'SHARED_COL_NAMES', 'CARD_INFO_COL_NAMES',
                'tier_to_rank', 'rank_to_tier']
 
 from_date_helper = ['utc_today', 'get_prev_17lands_update_time', 'get_next_17lands_update_time']
@@ -21,9 +21,14 @@ from_frame_filter_helper = ['rarity_filter', 'cmc_filter', 'card_color_filter',
 
 from_index_slice_helper = ['get_name_slice', 'get_color_slice', 'get_date_slice', 'stringify_for_date_slice']
 
-from_pandafy = ['gen_card_frame', 'append_card_info', 'gen_meta_frame']
+from_pandafy = ['gen_card_frame', 'gen_card_frames', 'gen_card_records', 'gen_card_frames_from_records',
+                'append_card_info', 'get_stats_grades', 'gen_meta_frame', 'gen_hist_frames', 'compact_frame',
+                'PANDAFY_VERSION']
 
-from_settings = ['DATA_DIR_NAME', 'DATA_DIR_LOC']
+from_settings = ['DATA_DIR_NAME', 'DATA_DIR_LOC', 'DATA_STORE', 'MIGRATE_JSON', 'PARQUET_COMPRESSION',
+                 'USE_WAREHOUSE', 'WAREHOUSE_NAME', 'HTTP_CACHE_NAME', 'HTTP_CACHE_SIZE', 'LOCAL_SUMMARY',
+                 'COMPACT_FRAMES', 'FRAME_SNAPSHOTS', 'CONCURRENT_FETCH', 'FETCH_WORKERS', 'CONCURRENT_PANDAFY',
+                 'PANDAFY_WORKERS']
 
 
 __all__ = from_consts + from_date_helper + from_frame_filter_helper + from_index_slice_helper + \
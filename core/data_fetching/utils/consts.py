@@ -103,6 +103,17 @@ STAT_FORMAT_STRINGS: dict[str, str] = {
 
 PERCENT_COLUMNS: list[str] = ["GP WR", "OH WR", "GD WR", "GIH WR", "GND WR", "IWD"]
 
+# The stats which are averages, and the counts they're weighted by when data is combined across days.
+WEIGHTED_STAT_DICT: dict[str, str] = {
+    "ALSA": "# Seen",
+    "ATA": "# Picked",
+    "GP WR": "# GP",
+    "OH WR": "# OH",
+    "GD WR": "# GD",
+    "GIH WR": "# GIH",
+    "GND WR": "# GND"
+}
+
 STAT_COL_NAMES: list[str] = ['# Seen', 'ALSA', '# Picked', 'ATA', '# GP', 'GP WR', 'GP GW',
                              '# OH', 'OH WR', 'OH GW', '# GD', 'GD WR', 'GD GW',
                              '# GIH', 'GIH WR', 'GIH GW', '# GND', 'GND WR', 'GND GW', 'IWD']
@@ -113,6 +124,9 @@ CARD_INFO_COL_NAMES: list[str] = ['Cast Color', 'CMC', 'Type Line', 'Supertypes'
                                   'Power', 'Toughness']
 
 RANK_COL_NAMES: list[str] = ['Percentile', 'Tier', 'Rank']
+
+# Columns other than the '#' and 'GW' columns which hold whole numbers.
+COUNT_COL_NAMES: list[str] = ['CMC', 'Wins', 'Games']
 # endregion Frame Column Consts
 
 # region Tier Rank Consts
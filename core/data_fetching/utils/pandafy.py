@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Optional, Union
 import numpy as np
 import pandas as pd
 from scipy.stats import norm
@@ -6,10 +6,15 @@ from scipy.stats import norm
 from core.utilities import logging
 from core.data_fetching.utils.consts import rank_to_tier, range_map_vals
 from core.wubrg import ALIAS_MAP
-from core.game_metadata import Card, RARITY_ALIASES
+from core.game_metadata import Card, SetMetadata, RARITY_ALIASES
 
-from core.data_fetching.utils.consts import STAT_NAME_DICT, META_COLS_ALIAS_DICT, \
-    STAT_COL_NAMES, SHARED_COL_NAMES, CARD_INFO_COL_NAMES, COLOR_COUNT_MAP
+from core.data_fetching.utils.consts import META_DATA, WUBRG_CARD_DATA, STAT_NAME_DICT, META_COLS_ALIAS_DICT, \
+    STAT_COL_NAMES, SHARED_COL_NAMES, CARD_INFO_COL_NAMES, RANK_COL_NAMES, COUNT_COL_NAMES, COLOR_COUNT_MAP
+
+
+# The version of the frames made here. Saved snapshots of frames are only used if they were made by the same version,
+#  so this should be bumped whenever a change affects the frames made.
+PANDAFY_VERSION: int = 2
 
 
 def gen_card_frame(card_dict: list[dict[str, object]]) -> pd.DataFrame:
@@ -18,88 +23,132 @@ def gen_card_frame(card_dict: list[dict[str, object]]) -> pd.DataFrame:
     :param card_dict: The dictionary containing card data for a colour group
     :return: A DataFrame filled with the cleaned card data
     """
-    frame = pd.DataFrame(card_dict)
-    frame = frame.rename(columns=STAT_NAME_DICT)
-
     # If there's no data, make a blank frame and return it.
     if card_dict is None or len(card_dict) == 0:
-        return frame
+        frame = pd.DataFrame(card_dict)
+        return frame.rename(columns=STAT_NAME_DICT)
+
+    return gen_card_frames({(): card_dict}, [])
 
-    frame = frame.set_index('Name')
 
+def gen_card_frames(card_data: dict[tuple, list[dict[str, object]]], names: list[str]) -> pd.DataFrame:
+    """
+    Turns the card data for many groups, eg. every date and colour, into a single DataFrame, with some data cleaning
+    applied. All of the records are converted at once, rather than making a frame for each group and joining them.
+    :param card_data: A dictionary of the group each list of card data belongs to, and the card data.
+    :param names: The names of the index levels for the groups, eg. ['Date', 'Deck Colors'].
+    :return: A DataFrame filled with the cleaned card data, indexed by the groups and card names.
+    """
+    return gen_card_frames_from_records(gen_card_records(card_data, names), names)
+
+
+def gen_card_records(card_data: dict[tuple, list[dict[str, object]]], names: list[str]) -> pd.DataFrame:
+    """
+    Flattens the card data for many groups into a single frame of records, as 17Lands gives them.
+    :param card_data: A dictionary of the group each list of card data belongs to, and the card data.
+    :param names: The names of the groups' keys, eg. ['Date', 'Deck Colors'].
+    :return: A DataFrame with a row for each card in each group, and a column for each field and each key.
+    """
+    # Flatten the records into a single list, repeating each group's keys for each of its cards.
+    records = [card for data in card_data.values() for card in data]
+    counts = [len(data) for data in card_data.values()]
+
+    frame = pd.DataFrame.from_records(records)
+    for level, name in enumerate(names):
+        frame[name] = np.repeat([key[level] for key in card_data], counts)
+    return frame
+
+
+def gen_card_frames_from_records(records: pd.DataFrame, names: list[str]) -> pd.DataFrame:
+    """
+    Turns a frame of card records into a card frame, with some data cleaning applied.
+    :param records: The records, with a column for each field 17Lands gives, and one for each of the names. Eg. from
+    `gen_card_records`, or `CardTable.get_records`, which doesn't need the records to be made into json objects.
+    :param names: The names of the columns with the keys of each card's group, eg. ['Date', 'Deck Colors'].
+    :return: A DataFrame filled with the cleaned card data, indexed by the groups and card names.
+    """
+    column_names = STAT_COL_NAMES + SHARED_COL_NAMES
+    if records.empty:
+        index = pd.MultiIndex.from_tuples([], names=names + ['Name']) if names else pd.Index([], name='Name')
+        return pd.DataFrame(columns=column_names, index=index)
+
+    frame = records.rename(columns=STAT_NAME_DICT)
+    frame = frame.set_index(names + ['Name'])
+
+    # Cards without a win rate would stop the whole column being made whole numbers, so each value is truncated.
     for name in ['GP', 'OH', 'GD', 'GIH', 'GND']:
-        frame[f'{name} GW'] = (frame[f'# {name}'] * frame[f'{name} WR']).astype(int, errors='ignore')
+        wins = np.trunc(pd.to_numeric(frame[f'# {name}'] * frame[f'{name} WR']))
+        frame[f'{name} GW'] = wins.astype(int, errors='ignore')
         frame[f'{name} WR'] = frame[f'{name} WR'] * 100
 
     frame["IWD"] = frame["IWD"] * 100
-    frame = frame.drop(['sideboard_game_count', 'sideboard_win_rate', 'url', 'url_back'], axis=1)
     frame['Rarity'] = frame['Rarity'].map(RARITY_ALIASES)
 
-    column_names = STAT_COL_NAMES + SHARED_COL_NAMES
+    # Re-indexing the columns drops any which aren't used, like the sideboard stats and urls.
     frame = frame.reindex(columns=column_names)
 
     frame = frame.round(3)
     return frame
 
 
-def get_stats_grades(frame) -> Optional[pd.DataFrame]:
-    # Get all of the rows where GIH WR is non NaN, convert it to a float, cancelling if none exist.
-    available_rows = frame[~frame['GIH WR'].isna()]
-    if len(available_rows) == 0:
-        return frame
+def get_stats_grades(frame: pd.DataFrame, names: list[str] = None, min_games_ratio: float = 0.005) -> pd.DataFrame:
+    """
+    Grades the cards in a frame, by how their GIH WR compares to a normal distribution fit to the other cards.
+    When group names are given, eg. ['Date', 'Deck Colors'], each group is graded separately, all in one pass.
+    :param frame: The frame which contains the card performance data.
+    :param names: The names of the index levels to grade separately. Default: None, which grades the whole frame.
+    :param min_games_ratio: The share of the most games played by a card in the group, a card needs to be graded.
+    :return: A DataFrame with the 'Percentile', 'Tier' and 'Rank' attached.
+    """
+    def group_transform(series: pd.Series, func: str) -> pd.Series:
+        if not names:
+            return pd.Series(getattr(series, func)(), index=series.index)
+        return series.groupby(level=names, sort=False).transform(func)
 
     # Filter by a minimum number of games, to prevent one win to skew data.
-    filtered_rows = available_rows[available_rows['# GP'] >= round(available_rows['# GP'].max() * 0.005)]
-    filtered_rows = filtered_rows.copy()
-
-    # Get the stats, and use it to normalize the data, assigning it back to the available rows.
-    available_gih = np.array(filtered_rows['GIH WR'], dtype=float)
-    mu, std = norm.fit(available_gih)
-    filtered_rows['Percentile'] = norm.cdf(available_gih, mu, std).round(4) * 100
-
-    # Re-map the available rows back to the main frame by reindexing, making empty rows.
-    filtered_rows = filtered_rows.reindex(frame.index, fill_value=None)
-    frame['Percentile'] = filtered_rows['Percentile']
-
-    # For each "Percentile", use a pre-defined mapping to assign that a tier, and in turn, a letter grade.
-    range_map = [frame['Percentile'].between(start, end) for start, end in range_map_vals]
-    frame['Tier'] = np.select(range_map, [i for i in range(0, len(range_map))], 0)
-    frame['Rank'] = frame['Tier'].map(rank_to_tier)
-
-    # Reset any ranks and tiers which weren't originally found.
-    mask = frame['Percentile'].isna()
-    frame.loc[mask, 'Tier'] = None
-    frame.loc[mask, 'Rank'] = None
+    gih = frame['GIH WR'].astype(float)
+    games = frame['# GP'].astype(float)
+    max_games = group_transform(games.where(gih.notna()), 'max')
+    gih = gih.where(games >= np.round(max_games * min_games_ratio))
+
+    # Fit a normal distribution to each group, the same as `norm.fit`, and use it to get each card's percentile.
+    mu = group_transform(gih, 'mean')
+    std = np.sqrt(group_transform((gih - mu) ** 2, 'mean'))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        percentile = pd.Series(norm.cdf(gih, mu, std), index=frame.index).round(4) * 100
+
+    # Find the tier for each percentile, with each range including its end, then use it to assign a letter grade.
+    tier = pd.Series(np.searchsorted([end for _, end in range_map_vals], percentile, side='left'), index=frame.index)
+    tier = tier.where(percentile.notna())
+
+    frame = frame.drop(columns=RANK_COL_NAMES, errors='ignore')
+    frame['Percentile'] = percentile
+    frame['Tier'] = tier
+    # Cards which weren't graded have no rank, rather than the rank for a missing tier.
+    frame['Rank'] = tier.map(rank_to_tier).where(tier.notna(), None)
     return frame
 
 
-def append_card_info(frame: pd.DataFrame, card_dict: dict[str, Card]) -> pd.DataFrame:
+def append_card_info(frame: pd.DataFrame, card_info: pd.DataFrame) -> pd.DataFrame:
     """
     Appends card information to an existing frame to help with sorting.
     :param frame: The pandas frame which contains the card performance data.
-    :param card_dict: The dictionary of card names and card objects.
+    :param card_info: The frame of card information, indexed by card name, eg. `SetMetadata.CARD_INFO_FRAME`.
     :return: A DataFrame with the card information attached.
     """
-    # Get each card from the provided card dictionary, relying on the Card's fallback
-    #  on an unknown name. This helps be forgiving about names, and patches spotty data
-    #  which can come back from 17Lands, which originates in MTGA.
-    card_list = list()
-    for card_name in frame.index:
-        try:
-            card = card_dict[card_name]
-        except KeyError:  # pragma: nocover
-            card = Card.from_name(card_name)
-        card_list.append(card)
-
-    # TODO: This should be handled as a join.
-    frame['Cast Color'] = [card.CAST_IDENTITY for card in card_list]
-    frame['CMC'] = [card.CMC for card in card_list]
-    frame['Type Line'] = [card.TYPE_LINE for card in card_list]
-    frame['Supertypes'] = [card.SUPERTYPES for card in card_list]
-    frame['Types'] = [card.TYPES for card in card_list]
-    frame['Subtypes'] = [card.SUBTYPES for card in card_list]
-    frame['Power'] = [card.POW for card in card_list]
-    frame['Toughness'] = [card.TOU for card in card_list]
+    # Cards which aren't in the provided information are found by name, relying on the Card's fallback on an unknown
+    #  name. This helps be forgiving about names, and patches spotty data which can come back from 17Lands, which
+    #  originates in MTGA. Each missing card is only looked up once.
+    card_names = frame.index.get_level_values(-1)
+    missing = card_names.unique().difference(card_info.index)
+    if len(missing) > 0:  # pragma: nocover
+        cards = [Card.from_name(card_name) for card_name in missing]
+        card_info = pd.concat([card_info, SetMetadata.gen_card_info_frame(card for card in cards if card is not None)])
+        card_info = card_info[~card_info.index.duplicated()]
+
+    # Attach the information with a single join on the card names, keeping the order of the frame.
+    frame = frame.drop(columns=CARD_INFO_COL_NAMES, errors='ignore')
+    frame = frame.join(card_info[CARD_INFO_COL_NAMES], on='Name')
 
     # TODO: Make this re-indexing more dynamic.
     column_names = STAT_COL_NAMES + SHARED_COL_NAMES + CARD_INFO_COL_NAMES
@@ -146,3 +195,78 @@ def gen_meta_frame(meta_dict: list[dict[str, object]]) -> tuple[pd.DataFrame, pd
     archetype_frame = archetype_frame.set_index('Name')
 
     return summary_frame, archetype_frame
+
+
+def gen_hist_frames(card_data: dict[str, Union[WUBRG_CARD_DATA, pd.DataFrame]], meta_data: dict[str, META_DATA],
+                    card_info: pd.DataFrame, compact: bool = False) \
+        -> tuple[Optional[pd.DataFrame], Optional[pd.DataFrame], Optional[pd.DataFrame]]:
+    """
+    Turns the data for a number of dates into history frames, with card info and grades attached.
+    Each date is handled on its own, so the dates can be split up between processes, and the frames joined after.
+    :param card_data: A dictionary of dates, and their card data. A date's card data can also be a frame of records,
+    with a 'Deck Colors' column, eg. from `CardTable.get_records`.
+    :param meta_data: A dictionary of dates, and their archetype data.
+    :param card_info: The frame of card information, indexed by card name, eg. `SetMetadata.CARD_INFO_FRAME`.
+    :param compact: Whether to compact the frames, using `compact_frame`. Default: False
+    :return: The grouped archetype, single archetype and card frames, or None for those with no dates.
+    """
+    grouped_frame, single_frame, card_frame = None, None, None
+    if meta_data:
+        meta_frames = {date: gen_meta_frame(data) for date, data in meta_data.items()}
+        grouped_frame = pd.concat({date: frames[0] for date, frames in meta_frames.items()}, names=['Date', 'Name'])
+        single_frame = pd.concat({date: frames[1] for date, frames in meta_frames.items()}, names=['Date', 'Name'])
+
+    if card_data:
+        names = ['Date', 'Deck Colors']
+        records = [data.assign(Date=date) if isinstance(data, pd.DataFrame) else
+                   gen_card_records({(date, color): data[color] for color in data}, names)
+                   for date, data in card_data.items()]
+        card_frame = gen_card_frames_from_records(pd.concat(records, ignore_index=True), names)
+        card_frame = append_card_info(card_frame, card_info)
+        card_frame = get_stats_grades(card_frame, names)
+
+    if compact:
+        grouped_frame = compact_frame(grouped_frame, 'grouped archetype history') if meta_data else None
+        single_frame = compact_frame(single_frame, 'single archetype history') if meta_data else None
+        card_frame = compact_frame(card_frame, 'card history') if card_data else None
+    return grouped_frame, single_frame, card_frame
+
+
+def compact_frame(frame: pd.DataFrame, name: str = 'frame') -> pd.DataFrame:
+    """
+    Converts a frame to use less memory. Text which repeats becomes categories, sets of types become categories of
+    frozensets, counts use the smallest integer type that fits, and a 'Date' index level becomes real dates.
+    Columns which are already compact are left as they are, so this can be run again after adding rows.
+    :param frame: The frame to compact.
+    :param name: What to call the frame when logging how much memory was saved.
+    :return: The compacted frame.
+    """
+    before = frame.memory_usage(deep=True).sum()
+    frame = frame.copy()
+
+    for col in frame.columns:
+        series = frame[col]
+        if series.dtype == object:
+            values = series.dropna()
+            if values.map(lambda x: isinstance(x, (set, frozenset))).all() and len(values) > 0:
+                # Sets can't be categories, but frozensets can, and still behave the same for lookups.
+                frame[col] = series.map(lambda x: frozenset(x) if isinstance(x, set) else x).astype('category')
+            elif values.map(lambda x: isinstance(x, str)).all():
+                # Ordered by value, so taking the min or max still works like it does for text.
+                frame[col] = pd.Categorical(series, categories=sorted(values.unique()), ordered=True)
+        elif col in COUNT_COL_NAMES or str(col).startswith('#') or str(col).endswith(' GW'):
+            # Only whole, non-missing counts can be stored as integers. They're kept signed, so subtracting one
+            #  count from another can still go below zero, instead of wrapping around.
+            if series.notna().all() and (series % 1 == 0).all():
+                frame[col] = pd.to_numeric(series, downcast='integer')
+
+    if 'Date' in frame.index.names and frame.index.get_level_values('Date').dtype == object:
+        if isinstance(frame.index, pd.MultiIndex):
+            level = frame.index.names.index('Date')
+            frame.index = frame.index.set_levels(pd.to_datetime(frame.index.levels[level]), level=level)
+        else:
+            frame.index = pd.to_datetime(frame.index)
+
+    after = frame.memory_usage(deep=True).sum()
+    logging.verbose(f'Compacted {name} from {before / 2 ** 20:.1f}MB to {after / 2 ** 20:.1f}MB.')
+    return frame
@@ -1,3 +1,53 @@
 # Data Storage Defaults
 DATA_DIR_NAME: str = '17LandsData'
 DATA_DIR_LOC: str = r'C:\Users\Zachary\Coding\GitHub'
+
+# Data Storage Format
+#  'json' keeps every response as its own file. 'parquet' keeps each day's data in compressed, typed columnar files,
+#  which take a tenth of the space, and are loaded many times quicker, as frames are made straight from their tables.
+#  Json files left from before switching store are still read. With MIGRATE_JSON, they're also imported into the
+#  store the first time they're needed, so they're quick to load too, and the json files are kept.
+DATA_STORE: str = 'parquet'
+MIGRATE_JSON: bool = False
+PARQUET_COMPRESSION: str = 'zstd'
+
+# Data Warehouse
+#  When enabled, all data is also saved into a single SQLite database in DATA_DIR_LOC, which can be queried across
+#  sets and dates, and is used to load a format's history in one go.
+USE_WAREHOUSE: bool = False
+WAREHOUSE_NAME: str = '17LandsData.sqlite'
+
+# Response Caching
+#  Summary responses from 17Lands are kept in this folder in DATA_DIR_LOC, so they can be revalidated with conditional
+#  requests, instead of re-downloaded. Data for a single day is only fetched once, so it isn't cached. Once the cache
+#  takes up more than HTTP_CACHE_SIZE bytes, the least recently used responses are removed.
+HTTP_CACHE_NAME: str = 'HttpCache'
+HTTP_CACHE_SIZE: int = 256 * 2 ** 20
+
+# Summary Data
+#  When enabled, the summary data for a format is built from the data for each day, instead of being fetched from
+#  17Lands. Each day is only fetched once, so this saves re-downloading the summary every day.
+LOCAL_SUMMARY: bool = False
+
+# Frame Memory
+#  When enabled, frames use compact types: categories for repeated text, dates for the 'Date' level, and the smallest
+#  integer types for counts. This saves a lot of memory for the history frames, at the cost of some conversion time.
+COMPACT_FRAMES: bool = False
+
+# Frame Snapshots
+#  When enabled, the frames made for a format are saved to disk, and loaded from there the next time they're needed.
+#  Only the dates whose files have changed since are made again. Reloading the data always makes the frames again.
+#  Snapshots are also made again if the information about the set's cards changes.
+FRAME_SNAPSHOTS: bool = False
+
+# Data Fetching Defaults
+#  When fetching concurrently, the colour-filtered card ratings for a day are requested by a pool of workers.
+#  How quickly requests are sent is capped by the rate limit for 17Lands, in `data_requesting/utils/settings.py`.
+CONCURRENT_FETCH: bool = False
+FETCH_WORKERS: int = 8
+
+# Pandafying Defaults
+#  When pandafying concurrently, the dates of the history frames are split between a pool of worker processes, which
+#  each make the frames for their dates. A number of workers of 0 uses one per core.
+CONCURRENT_PANDAFY: bool = False
+PANDAFY_WORKERS: int = 0
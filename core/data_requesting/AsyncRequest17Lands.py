@@ -0,0 +1,147 @@
+"""
+An asyncio counterpart to Request17Lands, with the same methods as coroutines.
+"""
+
+from typing import Optional
+from datetime import date
+
+from core.data_requesting.utils import *
+from core.data_requesting.AsyncRequester import AsyncRequester
+from core.data_requesting.Request17Lands import Request17Lands
+
+
+class AsyncRequest17Lands(AsyncRequester):
+    """
+    An asyncio counterpart to Request17Lands, with the same methods as coroutines. Parameters and results are handled
+    by the same helpers as Request17Lands, so both return the same data.
+    """
+    def __init__(self, tries: int = None, fail_delay: float = None, success_delay: float = None):
+        super().__init__(tries, fail_delay, success_delay, [200])
+
+    async def get_colors(self) -> Optional[list[str]]:
+        """
+        Gets the list of colours 17 Lands supports.
+        :return: A list of colours
+        """
+        return await self.get_json_response(url=COLOR_17L_URL)
+
+    async def get_expansions(self) -> Optional[list[str]]:
+        """
+        Gets the list of expansions (sets) 17 Lands supports.
+        :return: A list expansion codes.
+        """
+        return await self.get_json_response(url=EXPANSIONS_17L_URL)
+
+    async def get_event_types(self) -> Optional[list[str]]:
+        """
+        Gets the list of event types (game modes: eg. 'Premier Draft') 17 Lands supports.
+        :return: A list event types.
+        """
+        return await self.get_json_response(url=FORMATS_17L_URL)
+
+    async def get_play_draw_stats(self) -> Optional[list[dict]]:
+        """
+        Returns the play-draw stats for the formats 17 Lands has available, from PLAY_DRAW_17L_URL.
+        :return: The play-draw data.
+        """
+        return await self.get_json_response(url=PLAY_DRAW_17L_URL)
+
+    async def get_color_ratings(self, expansion: str, event_type: str = None,
+                                start_date: date = None, end_date: date = None,
+                                user_group: str = None, combine_splash: bool = False) -> Optional[list[dict]]:
+        """
+        Gets data on win-rates for different colour combinations of decks.
+        See `Request17Lands.get_color_ratings` for details on the parameters.
+        :return: A list of dictionaries containing archetype information.
+        """
+        params = Request17Lands._gen_color_ratings_params(expansion, event_type, start_date, end_date,
+                                                          user_group, combine_splash)
+        result = await self.get_json_response(url=COLOR_RATING_17L_URL, params=params)
+        return Request17Lands._none_if_empty(result, 1)
+
+    async def get_card_ratings(self, expansion: str, event_type: str = None,
+                               start_date: date = None, end_date: date = None,
+                               user_group: str = None, deck_colors: str = None) -> Optional[list[dict]]:
+        """
+        Gets data on the performance of cards in a draft.
+        See `Request17Lands.get_card_ratings` for details on the parameters.
+        :return: A list of dictionaries containing card information.
+        """
+        params = Request17Lands._gen_card_ratings_params(expansion, event_type, start_date, end_date,
+                                                         user_group, deck_colors)
+        result = await self.get_json_response(url=CARD_RATING_17L_URL, params=params)
+        return Request17Lands._none_if_empty(result)
+
+    async def get_card_evaluations(self, expansion: str, event_type: str = None,
+                                   start_date: date = None, end_date: date = None,
+                                   rarity: str = None, color: str = None) -> Optional[dict]:
+        """
+        Gets data on how highly cards are being taken during a draft, and its changes over time.
+        See `Request17Lands.get_card_evaluations` for details on the parameters.
+        :return: Returns a dict with 4 lists, which need to be joined into tabular data.
+        """
+        params = Request17Lands._gen_card_evaluations_params(expansion, event_type, start_date, end_date,
+                                                             rarity, color)
+        return await self.get_json_response(url=CARD_EVAL_17L_URL, params=params)
+
+    async def get_trophy_deck_metadata(self, expansion: str, event_type: Optional[str] = None) \
+            -> Optional[list[dict]]:
+        """
+        Gets cursory information on (up to) the 500 most recent trophy decks, from TROPHY_17L_URL.
+        :param expansion: The set/expansion to get data on.
+        :param event_type: The event type to get data on. Default: DEFAULT_FORMAT
+        :return: A list of metadata of the trophy decks.
+        """
+        params = Request17Lands._gen_trophy_params(expansion, event_type)
+        result = await self.get_json_response(url=TROPHY_17L_URL, params=params)
+        return Request17Lands._none_if_empty(result)
+
+    async def get_deck(self, draft_id: str, deck_index: int = 0) -> Optional[dict]:
+        """
+        Gets details of a particular deck from DECK_17L_URL, based on the draft id and deck index provided.
+        :param draft_id: The id of the draft.
+        :param deck_index: The index of the deck to look for. Default: 0
+        :return: The details of the specified deck, if found.
+        """
+        params = {
+            'draft_id': draft_id,
+            'deck_index': deck_index
+        }
+        return await self.get_json_response(url=DECK_17L_URL, params=params)
+
+    async def get_details(self, draft_id: str) -> Optional[dict]:
+        """
+        Gets details of a run from DETAILS_17L_URL, based on the draft id provided.
+        :param draft_id: The id of the draft.
+        :return: A dictionary with the run's details, if found.
+        """
+        params = {
+            'draft_id': draft_id,
+        }
+        return await self.get_json_response(url=DETAILS_17L_URL, params=params)
+
+    async def get_draft(self, draft_id: str) -> Optional[dict]:
+        """
+        Gets a draft log from DRAFT_LOG_17L_URL, based on the draft id provided.
+        :param draft_id: The id of the draft.
+        :return: A dictionary with the draft data, if found.
+        """
+        params = {
+            'draft_id': draft_id
+        }
+
+        # Make a request and abort if None is returned.
+        result = await self.get_response(url=DRAFT_LOG_17L_URL, params=params)
+        if result is None:
+            return None
+        return Request17Lands._parse_draft(result.text)
+
+    async def get_tier_list(self, tier_list_id: str) -> Optional[list[dict]]:
+        """
+        Requests information on a tier list from TIER_17L_URL, based on a tier list id.
+        :param tier_list_id: The id for the tier list.
+        :return: A list of card tier information. A an invalid id returns None.
+        """
+        url = TIER_17L_URL + f"/{tier_list_id}"
+        result = await self.get_json_response(url=url)
+        return Request17Lands._none_if_empty(result)
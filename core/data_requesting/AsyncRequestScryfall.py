@@ -0,0 +1,129 @@
+"""
+An asyncio counterpart to RequestScryfall, with the same methods as coroutines.
+"""
+
+from typing import Union, Optional, Any
+import asyncio
+
+from core.utilities import logging, flatten_lists
+
+from core.data_requesting.utils import *
+from core.data_requesting.AsyncRequester import AsyncRequester
+from core.data_requesting.RequestScryfall import RequestScryfall
+
+
+class AsyncRequestScryfall(AsyncRequester):
+    """
+    An asyncio counterpart to RequestScryfall, with the same methods as coroutines. Parameters and results are handled
+    by the same helpers as RequestScryfall, so both return the same data.
+    """
+    def __init__(self, tries: int = None, fail_delay: float = None, success_delay: float = None):
+        super().__init__(tries, fail_delay, success_delay, [200, 404])
+
+    async def _get_set_cards(self, set_code: str, order: str = 'set') -> list[dict[str, Any]]:
+        """
+        Gets the cards from a given set, with an optional order.
+        :param set_code: The set to get cards for.
+        :param order: The order in which cards are returned. Default: 'set'
+        :return: A list of card json objects.
+        """
+        set_code, append_alchemy = RequestScryfall._split_alchemy_code(set_code)
+
+        params = RequestScryfall._gen_set_cards_params(set_code, order)
+        logging.info(f"Fetching card data for set: {set_code}")
+        responses = await self.get_paginated_json_response(CARD_SCRYFALL_URL, params=params) or list()
+
+        # If fetching alchemy cards, append them to the existing data.
+        if append_alchemy:
+            params['q'] = f'e%3AY{set_code}'
+            responses += await self.get_paginated_json_response(CARD_SCRYFALL_URL, params=params) or list()
+
+        return RequestScryfall._extract_card_data(responses)
+
+    async def get_set_cards(self, set_code: str) -> list[dict[str, Any]]:
+        """
+        Gets the cards from a given set, in the 'set' order (based on card number).
+        :param set_code: The set to get cards for.
+        :return: A list of card json objects.
+        """
+        return await self._get_set_cards(set_code, 'set')
+
+    async def get_set_review_order(self, set_code: str) -> list[dict[str, Any]]:
+        """
+        Gets the cards from a given set, in the 'review' order (based on cmc/mv and rarity).
+        :param set_code: The set to get cards for.
+        :return: A list of card json objects.
+        """
+        return await self._get_set_cards(set_code, 'review')
+
+    async def get_set_info(self, set_code: str) -> Union[tuple[None, None], tuple[str, str]]:
+        """
+        Gets the name and the icon for a set.
+        :param set_code: The 3-character code for the set.
+        :return: The full set name and a link to the set symbol. If the set cannot be found Nones are returned.
+        """
+        if len(set_code) > 3 and set_code.startswith('Y'):
+            set_code = f"Y{set_code[3:]}"
+
+        url = f'{SET_SCRYFALL_URL}/{set_code}'
+        logging.info(f"Fetching data for set: {set_code}")
+        response = await self.get_json_response(url)
+
+        try:
+            return response['name'], response['icon_svg_uri']
+        except (KeyError, TypeError):
+            logging.warning(f"No info for set: {set_code}")
+            return None, None
+
+    async def get_card_by_name(self, name: str) -> Optional[dict[str, Any]]:
+        """
+        Gets card data from scryfall based on a name. Scryfall's fuzzy filter is
+        used to handle imprecise queries and spelling errors.
+        :param name: The card name provided by a user
+        :return: A card info struct which contains card data, and an error
+        message if a problem occurred.
+        """
+        params = {
+            "fuzzy": name
+        }
+
+        logging.info(f"Fetching data for card: {name}")
+        response = await self.get_json_response(FUZZY_SCRYFALL_URL, params)
+        return RequestScryfall._check_card_response(name, response)
+
+    async def get_cards_by_names(self, names: list[str]) -> tuple[list[dict[str, Any]], list[str]]:
+        """
+        Gets card data from scryfall for many names at once, using the collection endpoint.
+        Up to 75 cards are fetched per request, but names must be exact, so there is no spelling correction.
+        :param names: The exact names of the cards.
+        :return: A list of card json objects, and a list of names which weren't found.
+        """
+        logging.info(f"Fetching data for {len(names)} cards.")
+        batches = RequestScryfall._gen_collection_batches(names)
+        responses = await asyncio.gather(*[self.get_json_response(COLLECTION_SCRYFALL_URL, payload=batch)
+                                           for batch in batches])
+        return RequestScryfall._extract_collection_data(list(responses), names)
+
+    # NOTE: The two functions below are expensive and slow, especially to Scryfall.
+    #  They should be called only as required.
+    async def get_arena_cards(self) -> list[dict[str, Any]]:
+        """
+        Gets all cards which are currently available on arena.
+        :return: A list of card json objects.
+        """
+        params = {
+            'format': 'json',
+            'q': f'game%3Aarena',
+        }
+        logging.info(f"Fetching card data for all Arena cards.")
+        responses = await self.get_paginated_json_response(CARD_SCRYFALL_URL, params=params) or list()
+        return flatten_lists([x['data'] for x in responses])
+
+    async def get_bulk_data(self) -> list[dict[str, Any]]:
+        """
+        Gets all cards which are stored on Scryfall.
+        :return: A list of card json objects.
+        """
+        logging.info(f"Fetching bulk data...")
+        response = await self.get_json_response(BULK_SCRYFALL_URL)
+        return await self.get_json_response(response['download_uri'])
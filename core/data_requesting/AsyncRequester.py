@@ -0,0 +1,247 @@
+"""
+An asyncio counterpart to Requester, which lets many requests share one event loop instead of a thread each.
+"""
+from __future__ import annotations
+from json import JSONDecodeError
+from typing import Optional, Union, Any
+from time import perf_counter
+import asyncio
+from aiohttp import ClientSession, ClientResponse, TCPConnector
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+
+from core.utilities import logging
+
+from core.data_requesting.SessionManager import SessionManager
+from core.data_requesting.RateLimiter import RateLimiter
+from core.data_requesting.ResponseCache import ResponseCache
+from core.data_requesting.Requester import Requester
+from core.data_requesting.SingleFlight import AsyncSingleFlight
+from core.data_requesting.RequestTelemetry import RequestTelemetry
+
+
+class AsyncRequester(Requester):
+    """
+    An asyncio counterpart to Requester, with the same configuration and retry behaviour. The request methods are
+    coroutines, so they can be gathered on one event loop. Requests are still paced by the shared per-host rate limits,
+    and return the same Response objects, so their results can be handled just like those of a Requester.
+
+    Connections are held by an aiohttp session, which should be closed when done, either with `close`, or by using
+    the requester as an async context manager.
+    """
+    # Identical requests awaited at the same time, by any AsyncRequester, share a single round trip.
+    #  Only the response is shared, and each caller decodes its own json, since callers change it in place.
+    _ASYNC_RESPONSE_FLIGHTS: AsyncSingleFlight = AsyncSingleFlight()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._session: Optional[ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def __aenter__(self) -> AsyncRequester:
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    def _get_session(self) -> ClientSession:
+        """
+        Returns the session for the running event loop, creating one if needed.
+        :return: An aiohttp ClientSession.
+        """
+        # A session can only be used on the loop it was created on, so make a new one if the loop has changed.
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            connector = TCPConnector(limit_per_host=SessionManager.POOL_MAXSIZE)
+            self._session = ClientSession(connector=connector)
+            self._loop = loop
+        return self._session
+
+    async def close(self) -> None:
+        """ Closes the session, releasing its connections. """
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._loop = None
+
+    @staticmethod
+    async def _to_response(resp: ClientResponse) -> Response:
+        """
+        Reads an aiohttp response into a Response, so it can be handled the same way as a blocking request.
+        :param resp: The aiohttp response.
+        :return: A Response with the same status, headers and content.
+        """
+        response = Response()
+        response.status_code = resp.status
+        response.url = str(resp.url)
+        response.reason = resp.reason
+        response.headers = CaseInsensitiveDict(resp.headers)
+        response.encoding = resp.charset
+        response._content = await resp.read()
+        return response
+
+    async def _attempt(self, url, payload: Any = None) -> tuple[Optional[Response], Optional[Response]]:
+        """
+        Makes a single attempt to get a Response from the given URL.
+        :param url: The url to get data from.
+        :param payload: An object to send as json in a POST request. Default: None, which sends a GET request.
+        :return: The Response if it has a valid response code or None, and the raw Response or None if the
+        connection failed. The raw Response is used to decide if and when to retry.
+        """
+        start = perf_counter()
+        try:
+            # Reserve a slot from the host's shared rate limiter, and wait for it without blocking the loop.
+            waited = RateLimiter.get_limiter(url).reserve()
+            if waited > 0:
+                logging.debug(f"Waiting {waited:.2f} seconds for rate limit.")
+                RequestTelemetry.record_rate_limit(url, waited)
+                await asyncio.sleep(waited)
+
+            # If a copy of the data is cached, ask the server to only send it again if it has changed.
+            #  POST requests aren't cached, as their response depends on the payload, not just the url.
+            #  The cache is read and written in a thread, so its file access doesn't hold up the event loop.
+            cached = await asyncio.to_thread(self._CACHE.load, url) if self._CACHE is not None and payload is None \
+                else None
+            headers = ResponseCache.get_validators(cached)
+
+            # Try to get the data from the URL.
+            logging.debug(f"Attempting to get data from '{url}'.")
+            start = perf_counter()
+            if payload is None:
+                request = self._get_session().get(url, headers=headers)
+            else:
+                request = self._get_session().post(url, json=payload)
+            async with request as resp:
+                response = await self._to_response(resp)
+            RequestTelemetry.record_response(url, perf_counter() - start, response.status_code, len(response.content))
+            response, store = self._resolve_cached(url, response, cached, payload is None)
+            if store:
+                await asyncio.to_thread(self._CACHE.store, url, response)
+            response, raw = self._check_response(url, response)
+
+            # If getting the data was a success, wait any extra time requested.
+            if response is not None and self._SUCCESS_DELAY:
+                await asyncio.sleep(self._SUCCESS_DELAY)
+            return response, raw
+        except Exception as ex:
+            # On an failure to connect to the URL, return None.
+            logging.error(f'Encountered unexpected error: {ex}')
+            RequestTelemetry.record_error(url, perf_counter() - start)
+            return None, None
+
+    async def request(self, url) -> Optional[Response]:
+        """
+        Attempts to get a Response from the given URL, and returns it if it has a valid response code.
+        :param url: The url to get data from.
+        :return: A Response or None.
+        """
+        return (await self._attempt(url))[0]
+
+    async def _get_response(self, composed_url: str, payload: Any = None) -> Optional[Response]:
+        """
+        Attempts to get a response from a url, within a given number of tries.
+        :param composed_url: The url to get data from, including its parameters.
+        :param payload: An object to send as json in a POST request. Default: None, which sends a GET request.
+        :return: A Response or None.
+        """
+        # Try to get the data the number of time prescribed, backing off between failures.
+        cnt = 0
+        for cnt in range(1, self._TRIES + 1):
+            response, raw = await self._attempt(composed_url, payload)
+            if response is not None:
+                return response
+
+            delay = self._get_retry_delay(composed_url, cnt, raw)
+            if delay is None:
+                break
+            await asyncio.sleep(delay)
+
+        # Logging any failure to get data, and returning None.
+        logging.error(f'Failed to get data after {cnt} attempts.')
+        logging.error(f'Failed URL: {composed_url}')
+        return None
+
+    async def get_response(self, url: str, params: dict[str, str] = None, payload: Any = None) -> Optional[Response]:
+        """
+        Attempts to get a response from a url, within a given number of tries.
+        If an identical request is already in flight on the loop, its response is shared instead.
+        :param url: The url to get data from.
+        :param params: A dictionary of parameters to include in the url.
+        :param payload: An object to send as json in a POST request. Default: None, which sends a GET request.
+        :return: A Response or None.
+        """
+        # Get the url to query based on the parameters.
+        composed_url = self._gen_url(url, params)
+        key = self._get_flight_key(composed_url, payload)
+        return await self._ASYNC_RESPONSE_FLIGHTS.do(key, lambda: self._get_response(composed_url, payload))
+
+    async def get_json_response(self, url: str, params: dict[str, str] = None, payload: Any = None) \
+            -> Optional[Union[list, dict]]:
+        """
+        Attempts to get json data from a url, within a given number of tries.
+        If an identical request is already in flight on the loop, its response is shared, but each caller gets its
+        own json.
+        :param url: The url to get data from.
+        :param params: A dictionary of parameters to include in the url.
+        :param payload: An object to send as json in a POST request. Default: None, which sends a GET request.
+        :return: A json object or None.
+        """
+        return self._parse_json(url, await self.get_response(url, params, payload))
+
+    async def get_paginated_response(self, url: str, params: dict[str, str] = None,
+                                     url_key: str = 'next_page') -> Optional[list[Response]]:
+        """
+        Attempts to get a series of responses from a url, within a given number of tries.
+        Each page holds the url of the next, so pages are fetched one after another.
+        :param url: The url to get data from.
+        :param params: A dictionary of parameters to include in the url.
+        :param url_key: The key to get the next page url from.
+        :return: A list of Responses or None.
+        """
+        ret = list()
+        next_url = self._gen_url(url, params)
+
+        # While we have a url to query, get the response and the url to fetch next.
+        while next_url:
+            response = await self.get_response(next_url)
+            if response is None:
+                break
+            ret.append(response)
+
+            try:
+                next_url = response.json().get(url_key)
+            except JSONDecodeError:
+                logging.warning(f"Failed to get next url with key '{url_key}'")
+                next_url = None
+            if next_url:
+                logging.debug(f"Fetching next page. ({next_url})")
+
+        # Return all of the responses received, return None instead if the list is empty.
+        if len(ret) == 0:
+            return None
+        return ret
+
+    async def get_paginated_json_response(self, url: str, params: dict[str, str] = None) \
+            -> Optional[list[Union[list, dict]]]:
+        """
+        Attempts to get a series of json objects from a url, within a given number of tries.
+        :param url: The url to get data from.
+        :param params: A dictionary of parameters to include in the url.
+        :return: A list of json objects or None.
+        """
+        # Get the responses to parse the json from, short-circuiting if it's None.
+        responses = await self.get_paginated_response(url, params)
+        if responses is None:
+            return None
+
+        # Initialise a list to hold the parse json, and then parse each response.
+        ret = list()
+        for response in responses:
+            try:
+                ret.append(response.json())
+            except JSONDecodeError:
+                # If we fail to parse a response, log an error and return None.
+                logging.error(f'Failed to parse JSON for url: {url}')
+                logging.error(response)
+                return None
+        return ret
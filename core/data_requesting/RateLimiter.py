@@ -0,0 +1,86 @@
+"""
+A token bucket which helps limit how many requests are made to a website over time.
+"""
+
+from __future__ import annotations
+from time import monotonic, sleep
+from threading import Lock
+
+from core.data_requesting.utils import RATE_LIMITS, DEFAULT_RATE_LIMIT
+from core.data_requesting.SessionManager import SessionManager
+
+
+class RateLimiter:
+    """
+    A thread-safe token bucket. Tokens refill at a steady rate, up to a maximum burst size, and each request takes
+    one token. When no tokens are left, the request is scheduled for when the next token becomes available.
+
+    The class also acts as a global repository of limiters, with one per host, so that every Requester in the process
+    draws from the same bucket for a given website.
+    """
+    LIMITERS: dict[str, RateLimiter] = dict()
+    _LOCK: Lock = Lock()
+
+    @classmethod
+    def get_limiter(cls, url: str) -> RateLimiter:
+        """
+        Returns the shared limiter for the host of the url, creating one from RATE_LIMITS if none exists.
+        :param url: The url which is going to be requested.
+        :return: The RateLimiter for the host.
+        """
+        host = SessionManager.get_host(url)
+        with cls._LOCK:
+            if host not in cls.LIMITERS:
+                rate, burst = RATE_LIMITS.get(host, DEFAULT_RATE_LIMIT)
+                cls.LIMITERS[host] = cls(rate, burst)
+            return cls.LIMITERS[host]
+
+    @classmethod
+    def configure(cls, host: str, rate: float, burst: int = 1) -> None:
+        """
+        Replaces the shared limiter for a host, changing how quickly it can be queried.
+        :param host: The host to limit, eg. 'api.scryfall.com'.
+        :param rate: The number of requests allowed per second.
+        :param burst: The number of requests which can be sent back-to-back. Default: 1
+        """
+        with cls._LOCK:
+            cls.LIMITERS[host.lower()] = cls(rate, burst)
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError("`rate` must be greater than 0.")
+        if burst < 1:
+            raise ValueError("`burst` must be at least 1.")
+
+        self.RATE: float = rate
+        self.BURST: int = burst
+        self._tokens: float = float(burst)
+        self._last_refill: float = monotonic()
+        self._lock: Lock = Lock()
+
+    def reserve(self) -> float:
+        """
+        Takes a token from the bucket, without waiting for it.
+        :return: The number of seconds to wait before the token can be used.
+        """
+        with self._lock:
+            # Refill the bucket based on the time passed, without going over the burst size.
+            now = monotonic()
+            self._tokens = min(self.BURST, self._tokens + (now - self._last_refill) * self.RATE)
+            self._last_refill = now
+
+            # Take a token. If the bucket is in debt, the caller has to wait for it to be repaid.
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.RATE
+
+    def acquire(self) -> float:
+        """
+        Takes a token from the bucket, waiting until it can be used.
+        :return: The number of seconds spent waiting.
+        """
+        delay = self.reserve()
+        if delay > 0:
+            sleep(delay)
+        return delay
@@ -2,7 +2,7 @@
 A small class which helps get specific data from scryfall, handling the minutia of json checking.
 """
 
-from typing import Optional
+from typing import Optional, Union, Any
 from datetime import date
 import json
 import pandas as pd
@@ -17,6 +17,86 @@ class Request17Lands(Requester):
     def __init__(self, tries: int = None, fail_delay: float = None, success_delay: float = None):
         super().__init__(tries, fail_delay, success_delay, [200])
 
+    @staticmethod
+    def _none_if_empty(result: Optional[Union[list, dict]], empty_len: int = 0) -> Optional[Union[list, dict]]:
+        """
+        Converts a result which holds no data into None.
+        :param result: The result of a request.
+        :param empty_len: The length of a result which has no data. Default: 0
+        :return: The result, or None if it is missing or holds no data.
+        """
+        if result is None or len(result) <= empty_len:
+            return None
+        return result
+
+    @staticmethod
+    def _gen_color_ratings_params(expansion: str, event_type: str = None,
+                                  start_date: date = None, end_date: date = None,
+                                  user_group: str = None, combine_splash: bool = False) -> dict[str, Any]:
+        """ Packages the parameters for `get_color_ratings` into a dict to be used for the url. """
+        event_type = event_type or DEFAULT_FORMAT
+        start_date = start_date or DEFAULT_DATE
+        end_date = end_date or date.today()
+        return {
+            'expansion': expansion,
+            'event_type': event_type,
+            'start_date': start_date.strftime('%Y-%m-%d'),
+            'end_date': end_date.strftime('%Y-%m-%d'),
+            'combine_splash': combine_splash,
+            'user_group': user_group
+        }
+
+    @staticmethod
+    def _gen_card_ratings_params(expansion: str, event_type: str = None,
+                                 start_date: date = None, end_date: date = None,
+                                 user_group: str = None, deck_colors: str = None) -> dict[str, Any]:
+        """ Packages the parameters for `get_card_ratings` into a dict to be used for the url. """
+        event_type = event_type or DEFAULT_FORMAT
+        start_date = start_date or DEFAULT_DATE
+        end_date = end_date or date.today()
+        return {
+            'expansion': expansion,
+            'format': event_type,
+            'start_date': start_date.strftime('%Y-%m-%d'),
+            'end_date': end_date.strftime('%Y-%m-%d'),
+            'user_group': user_group,
+            'colors': deck_colors
+        }
+
+    @staticmethod
+    def _gen_card_evaluations_params(expansion: str, event_type: str = None,
+                                     start_date: date = None, end_date: date = None,
+                                     rarity: str = None, color: str = None) -> dict[str, Any]:
+        """ Packages the parameters for `get_card_evaluations` into a dict to be used for the url. """
+        event_type = event_type or DEFAULT_FORMAT
+        start_date = start_date or DEFAULT_DATE
+        end_date = end_date or date.today()
+        return {
+            'expansion': expansion,
+            'format': event_type,
+            'start_date': start_date.strftime('%Y-%m-%d'),
+            'end_date': end_date.strftime('%Y-%m-%d'),
+            'rarity': rarity,
+            'color': color
+        }
+
+    @staticmethod
+    def _gen_trophy_params(expansion: str, event_type: Optional[str] = None) -> dict[str, Any]:
+        """ Packages the parameters for `get_trophy_deck_metadata` into a dict to be used for the url. """
+        return {
+            'expansion': expansion,
+            'format': event_type or DEFAULT_FORMAT
+        }
+
+    @staticmethod
+    def _parse_draft(text: str) -> dict:
+        """
+        Extracts the draft data from the body of a draft log response, which wraps its JSON in extra characters.
+        :param text: The text of the response.
+        :return: The draft data.
+        """
+        return json.loads(text[6:-2])['payload']
+
     def get_colors(self) -> Optional[list[str]]:
         """
         Gets the list of colours 17 Lands supports.
@@ -58,26 +138,11 @@ class Request17Lands(Requester):
         :param combine_splash: Whether to combine decks that splash with those that don't. Default: False
         :return: A list of dictionaries containing archetype information.
         """
-        # Handle parameters, and package them into a dict to be used for the url.
-        event_type = event_type or DEFAULT_FORMAT
-        start_date = start_date or DEFAULT_DATE
-        end_date = end_date or date.today()
-        params = {
-            'expansion': expansion,
-            'event_type': event_type,
-            'start_date': start_date.strftime('%Y-%m-%d'),
-            'end_date': end_date.strftime('%Y-%m-%d'),
-            'combine_splash': combine_splash,
-            'user_group': user_group
-        }
-
+        params = self._gen_color_ratings_params(expansion, event_type, start_date, end_date, user_group, combine_splash)
         result = self.get_json_response(url=COLOR_RATING_17L_URL, params=params)
 
         # If the result is the default list, no data was found, so return None instead.
-        if len(result) == 1:
-            return None
-
-        return result
+        return self._none_if_empty(result, 1)
 
     def get_card_ratings(self, expansion: str, event_type: str = None,
                          start_date: date = None, end_date: date = None,
@@ -92,26 +157,11 @@ class Request17Lands(Requester):
         :param deck_colors: The colour of deck to filter on. Default: None
         :return: A list of dictionaries containing card information.
         """
-        # Handle parameters, and package them into a dict to be used for the url.
-        event_type = event_type or DEFAULT_FORMAT
-        start_date = start_date or DEFAULT_DATE
-        end_date = end_date or date.today()
-        params = {
-            'expansion': expansion,
-            'format': event_type,
-            'start_date': start_date.strftime('%Y-%m-%d'),
-            'end_date': end_date.strftime('%Y-%m-%d'),
-            'user_group': user_group,
-            'colors': deck_colors
-        }
-
+        params = self._gen_card_ratings_params(expansion, event_type, start_date, end_date, user_group, deck_colors)
         result = self.get_json_response(url=CARD_RATING_17L_URL, params=params)
 
-        # If the result is an empty list, no trophy decks were found, so return None instead.
-        if len(result) == 0:
-            return None
-
-        return result
+        # If the result is an empty list, no card data was found, so return None instead.
+        return self._none_if_empty(result)
 
     def get_card_evaluations(self, expansion: str, event_type: str = None,
                              start_date: date = None, end_date: date = None,
@@ -130,19 +180,7 @@ class Request17Lands(Requester):
 
         # TODO: The data returned from this is weirdly duplicated. Check on that with 17Lands.
         # NOTE: This request doesn't handle large time spans well. Use with caution.
-        # Handle parameters, and package them into a dict to be used for the url.
-        event_type = event_type or DEFAULT_FORMAT
-        start_date = start_date or DEFAULT_DATE
-        end_date = end_date or date.today()
-        params = {
-            'expansion': expansion,
-            'format': event_type,
-            'start_date': start_date.strftime('%Y-%m-%d'),
-            'end_date': end_date.strftime('%Y-%m-%d'),
-            'rarity': rarity,
-            'color': color
-        }
-
+        params = self._gen_card_evaluations_params(expansion, event_type, start_date, end_date, rarity, color)
         return self.get_json_response(url=CARD_EVAL_17L_URL, params=params)
 
     def get_trophy_deck_metadata(self, expansion: str, event_type: Optional[str] = None) -> Optional[list[dict]]:
@@ -152,21 +190,12 @@ class Request17Lands(Requester):
         :param event_type: The event type to get data on. Default: DEFAULT_FORMAT
         :return: A list of metadata of the trophy decks.
         """
-        # Handle parameters, and package them into a dict to be used for the url.
-        event_type = event_type or DEFAULT_FORMAT
-        params = {
-            'expansion': expansion,
-            'format': event_type
-        }
-
         # Request the information.
+        params = self._gen_trophy_params(expansion, event_type)
         result = self.get_json_response(url=TROPHY_17L_URL, params=params)
 
         # If the result is an empty list, no trophy decks were found, so return None instead.
-        if len(result) == 0:
-            return None
-
-        return result
+        return self._none_if_empty(result)
 
     def get_deck(self, draft_id: str, deck_index: int = 0) -> Optional[dict]:
         """
@@ -212,8 +241,7 @@ class Request17Lands(Requester):
             return None
 
         # Process built-in JSON, and return it.
-        result = json.loads(result.text[6:-2])
-        return result['payload']
+        return self._parse_draft(result.text)
 
     def get_tier_list(self, tier_list_id: str) -> Optional[list[dict]]:
         """
@@ -226,7 +254,4 @@ class Request17Lands(Requester):
         result = self.get_json_response(url=url)
 
         # If the result is an empty list, no valid tier list was found, so return None instead.
-        if len(result) == 0:
-            return None
-
-        return result
+        return self._none_if_empty(result)
@@ -12,25 +12,27 @@ from core.data_requesting.Requester import Requester
 
 class RequestScryfall(Requester):
     """ A small class which helps get specific data from scryfall, handling the minutia of json checking. """
+    # The most cards Scryfall will return from a single request to the collection endpoint.
+    _COLLECTION_BATCH_SIZE: int = 75
+
     def __init__(self, tries: int = None, fail_delay: float = None, success_delay: float = None):
         super().__init__(tries, fail_delay, success_delay, [200, 404])
 
-    def _get_set_cards(self, set_code: str, order: str = 'set') -> list[dict[str, Any]]:
+    @staticmethod
+    def _split_alchemy_code(set_code: str) -> tuple[str, bool]:
         """
-        Gets the cards from a given set, with an optional order.
-        :param set_code: The set to get cards for.
-        :param order: The order in which cards are returned. Default: 'set'
-        :return: A list of card json objects.
+        Checks if a set code is for an alchemy set (eg. 'Y23DMU'), whose cards are fetched along with the regular set.
+        :param set_code: The set code to check.
+        :return: The code of the regular set, and whether alchemy cards should be appended.
         """
-
-        # See if an alchemy set needs to be fetched, and prep the data to get the
-        #  regular set cards in addition.
-        append_alchemy = False
         if len(set_code) > 3 and set_code.startswith('Y'):
-            set_code = set_code[3:]
-            append_alchemy = True
+            return set_code[3:], True
+        return set_code, False
 
-        params = {
+    @staticmethod
+    def _gen_set_cards_params(set_code: str, order: str = 'set') -> dict[str, Any]:
+        """ Packages the parameters for `_get_set_cards` into a dict to be used for the url. """
+        return {
             'format': 'json',
             'q': f'e%3A{set_code}',
             'is': 'booster',
@@ -39,19 +41,19 @@ class RequestScryfall(Requester):
             'include_multilingual': False,
             'include_extras': False,
         }
-        logging.info(f"Fetching card data for set: {set_code}")
-        responses = self.get_paginated_json_response(CARD_SCRYFALL_URL, params=params)
-
-        # If fetching alchemy cards, append them to the existing data.
-        if append_alchemy:
-            params['q'] = f'e%3AY{set_code}'
-            responses += self.get_paginated_json_response(CARD_SCRYFALL_URL, params=params)
 
+    @staticmethod
+    def _extract_card_data(responses: Optional[list[dict[str, Any]]]) -> list[dict[str, Any]]:
+        """
+        Gets the cards out of a series of paginated search results.
+        :param responses: The json objects of each page, or None if none were received.
+        :return: A list of card json objects.
+        """
         # Create a list to store the returned json objects.
         ret = list()
 
         # For each response, check that the data exists in the response and add it to the return list.
-        for response in responses:
+        for response in responses or list():
             if 'data' in response:
                 ret.append(response['data'])
 
@@ -62,6 +64,78 @@ class RequestScryfall(Requester):
         # Otherwise, flatten the lists into one long list, to handle more easily.
         return flatten_lists(ret)
 
+    @staticmethod
+    def _check_card_response(name: str, response: Optional[dict[str, Any]]) -> Optional[dict[str, Any]]:
+        """
+        Adds an error message to a fuzzy search response, if it didn't return a card.
+        :param name: The card name provided by a user.
+        :param response: The json object returned by Scryfall.
+        :return: The json object, with an 'err_msg' if a problem occurred.
+        """
+        # If the response is not None, but not a card, do some processing and return the struct with some information.
+        if response is not None and response['object'] != 'card':
+            logging.verbose(f"A non-card was returned for {name}")
+            # If the response type is an error, use that as the message.
+            if response['details'][:20] == 'Too many cards match':
+                response['err_msg'] = f'Error: Multiple card matches for "{name}"'
+            else:
+                response['err_msg'] = f'Error: Cannot find card "{name}"'
+
+        return response
+
+    @classmethod
+    def _gen_collection_batches(cls, names: list[str]) -> list[dict[str, list[dict[str, str]]]]:
+        """
+        Splits a list of card names into the payloads for requests to the collection endpoint.
+        :param names: The card names to look up.
+        :return: A list of payloads, each with up to _COLLECTION_BATCH_SIZE names.
+        """
+        size = cls._COLLECTION_BATCH_SIZE
+        return [{'identifiers': [{'name': name} for name in names[i:i + size]]} for i in range(0, len(names), size)]
+
+    @staticmethod
+    def _extract_collection_data(responses: list[Optional[dict[str, Any]]], names: list[str]) \
+            -> tuple[list[dict[str, Any]], list[str]]:
+        """
+        Gets the cards out of the responses from the collection endpoint, and the names which weren't found.
+        :param responses: The json objects returned for each batch, or None if a batch failed.
+        :param names: The names which were looked up, in the same order as the batches.
+        :return: A list of card json objects, and a list of names which weren't found.
+        """
+        cards, not_found = list(), list()
+        size = RequestScryfall._COLLECTION_BATCH_SIZE
+        for i, response in enumerate(responses):
+            # If the whole batch failed, none of its names were found.
+            if response is None or 'data' not in response:
+                not_found += names[i * size:(i + 1) * size]
+                continue
+            cards += response['data']
+            not_found += [identifier['name'] for identifier in response.get('not_found', list())]
+        return cards, not_found
+
+    def _get_set_cards(self, set_code: str, order: str = 'set') -> list[dict[str, Any]]:
+        """
+        Gets the cards from a given set, with an optional order.
+        :param set_code: The set to get cards for.
+        :param order: The order in which cards are returned. Default: 'set'
+        :return: A list of card json objects.
+        """
+
+        # See if an alchemy set needs to be fetched, and prep the data to get the
+        #  regular set cards in addition.
+        set_code, append_alchemy = self._split_alchemy_code(set_code)
+
+        params = self._gen_set_cards_params(set_code, order)
+        logging.info(f"Fetching card data for set: {set_code}")
+        responses = self.get_paginated_json_response(CARD_SCRYFALL_URL, params=params)
+
+        # If fetching alchemy cards, append them to the existing data.
+        if append_alchemy:
+            params['q'] = f'e%3AY{set_code}'
+            responses += self.get_paginated_json_response(CARD_SCRYFALL_URL, params=params)
+
+        return self._extract_card_data(responses)
+
     def get_set_cards(self, set_code: str) -> list[dict[str, Any]]:
         """
         Gets the cards from a given set, in the 'set' order (based on card number).
@@ -112,17 +186,19 @@ class RequestScryfall(Requester):
         # Attempt to get information on the card.
         logging.info(f"Fetching data for card: {name}")
         response = self.get_json_response(FUZZY_SCRYFALL_URL, params)
+        return self._check_card_response(name, response)
 
-        # If the response is not None, but not a card, do some processing and return the struct with some information.
-        if response is not None and response['object'] != 'card':
-            logging.verbose(f"A non-card was returned for {name}")
-            # If the response type is an error, use that as the message.
-            if response['details'][:20] == 'Too many cards match':
-                response['err_msg'] = f'Error: Multiple card matches for "{name}"'
-            else:
-                response['err_msg'] = f'Error: Cannot find card "{name}"'
-
-        return response
+    def get_cards_by_names(self, names: list[str]) -> tuple[list[dict[str, Any]], list[str]]:
+        """
+        Gets card data from scryfall for many names at once, using the collection endpoint.
+        Up to 75 cards are fetched per request, but names must be exact, so there is no spelling correction.
+        :param names: The exact names of the cards.
+        :return: A list of card json objects, and a list of names which weren't found.
+        """
+        logging.info(f"Fetching data for {len(names)} cards.")
+        batches = self._gen_collection_batches(names)
+        responses = [self.get_json_response(COLLECTION_SCRYFALL_URL, payload=batch) for batch in batches]
+        return self._extract_collection_data(responses, names)
 
     # NOTE: The two functions below are expensive and slow, especially to Scryfall.
     #  They should be called only as required.
@@ -141,8 +217,24 @@ class RequestScryfall(Requester):
     def get_bulk_data(self) -> list[dict[str, Any]]:
         """
         Gets all cards which are stored on Scryfall.
+        NOTE: This holds the entire file in memory. Use `download_bulk_data` to write it to disk instead.
         :return: A list of card json objects.
         """
         logging.info(f"Fetching bulk data...")
         response = self.get_json_response(BULK_SCRYFALL_URL)
         return self.get_json_response(response['download_uri'])
+
+    def download_bulk_data(self, folder: str, filename: str) -> bool:
+        """
+        Downloads all cards which are stored on Scryfall straight to a file, without holding them in memory.
+        The cards can then be read one at a time with `iter_json_array`.
+        :param folder: The folder to save the file in.
+        :param filename: The name of the file to save.
+        :return: Whether the download was successful.
+        """
+        logging.info(f"Downloading bulk data...")
+        response = self.get_json_response(BULK_SCRYFALL_URL)
+        if response is None or 'download_uri' not in response:
+            logging.error(f"Failed to find the bulk data download.")
+            return False
+        return self.download_file(response['download_uri'], folder, filename)
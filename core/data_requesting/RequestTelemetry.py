@@ -0,0 +1,206 @@
+"""
+Records how requests to each endpoint behave, so slow fetches can be traced to the network, retries or the cache.
+"""
+
+from __future__ import annotations
+from typing import Optional, Any
+from urllib.parse import urlsplit
+from bisect import bisect_left
+from threading import Lock
+import json
+
+from core.utilities import save_json_file
+
+from core.data_requesting.utils import LATENCY_BUCKETS
+from core.data_requesting.SessionManager import SessionManager
+
+
+class EndpointStats:
+    """ Counters and a latency histogram for the requests made to a single endpoint. """
+    def __init__(self):
+        self.requests: int = 0
+        self.errors: int = 0
+        self.status_codes: dict[int, int] = dict()
+        self.bytes: int = 0
+        self.latency_total: float = 0.0
+        self.latency_max: float = 0.0
+        # One bucket per bound in LATENCY_BUCKETS, plus one for anything slower.
+        self.latency_buckets: list[int] = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.retries: int = 0
+        self.retry_sleep: float = 0.0
+        self.rate_limit_wait: float = 0.0
+        self.cache_hits: int = 0
+        self.cache_misses: int = 0
+
+    def add_latency(self, seconds: float) -> None:
+        """
+        Adds the time taken by a request to the totals and histogram.
+        :param seconds: The time the request took.
+        """
+        self.latency_total += seconds
+        self.latency_max = max(self.latency_max, seconds)
+        self.latency_buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Summarises the stats as a json-friendly dictionary.
+        :return: The stats for the endpoint.
+        """
+        attempts = self.requests + self.errors
+        buckets = [f'<={bound}s' for bound in LATENCY_BUCKETS] + [f'>{LATENCY_BUCKETS[-1]}s']
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'status_codes': {str(code): cnt for code, cnt in sorted(self.status_codes.items())},
+            'bytes': self.bytes,
+            'latency': {
+                'total': round(self.latency_total, 4),
+                'mean': round(self.latency_total / attempts, 4) if attempts else None,
+                'max': round(self.latency_max, 4),
+                'histogram': dict(zip(buckets, self.latency_buckets)),
+            },
+            'retries': self.retries,
+            'slept': {
+                'total': round(self.retry_sleep + self.rate_limit_wait, 4),
+                'retry': round(self.retry_sleep, 4),
+                'rate_limit': round(self.rate_limit_wait, 4),
+            },
+            'cache': {
+                'hits': self.cache_hits,
+                'misses': self.cache_misses,
+            },
+        }
+
+
+class RequestTelemetry:
+    """
+    A global repository of per-endpoint request stats, shared by every Requester in the process. An endpoint is the
+    host and path of a url, so requests which only differ by their parameters are counted together.
+
+    Stats are kept for the life of the process, and can be queried with `get_stats`, or written out with `dump`.
+    """
+    ENDPOINTS: dict[str, EndpointStats] = dict()
+    ENABLED: bool = True
+    _LOCK: Lock = Lock()
+
+    @staticmethod
+    def get_endpoint(url: str) -> str:
+        """
+        Gets the endpoint a url points to, which is used to key the stats.
+        :param url: The url which was requested.
+        :return: The host and path of the url.
+        """
+        return SessionManager.get_host(url) + urlsplit(url).path
+
+    @classmethod
+    def _record(cls, url: str, **kwargs) -> None:
+        """
+        Adds to the stats of the endpoint for a url, creating them if needed.
+        :param url: The url which was requested.
+        :param kwargs: The amounts to add to each stat.
+        """
+        if not cls.ENABLED:
+            return
+
+        endpoint = cls.get_endpoint(url)
+        with cls._LOCK:
+            stats = cls.ENDPOINTS.get(endpoint)
+            if stats is None:
+                stats = cls.ENDPOINTS[endpoint] = EndpointStats()
+
+            for attr, value in kwargs.items():
+                if attr == 'latency':
+                    stats.add_latency(value)
+                elif attr == 'status_code':
+                    stats.status_codes[value] = stats.status_codes.get(value, 0) + 1
+                else:
+                    setattr(stats, attr, getattr(stats, attr) + value)
+
+    @classmethod
+    def record_response(cls, url: str, latency: float, status_code: int, size: int) -> None:
+        """
+        Records a request which got a response from the server.
+        :param url: The url which was requested.
+        :param latency: The time taken to get the response, in seconds.
+        :param status_code: The status code of the response.
+        :param size: The size of the response body, in bytes.
+        """
+        cls._record(url, requests=1, latency=latency, status_code=status_code, bytes=size)
+
+    @classmethod
+    def record_error(cls, url: str, latency: float) -> None:
+        """
+        Records a request which failed without getting a response, eg. from a connection error.
+        :param url: The url which was requested.
+        :param latency: The time taken before the request failed, in seconds.
+        """
+        cls._record(url, errors=1, latency=latency)
+
+    @classmethod
+    def record_retry(cls, url: str, delay: float) -> None:
+        """
+        Records a failed request being retried.
+        :param url: The url which was requested.
+        :param delay: The time waited before retrying, in seconds.
+        """
+        cls._record(url, retries=1, retry_sleep=delay)
+
+    @classmethod
+    def record_rate_limit(cls, url: str, waited: float) -> None:
+        """
+        Records the time spent waiting on the host's rate limiter.
+        :param url: The url which was requested.
+        :param waited: The time waited, in seconds.
+        """
+        if waited > 0:
+            cls._record(url, rate_limit_wait=waited)
+
+    @classmethod
+    def record_cache(cls, url: str, hit: bool) -> None:
+        """
+        Records whether a cached response could be used for a request.
+        :param url: The url which was requested.
+        :param hit: Whether the cached response was used.
+        """
+        if hit:
+            cls._record(url, cache_hits=1)
+        else:
+            cls._record(url, cache_misses=1)
+
+    @classmethod
+    def get_stats(cls, url: Optional[str] = None) -> dict[str, Any]:
+        """
+        Gets the stats recorded so far.
+        :param url: A url to get the stats of its endpoint. Default: None, which gets stats for every endpoint.
+        :return: A dictionary of endpoints and their stats, or the stats of a single endpoint if a url was given.
+        """
+        with cls._LOCK:
+            if url is not None:
+                stats = cls.ENDPOINTS.get(cls.get_endpoint(url))
+                return EndpointStats().to_dict() if stats is None else stats.to_dict()
+            return {endpoint: stats.to_dict() for endpoint, stats in sorted(cls.ENDPOINTS.items())}
+
+    @classmethod
+    def to_json(cls, indent: Optional[int] = 4) -> str:
+        """
+        Gets the stats for every endpoint as a json string.
+        :param indent: The indent to use. Default: 4
+        :return: The stats as json.
+        """
+        return json.dumps(cls.get_stats(), indent=indent)
+
+    @classmethod
+    def dump(cls, folder: str, filename: str) -> bool:
+        """
+        Saves the stats for every endpoint to a json file.
+        :param folder: The folder to save the file in.
+        :param filename: The name of the file.
+        :return: Whether the file was saved.
+        """
+        return save_json_file(folder, filename, cls.get_stats())
+
+    @classmethod
+    def reset(cls) -> None:
+        """ Clears the stats for every endpoint. """
+        with cls._LOCK:
+            cls.ENDPOINTS.clear()
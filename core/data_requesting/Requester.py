@@ -2,23 +2,38 @@
 Helps to handle getting data from url end points, with some configurable options about timing.
 """
 from json import JSONDecodeError
-from typing import Optional, Union, Any
-from time import sleep
-from requests import Response, get
+import json
+from typing import Optional, Union, Any, Hashable
+from time import sleep, perf_counter
+import os
+import tempfile
+from requests import Response
 
 from core.utilities import logging
 
-from core.data_requesting.utils import TRIES, FAIL_DELAY, SUCCESS_DELAY
+from core.data_requesting.utils import TRIES, FAIL_DELAY, SUCCESS_DELAY, DOWNLOAD_CHUNK_SIZE
+from core.data_requesting.SessionManager import SessionManager
+from core.data_requesting.RateLimiter import RateLimiter
+from core.data_requesting.RetryPolicy import RetryPolicy
+from core.data_requesting.ResponseCache import ResponseCache
+from core.data_requesting.SingleFlight import SingleFlight
+from core.data_requesting.RequestTelemetry import RequestTelemetry
 
 
 class Requester:
     """ Helps to handle getting data from url end points, with some configurable options about timing. """
+    # Identical requests made at the same time, by any Requester, share a single round trip.
+    #  Only the response is shared, and each caller decodes its own json, since callers change it in place.
+    _RESPONSE_FLIGHTS: SingleFlight = SingleFlight()
+
     def __init__(self, tries: int = None, fail_delay: float = None, success_delay: float = None,
-                 valid_codes: list[int] = None):
+                 valid_codes: list[int] = None, retry_policy: RetryPolicy = None, cache: ResponseCache = None):
         self._TRIES: int = tries or TRIES
         self._FAIL_DELAY: float = fail_delay or FAIL_DELAY
         self._SUCCESS_DELAY: float = success_delay or SUCCESS_DELAY
         self.valid_responses: list[int] = valid_codes or [200]
+        self._RETRY_POLICY: RetryPolicy = retry_policy or RetryPolicy(max_delay=self._FAIL_DELAY)
+        self._CACHE: Optional[ResponseCache] = cache
 
     @staticmethod
     def _gen_url(url: str, params: dict[str, Any] = None) -> str:
@@ -34,81 +49,276 @@ class Requester:
             composed_url = url + '?' + '&'.join([f"{k}={v}" for k, v in params.items() if v is not None])
         return composed_url
 
-    def request(self, url) -> Optional[Response]:
+    def _resolve_cached(self, url: str, response: Response, cached: Optional[Response], cacheable: bool = True) \
+            -> tuple[Response, bool]:
         """
-        Attempts to get a Response from the given URL, and returns it if it has a valid response code.
+        Resolves a response against the cache, using the cached copy if the data hasn't changed.
+        :param url: The url the response is for.
+        :param response: The response received from the server.
+        :param cached: The cached response for the url, if one was used to make a conditional request.
+        :param cacheable: Whether the response can be stored in the cache. Default: True
+        :return: The Response to use, and whether it should be stored in the cache.
+        """
+        hit = response.status_code == 304 and cached is not None
+        if self._CACHE is not None and cacheable:
+            RequestTelemetry.record_cache(url, hit)
+        if hit:
+            logging.debug(f"Data for '{url}' not modified. Using cached response.")
+            return cached, False
+        return response, self._CACHE is not None and cacheable and response.status_code in self.valid_responses
+
+    def _check_response(self, url: str, response: Response) -> tuple[Optional[Response], Response]:
+        """
+        Checks that a response has a valid response code.
+        :param url: The url the response is for.
+        :param response: The response to check.
+        :return: The Response if it has a valid response code or None, and the raw Response.
+        """
+        # If the response is not in one of the valid response codes return None,
+        #  to denote we failed to get the data. We use a list of response codes,
+        #  since different sites contain useful information on different response codes.
+        #  Eg. Scryfall's 404 can be returned if a card has too many matches (like 'Bolt').
+        if response.status_code not in self.valid_responses:
+            logging.debug(f'Response did not contain a valid status code. ({response.status_code})')
+            return None, response
+
+        logging.debug(f"Successfully got response from '{url}'.")
+        return response, response
+
+    def _attempt(self, url, payload: Any = None) -> tuple[Optional[Response], Optional[Response]]:
+        """
+        Makes a single attempt to get a Response from the given URL.
         :param url: The url to get data from.
-        :return: A Response or None.
+        :param payload: An object to send as json in a POST request. Default: None, which sends a GET request.
+        :return: The Response if it has a valid response code or None, and the raw Response or None if the
+        connection failed. The raw Response is used to decide if and when to retry.
         """
+        start = perf_counter()
         try:
-            # Try to get the data from the URL.
+            # Wait for the host's shared rate limiter to allow another request.
+            waited = RateLimiter.get_limiter(url).acquire()
+            if waited > 0:
+                logging.debug(f"Waited {waited:.2f} seconds for rate limit.")
+                RequestTelemetry.record_rate_limit(url, waited)
+
+            # If a copy of the data is cached, ask the server to only send it again if it has changed.
+            #  POST requests aren't cached, as their response depends on the payload, not just the url.
+            cached = self._CACHE.load(url) if self._CACHE is not None and payload is None else None
+            headers = ResponseCache.get_validators(cached)
+
+            # Try to get the data from the URL, using the shared session for the host to re-use connections.
             logging.debug(f"Attempting to get data from '{url}'.")
-            response = get(url)
-
-            # If the response is not in one of the valid response codes return None,
-            #  to denote we failed to get the data. We use a list of response codes,
-            #  since different sites contain useful information on different response codes.
-            #  Eg. Scryfall's 404 can be returned if a card has too many matches (like 'Bolt').
-            if response.status_code not in self.valid_responses:
-                logging.debug(f'Response did not contain a valid status code. ({response.status_code})')
-                return None
+            start = perf_counter()
+            if payload is None:
+                response = SessionManager.get_session(url).get(url, headers=headers)
+            else:
+                response = SessionManager.get_session(url).post(url, json=payload)
+            RequestTelemetry.record_response(url, perf_counter() - start, response.status_code, len(response.content))
+            response, store = self._resolve_cached(url, response, cached, payload is None)
+            if store:
+                self._CACHE.store(url, response)
+            response, raw = self._check_response(url, response)
 
-            # Otherwise, getting the data was a success, so wait and return it.
-            logging.debug(f"Successfully got response from '{url}'.")
-            sleep(self._SUCCESS_DELAY)
-            return response
+            # If getting the data was a success, wait any extra time requested.
+            if response is not None and self._SUCCESS_DELAY:
+                sleep(self._SUCCESS_DELAY)
+            return response, raw
         except Exception as ex:
             # On an failure to connect to the URL, return None.
             logging.error(f'Encountered unexpected error: {ex}')
+            RequestTelemetry.record_error(url, perf_counter() - start)
+            return None, None
+
+    def _get_retry_delay(self, url: str, cnt: int, raw: Optional[Response]) -> Optional[float]:
+        """
+        Decides whether a failed attempt should be retried, and how long to wait first.
+        :param url: The url which was requested.
+        :param cnt: The number of attempts made so far.
+        :param raw: The raw Response of the failed attempt, or None if the connection failed.
+        :return: The number of seconds to wait, or None if no more attempts should be made.
+        """
+        # Hard failures (eg. a 404) will fail the same way again, so don't waste time retrying them.
+        status = None if raw is None else raw.status_code
+        if not self._RETRY_POLICY.should_retry(status):
+            logging.warning(f'Failed to get data, with a status code which will not be retried. ({status})')
             return None
 
-    def get_response(self, url: str, params: dict[str, str] = None) -> Optional[Response]:
+        # If it isn't the last try, back off and try again.
+        if cnt >= self._TRIES:
+            return None
+        delay = self._RETRY_POLICY.get_delay(cnt, raw)
+        logging.warning(f'Failed to get data. Trying again in {delay:.1f} seconds.')
+        RequestTelemetry.record_retry(url, delay)
+        return delay
+
+    def _get_flight_key(self, composed_url: str, payload: Any = None) -> Hashable:
         """
-        Attempts to get a response from a url, within a given number of tries.
+        Gets the key which identifies identical requests, so they can share a single round trip.
+        Requests are only identical if they'd accept the same responses, and send the same payload.
+        :param composed_url: The url, including its parameters.
+        :param payload: The object to send as json in a POST request, if any.
+        :return: A hashable key.
+        """
+        body = None if payload is None else json.dumps(payload, sort_keys=True)
+        return tuple(self.valid_responses), composed_url, body
+
+    @staticmethod
+    def _parse_json(url: str, response: Optional[Response]) -> Optional[Union[list, dict]]:
+        """
+        Decodes the JSON of a response.
+        :param url: The url the response is for.
+        :param response: The response to decode.
+        :return: A json object, or None if there's no response or it can't be parsed.
+        """
+        # Short-circuit if there's no response.
+        if response is None:
+            return None
+
+        # Attempt to return the decode the response's JSON, defaulting to None if it can't be parsed.
+        try:
+            return response.json()
+        except JSONDecodeError:
+            logging.error(f'Failed to parse JSON for url: {url}')
+            logging.error(response)
+            return None
+
+    def request(self, url) -> Optional[Response]:
+        """
+        Attempts to get a Response from the given URL, and returns it if it has a valid response code.
         :param url: The url to get data from.
-        :param params: A dictionary of parameters to include in the url.
         :return: A Response or None.
         """
-        # Get the url to query based on the parameters.
-        composed_url = self._gen_url(url, params)
+        return self._attempt(url)[0]
 
+    def _get_response(self, composed_url: str, payload: Any = None) -> Optional[Response]:
+        """
+        Attempts to get a response from a url, within a given number of tries.
+        :param composed_url: The url to get data from, including its parameters.
+        :param payload: An object to send as json in a POST request. Default: None, which sends a GET request.
+        :return: A Response or None.
+        """
         # Try to get the data the number of time prescribed, returning it whenever it's not None.
-        #  If it can't be gotten in under the number of tries allowed, break the loop,
-        #  log an error, and return None.
+        #  If it can't be gotten in under the number of tries allowed, or the failure is one that
+        #  retrying won't fix, break the loop, log an error, and return None.
+        cnt = 0
         for cnt in range(1, self._TRIES + 1):
-            response = self.request(composed_url)
+            response, raw = self._attempt(composed_url, payload)
             if response is not None:
                 return response
 
-            # If it isn't the last try, wait and try again.
-            if cnt < self._TRIES:
-                logging.warning(f'Failed to get data. Trying again in {self._FAIL_DELAY} seconds.')
-                sleep(self._FAIL_DELAY)
+            delay = self._get_retry_delay(composed_url, cnt, raw)
+            if delay is None:
+                break
+            sleep(delay)
 
         # Logging any failure to get data, and returning None.
-        logging.error(f'Failed to get data after {self._TRIES} attempts.')
+        logging.error(f'Failed to get data after {cnt} attempts.')
         logging.error(f'Failed URL: {composed_url}')
         return None
 
-    def get_json_response(self, url: str, params: dict[str, str] = None) -> Optional[Union[list, dict]]:
+    def get_response(self, url: str, params: dict[str, str] = None, payload: Any = None) -> Optional[Response]:
+        """
+        Attempts to get a response from a url, within a given number of tries.
+        If an identical request is already in flight, its response is shared instead.
+        :param url: The url to get data from.
+        :param params: A dictionary of parameters to include in the url.
+        :param payload: An object to send as json in a POST request. Default: None, which sends a GET request.
+        :return: A Response or None.
+        """
+        # Get the url to query based on the parameters.
+        composed_url = self._gen_url(url, params)
+        key = self._get_flight_key(composed_url, payload)
+        return self._RESPONSE_FLIGHTS.do(key, lambda: self._get_response(composed_url, payload))
+
+    def get_json_response(self, url: str, params: dict[str, str] = None, payload: Any = None) \
+            -> Optional[Union[list, dict]]:
         """
         Attempts to get json data from a url, within a given number of tries.
+        If an identical request is already in flight, its response is shared, but each caller gets its own json.
         :param url: The url to get data from.
         :param params: A dictionary of parameters to include in the url.
+        :param payload: An object to send as json in a POST request. Default: None, which sends a GET request.
         :return: A json object or None.
         """
-        # Get the response, short-circuiting if it's None.
-        response = self.get_response(url, params)
-        if response is None:
-            return None
+        return self._parse_json(url, self.get_response(url, params, payload))
 
-        # Attempt to return the decode the response's JSON, defaulting to None if it can't be parsed.
+    def _attempt_download(self, url: str, filepath: str, chunk_size: int) -> tuple[bool, Optional[Response]]:
+        """
+        Makes a single attempt to stream the contents of a url to a file.
+        :param url: The url to download.
+        :param filepath: The path of the file to write to.
+        :param chunk_size: The number of bytes to write at a time.
+        :return: Whether the download succeeded, and the raw Response or None if the connection failed.
+        """
+        tmp_path = None
+        start = perf_counter()
         try:
-            return response.json()
-        except JSONDecodeError:
-            logging.error(f'Failed to parse JSON for url: {url}')
-            logging.error(response)
-            return None
+            # Wait for the host's shared rate limiter to allow another request.
+            waited = RateLimiter.get_limiter(url).acquire()
+            if waited > 0:
+                logging.debug(f"Waited {waited:.2f} seconds for rate limit.")
+                RequestTelemetry.record_rate_limit(url, waited)
+
+            logging.debug(f"Attempting to download '{url}'.")
+            start = perf_counter()
+            with SessionManager.get_session(url).get(url, stream=True) as response:
+                # Only a successful response has the file as its body.
+                if not 200 <= response.status_code < 300:
+                    logging.debug(f'Download did not return a success status code. ({response.status_code})')
+                    RequestTelemetry.record_response(url, perf_counter() - start, response.status_code, 0)
+                    return False, response
+
+                # Write the body to a temporary file in chunks, so the whole file is never held in memory.
+                size = 0
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(filepath), suffix='.tmp')
+                with os.fdopen(fd, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size):
+                        size += f.write(chunk)
+                RequestTelemetry.record_response(url, perf_counter() - start, response.status_code, size)
+
+            # Only replace the existing file once the download is complete.
+            os.replace(tmp_path, filepath)
+            logging.debug(f"Successfully downloaded '{url}'.")
+            return True, response
+        except Exception as ex:
+            # On an failure to download the file, clean up any partial download.
+            logging.error(f'Encountered unexpected error: {ex}')
+            RequestTelemetry.record_error(url, perf_counter() - start)
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False, None
+
+    def download_file(self, url: str, folder: str, filename: str, params: dict[str, str] = None,
+                      chunk_size: int = None) -> bool:
+        """
+        Attempts to download the contents of a url straight to a file, within a given number of tries.
+        The existing file is only replaced once the download is complete.
+        :param url: The url to download.
+        :param folder: The folder to save the file in.
+        :param filename: The name of the file to save.
+        :param params: A dictionary of parameters to include in the url.
+        :param chunk_size: The number of bytes to write at a time. Default: DOWNLOAD_CHUNK_SIZE
+        :return: Whether the download was successful.
+        """
+        composed_url = self._gen_url(url, params)
+        filepath = os.path.join(folder, filename)
+        os.makedirs(folder, exist_ok=True)
+
+        cnt = 0
+        for cnt in range(1, self._TRIES + 1):
+            success, raw = self._attempt_download(composed_url, filepath, chunk_size or DOWNLOAD_CHUNK_SIZE)
+            if success:
+                return True
+
+            delay = self._get_retry_delay(composed_url, cnt, raw)
+            if delay is None:
+                break
+            sleep(delay)
+
+        # Logging any failure to get data, and returning False.
+        logging.error(f'Failed to download file after {cnt} attempts.')
+        logging.error(f'Failed URL: {composed_url}')
+        return False
 
     # TODO: Handle pagination more generically, instead of relying on JSON to exist.
     def get_paginated_response(self, url: str, params: dict[str, str] = None,
@@ -0,0 +1,190 @@
+"""
+A persistent, on-disk cache of responses, which allows requests to be revalidated instead of re-downloaded.
+"""
+
+from typing import Optional
+from hashlib import sha1
+import json
+import os
+import tempfile
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+
+from core.utilities import logging
+
+
+class ResponseCache:
+    """
+    Stores the body of responses alongside their validators ('ETag' and 'Last-Modified'). When a url is requested again,
+    the validators are sent with the request, and if the server replies '304 Not Modified', the stored body is used
+    instead of downloading it all over again.
+
+    Each url is stored as two files, named by the hash of the full url; the body, and a small json file with the
+    validators and headers. Both are written atomically, so a crash mid-write never leaves a broken entry behind.
+    Urls which differ in any way, even by one parameter, never share an entry, as the server would judge the
+    validators of one url against the data of another.
+
+    The cache can be given a size limit, in which case the least recently used entries are removed whenever a new one
+    takes it over the limit.
+    """
+    # Headers which describe how the body was sent, rather than the body itself, so are not stored.
+    _TRANSPORT_HEADERS: set[str] = {'content-encoding', 'content-length', 'transfer-encoding',
+                                    'connection', 'keep-alive'}
+
+    _ENTRY_EXTENSIONS: tuple[str, str] = ('.json', '.body')
+
+    def __init__(self, cache_dir: str, max_bytes: int = None):
+        """
+        :param cache_dir: The folder to store responses in.
+        :param max_bytes: The most space the stored responses can take up. Default: None, which has no limit.
+        """
+        self.CACHE_DIR: str = cache_dir
+        self.MAX_BYTES: Optional[int] = max_bytes
+
+    def _get_paths(self, url: str) -> tuple[str, str]:
+        """
+        Gets the paths of the files which store the response for a url.
+        :param url: The url to get the paths for.
+        :return: The path to the metadata file, and the path to the body file.
+        """
+        name = sha1(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.CACHE_DIR, name + '.json'), os.path.join(self.CACHE_DIR, name + '.body')
+
+    def _write_atomic(self, path: str, data: bytes) -> None:
+        """
+        Writes data to a temporary file, and then moves it into place, so the file is always complete.
+        :param path: The file to write to.
+        :param data: The data to write.
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=self.CACHE_DIR, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    @staticmethod
+    def get_validators(response: Optional[Response]) -> dict[str, str]:
+        """
+        Gets the headers needed to make a conditional request, based on a previous response.
+        :param response: A previously cached response.
+        :return: A dictionary of headers, which is empty if the response can't be revalidated.
+        """
+        headers = dict()
+        if response is None:
+            return headers
+        if 'ETag' in response.headers:
+            headers['If-None-Match'] = response.headers['ETag']
+        if 'Last-Modified' in response.headers:
+            headers['If-Modified-Since'] = response.headers['Last-Modified']
+        return headers
+
+    def load(self, url: str) -> Optional[Response]:
+        """
+        Rebuilds the stored response for a url.
+        :param url: The url to get the response for.
+        :return: The cached Response, or None if the url isn't cached.
+        """
+        meta_path, body_path = self._get_paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+
+        # Only trust the body if it is the one the metadata was written for.
+        if len(body) != meta['size']:
+            logging.debug(f"Cached body for '{url}' does not match its metadata.")
+            return None
+
+        # Mark the entry as used, so it's kept over those which haven't been used for longer.
+        try:
+            os.utime(meta_path)
+        except OSError:
+            pass
+
+        response = Response()
+        response.status_code = meta['status_code']
+        response.url = url
+        response.headers = CaseInsensitiveDict(meta['headers'])
+        response.encoding = meta['encoding']
+        response._content = body
+        return response
+
+    def store(self, url: str, response: Response) -> bool:
+        """
+        Saves a response, so it can be revalidated later. Responses without validators are skipped, as they would
+        have to be re-downloaded anyway.
+        :param url: The url which was requested.
+        :param response: The response to store.
+        :return: Whether the response was stored.
+        """
+        if not self.get_validators(response):
+            return False
+
+        meta = {
+            'url': url,
+            'status_code': response.status_code,
+            'encoding': response.encoding,
+            'size': len(response.content),
+            'headers': {k: v for k, v in response.headers.items() if k.lower() not in self._TRANSPORT_HEADERS},
+        }
+
+        # The body is written first, so the metadata never points to a body which doesn't exist yet.
+        meta_path, body_path = self._get_paths(url)
+        try:
+            os.makedirs(self.CACHE_DIR, exist_ok=True)
+            self._write_atomic(body_path, response.content)
+            self._write_atomic(meta_path, json.dumps(meta).encode('utf-8'))
+        except OSError as ex:
+            logging.warning(f"Failed to cache response for '{url}': {ex}")
+            return False
+        self._evict()
+        return True
+
+    def _evict(self) -> None:
+        """
+        Removes the least recently used entries until the cache fits within MAX_BYTES.
+        An entry was last used when its metadata file was last written or loaded.
+        """
+        if self.MAX_BYTES is None:
+            return
+
+        # Total up the size of each entry, and when it was last used.
+        entries: dict[str, list[int]] = dict()
+        for file in os.listdir(self.CACHE_DIR):
+            name, ext = os.path.splitext(file)
+            if ext not in self._ENTRY_EXTENSIONS:
+                continue
+            try:
+                stat = os.stat(os.path.join(self.CACHE_DIR, file))
+            except OSError:
+                continue
+            entry = entries.setdefault(name, [0, 0])
+            entry[0] += stat.st_size
+            if ext == '.json':
+                entry[1] = stat.st_mtime_ns
+
+        total = sum(size for size, _ in entries.values())
+        for name, (size, _) in sorted(entries.items(), key=lambda item: item[1][1]):
+            if total <= self.MAX_BYTES:
+                break
+            for ext in self._ENTRY_EXTENSIONS:
+                try:
+                    os.remove(os.path.join(self.CACHE_DIR, name + ext))
+                except FileNotFoundError:
+                    pass
+            total -= size
+            logging.debug(f"Removed cached response '{name}' to keep the cache under {self.MAX_BYTES} bytes.")
+
+    def clear(self) -> None:
+        """ Removes all stored responses. """
+        if not os.path.isdir(self.CACHE_DIR):
+            return
+        for file in os.listdir(self.CACHE_DIR):
+            if file.endswith(('.json', '.body', '.tmp')):
+                os.remove(os.path.join(self.CACHE_DIR, file))
@@ -0,0 +1,83 @@
+"""
+Decides whether a failed request should be tried again, and how long to wait before doing so.
+"""
+
+from typing import Optional
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import random
+from requests import Response
+
+from core.data_requesting.utils import FAIL_DELAY, BACKOFF_BASE, BACKOFF_MULTIPLIER, BACKOFF_JITTER, RETRY_CODES
+
+
+class RetryPolicy:
+    """
+    Decides whether a failed request should be tried again, and how long to wait before doing so.
+    Waits grow exponentially with each attempt, up to a cap, with some jitter so that requests which failed together
+    don't all retry at the same moment. If the server says how long to wait with 'Retry-After', that is used instead,
+    up to the same cap, so a server can't hold a worker for hours.
+    """
+    def __init__(self, base_delay: float = None, max_delay: float = None, multiplier: float = None,
+                 jitter: float = None, retry_codes: set[int] = None):
+        self.BASE_DELAY: float = base_delay if base_delay is not None else BACKOFF_BASE
+        self.MAX_DELAY: float = max_delay if max_delay is not None else FAIL_DELAY
+        self.MULTIPLIER: float = multiplier if multiplier is not None else BACKOFF_MULTIPLIER
+        self.JITTER: float = jitter if jitter is not None else BACKOFF_JITTER
+        self.RETRY_CODES: set[int] = retry_codes if retry_codes is not None else RETRY_CODES
+
+        if not 0 <= self.JITTER <= 1:
+            raise ValueError("`jitter` must be between 0 and 1.")
+
+    def should_retry(self, status_code: Optional[int]) -> bool:
+        """
+        Checks if a request is worth trying again. Connection errors and temporary failures (eg. 429 or 503)
+        are retried, while anything else (eg. 404) will fail the same way again, so fails fast.
+        :param status_code: The status code of the failed response. None if no response was received.
+        :return: Whether to retry the request.
+        """
+        return status_code is None or status_code in self.RETRY_CODES
+
+    @staticmethod
+    def parse_retry_after(response: Optional[Response]) -> Optional[float]:
+        """
+        Gets the number of seconds a server asked to wait for, from the 'Retry-After' header.
+        :param response: The failed response.
+        :return: The number of seconds to wait, or None if the header is missing or can't be parsed.
+        """
+        if response is None:
+            return None
+
+        retry_after = response.headers.get('Retry-After')
+        if retry_after is None:
+            return None
+
+        # The header can either be a number of seconds, or a date to wait until.
+        try:
+            return max(float(retry_after), 0.0)
+        except ValueError:
+            pass
+
+        try:
+            retry_time = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return None
+        if retry_time.tzinfo is None:
+            retry_time = retry_time.replace(tzinfo=timezone.utc)
+        return max((retry_time - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+    def get_delay(self, attempt: int, response: Optional[Response] = None) -> float:
+        """
+        Gets how long to wait before the next attempt.
+        :param attempt: The number of attempts made so far, starting at 1.
+        :param response: The failed response, if one was received.
+        :return: The number of seconds to wait.
+        """
+        # Respect the server's request, as retrying sooner will just fail again, but never wait longer than the cap.
+        retry_after = self.parse_retry_after(response)
+        if retry_after is not None:
+            return min(self.MAX_DELAY, retry_after)
+
+        # Otherwise, back off exponentially, removing a random part of the wait.
+        delay = min(self.MAX_DELAY, self.BASE_DELAY * (self.MULTIPLIER ** (attempt - 1)))
+        return delay - random.uniform(0, delay * self.JITTER)
@@ -0,0 +1,134 @@
+"""
+Keeps a pool of keep-alive sessions, one per host, which are shared by every Requester.
+
+Re-using sessions means connections to 17Lands and Scryfall are kept open between requests,
+skipping the TCP/TLS handshake for all but the first request on each connection.
+"""
+
+from typing import Any
+from urllib.parse import urlsplit
+from threading import Lock
+import atexit
+from requests import Session, Response
+from requests.adapters import HTTPAdapter
+
+from core.utilities import logging
+
+from core.data_requesting.utils import POOL_CONNECTIONS, POOL_MAXSIZE
+
+
+class _TrackedAdapter(HTTPAdapter):
+    """ An HTTPAdapter which counts how many requests are sent over each pooled connection. """
+    def __init__(self, pool_connections: int, pool_maxsize: int):
+        self._lock: Lock = Lock()
+        self.connection_uses: dict[int, int] = dict()
+        super().__init__(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+
+    def send(self, request, **kwargs) -> Response:
+        response = super().send(request, **kwargs)
+
+        # The underlying connection stays attached to the raw response until its content is read,
+        #  so it can be used to identify which connection from the pool handled the request.
+        conn = getattr(response.raw, '_connection', None)
+        if conn is not None:
+            with self._lock:
+                self.connection_uses[id(conn)] = self.connection_uses.get(id(conn), 0) + 1
+        return response
+
+
+class SessionManager:
+    """
+    SessionManager acts as a global repository for HTTP sessions. A session is created for each host the first time
+    a url for it is requested, and then shared between all Requesters so their connections can be re-used.
+    Sessions are closed automatically when the interpreter exits.
+    """
+    SESSIONS: dict[str, Session] = dict()
+    _ADAPTERS: dict[str, _TrackedAdapter] = dict()
+    _LOCK: Lock = Lock()
+
+    POOL_CONNECTIONS: int = POOL_CONNECTIONS
+    POOL_MAXSIZE: int = POOL_MAXSIZE
+
+    @staticmethod
+    def get_host(url: str) -> str:
+        """
+        Gets the host a url points to, which is used to key the sessions.
+        :param url: The url to get the host of.
+        :return: The host, in lowercase.
+        """
+        return urlsplit(url).netloc.lower()
+
+    @classmethod
+    def get_session(cls, url: str) -> Session:
+        """
+        Returns the session for the host of the url, creating one if none exists.
+        :param url: The url which is going to be requested.
+        :return: A Session with a connection pool for the host.
+        """
+        host = cls.get_host(url)
+        with cls._LOCK:
+            if host not in cls.SESSIONS:
+                logging.debug(f"Creating new session for '{host}'.")
+                adapter = _TrackedAdapter(cls.POOL_CONNECTIONS, cls.POOL_MAXSIZE)
+                session = Session()
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                cls._ADAPTERS[host] = adapter
+                cls.SESSIONS[host] = session
+            return cls.SESSIONS[host]
+
+    @classmethod
+    def configure(cls, pool_connections: int = None, pool_maxsize: int = None) -> None:
+        """
+        Changes the size of the connection pools. Existing sessions are closed, so new sizes take effect.
+        :param pool_connections: The number of connection pools to cache per session. Default: POOL_CONNECTIONS
+        :param pool_maxsize: The maximum number of connections to keep alive per pool. Default: POOL_MAXSIZE
+        """
+        cls.close_all()
+        cls.POOL_CONNECTIONS = pool_connections or POOL_CONNECTIONS
+        cls.POOL_MAXSIZE = pool_maxsize or POOL_MAXSIZE
+
+    @classmethod
+    def get_stats(cls) -> dict[str, dict[str, Any]]:
+        """
+        Gets the connection re-use counters for each host. Each entry in 'connection_uses' is the number of requests
+        sent over one connection, so any value above one means handshakes were skipped.
+        :return: A dictionary of hosts, with the number of connections opened, requests sent, and requests which
+        re-used a connection.
+        """
+        stats = dict()
+        with cls._LOCK:
+            for host, adapter in cls._ADAPTERS.items():
+                uses = list(adapter.connection_uses.values())
+                stats[host] = {
+                    'connections': len(uses),
+                    'requests': sum(uses),
+                    'reused': sum(uses) - len(uses),
+                    'connection_uses': uses
+                }
+        return stats
+
+    @classmethod
+    def close_session(cls, url: str) -> None:
+        """
+        Closes the session for the host of the url, if one exists.
+        :param url: A url for the host whose session should be closed.
+        """
+        host = cls.get_host(url)
+        with cls._LOCK:
+            if host in cls.SESSIONS:
+                cls.SESSIONS.pop(host).close()
+                del cls._ADAPTERS[host]
+
+    @classmethod
+    def close_all(cls) -> None:
+        """ Closes all sessions, releasing their pooled connections. """
+        with cls._LOCK:
+            for session in cls.SESSIONS.values():
+                session.close()
+            cls.SESSIONS = dict()
+            cls._ADAPTERS = dict()
+
+
+# Make sure any kept-alive connections are closed cleanly when the program ends.
+atexit.register(SessionManager.close_all)
@@ -0,0 +1,93 @@
+"""
+Collapses identical requests which are in flight at the same time into a single call.
+"""
+
+from __future__ import annotations
+from typing import Any, Callable, Coroutine, Hashable, Optional, TypeVar
+from threading import Event, Lock
+import asyncio
+
+T = TypeVar('T')
+
+
+class _Call:
+    """ A call in flight, which other callers with the same key wait on. """
+    def __init__(self):
+        self.event: Event = Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Collapses identical calls made at the same time from different threads. The first caller for a key runs the
+    function, and any other callers with the same key wait for it to finish, then share its result (or exception).
+    Nothing is cached; once the call finishes, the next caller for the key runs the function again.
+    """
+    def __init__(self):
+        self._lock: Lock = Lock()
+        self._calls: dict[Hashable, _Call] = dict()
+        self.shared: int = 0
+
+    def do(self, key: Hashable, func: Callable[[], T]) -> T:
+        """
+        Runs a function, unless a call with the same key is already running, in which case its result is used.
+        :param key: The key which identifies identical calls.
+        :param func: The function to run.
+        :return: The result of the function.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.shared += 1
+
+        # If another caller is already running the function, wait for them to finish.
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as ex:
+            call.error = ex
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+
+class AsyncSingleFlight:
+    """
+    Collapses identical coroutines awaited at the same time on an event loop. The first caller for a key starts the
+    coroutine as a task, and any other callers with the same key await that same task, sharing its result.
+    Nothing is cached; once the task finishes, the next caller for the key starts a new one.
+    """
+    def __init__(self):
+        self._tasks: dict[tuple[asyncio.AbstractEventLoop, Hashable], asyncio.Task] = dict()
+        self.shared: int = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Coroutine[Any, Any, T]]) -> T:
+        """
+        Awaits a coroutine, unless one with the same key is already running, in which case its result is used.
+        :param key: The key which identifies identical calls.
+        :param func: A function which creates the coroutine to run.
+        :return: The result of the coroutine.
+        """
+        # Tasks belong to a loop, so the same key on different loops is run separately.
+        task_key = (asyncio.get_running_loop(), key)
+        task = self._tasks.get(task_key)
+        if task is not None:
+            self.shared += 1
+        else:
+            task = self._tasks[task_key] = asyncio.ensure_future(func())
+            task.add_done_callback(lambda _: self._tasks.pop(task_key, None))
+
+        # Shield the task, so one caller being cancelled doesn't cancel it for everyone else.
+        return await asyncio.shield(task)
@@ -3,17 +3,46 @@ This package query magic-related data from websites, chiefly 17Lands and Scryfal
 """
 
 from core.data_requesting.utils import *
+from core.data_requesting.SessionManager import *
+from core.data_requesting.RateLimiter import *
+from core.data_requesting.RetryPolicy import *
+from core.data_requesting.ResponseCache import *
+from core.data_requesting.SingleFlight import *
+from core.data_requesting.RequestTelemetry import *
 from core.data_requesting.Requester import *
 from core.data_requesting.Request17Lands import *
 from core.data_requesting.RequestScryfall import *
+from core.data_requesting.AsyncRequester import *
+from core.data_requesting.AsyncRequest17Lands import *
+from core.data_requesting.AsyncRequestScryfall import *
 
 from_utils = ['BASE_17L_URL', 'DEFAULT_FORMAT', 'DEFAULT_DATE']
 
+from_session_manager = ['SessionManager']
+
+from_rate_limiter = ['RateLimiter']
+
+from_retry_policy = ['RetryPolicy']
+
+from_response_cache = ['ResponseCache']
+
+from_single_flight = ['SingleFlight', 'AsyncSingleFlight']
+
+from_request_telemetry = ['RequestTelemetry']
+
 from_requester = ['Requester']
 
 from_request_17lands = ['Request17Lands']
 
 from_request_scryfall = ['RequestScryfall']
 
+from_async_requester = ['AsyncRequester']
+
+from_async_request_17lands = ['AsyncRequest17Lands']
+
+from_async_request_scryfall = ['AsyncRequestScryfall']
+
 
-__all__ = from_utils + from_requester + from_request_17lands + from_request_scryfall
+__all__ = from_utils + from_session_manager + from_rate_limiter + from_retry_policy + from_response_cache + \
+          from_single_flight + from_request_telemetry + from_requester + from_request_17lands + \
+          from_request_scryfall + from_async_requester + from_async_request_17lands + from_async_request_scryfall
@@ -9,9 +9,14 @@ from_consts = ['BASE_17L_URL', 'COLOR_17L_URL', 'EXPANSIONS_17L_URL', 'FORMATS_1
                'COLOR_RATING_17L_URL', 'CARD_RATING_17L_URL', 'CARD_EVAL_17L_URL', 'TROPHY_17L_URL',
                'DRAFT_LOG_17L_URL', 'DECK_17L_URL', 'DETAILS_17L_URL', 'TIER_17L_URL',
                'BASE_SCRYFALL_URL', 'CARD_SCRYFALL_URL', 'SET_SCRYFALL_URL',
-               'FUZZY_SCRYFALL_URL', 'BULK_SCRYFALL_URL']
+               'FUZZY_SCRYFALL_URL', 'COLLECTION_SCRYFALL_URL', 'BULK_SCRYFALL_URL']
 
-from_settings = ['TRIES', 'FAIL_DELAY', 'SUCCESS_DELAY', 'DEFAULT_FORMAT', 'DEFAULT_DATE']
+from_settings = ['TRIES', 'FAIL_DELAY', 'SUCCESS_DELAY',
+                 'BACKOFF_BASE', 'BACKOFF_MULTIPLIER', 'BACKOFF_JITTER', 'RETRY_CODES',
+                 'RATE_LIMITS', 'DEFAULT_RATE_LIMIT',
+                 'POOL_CONNECTIONS', 'POOL_MAXSIZE', 'DOWNLOAD_CHUNK_SIZE',
+                 'LATENCY_BUCKETS',
+                 'DEFAULT_FORMAT', 'DEFAULT_DATE']
 
 
 __all__ = from_consts + from_settings
@@ -21,4 +21,5 @@ BASE_SCRYFALL_URL = 'https://api.scryfall.com'
 CARD_SCRYFALL_URL = f'{BASE_SCRYFALL_URL}/cards/search'
 SET_SCRYFALL_URL = f'{BASE_SCRYFALL_URL}/sets'
 FUZZY_SCRYFALL_URL = f'{BASE_SCRYFALL_URL}/cards/named'
+COLLECTION_SCRYFALL_URL = f'{BASE_SCRYFALL_URL}/cards/collection'
 BULK_SCRYFALL_URL = f'{BASE_SCRYFALL_URL}/bulk-data/oracle-cards'
@@ -5,9 +5,43 @@ Contains configuration for how to query websites.
 from datetime import date
 
 # Web Request Defaults
+#  Pacing between requests is handled by the rate limits below, so by default
+#  there is no extra wait after a successful request. FAIL_DELAY is the longest wait between retries.
 TRIES: int = 5
 FAIL_DELAY: int = 60
-SUCCESS_DELAY: int = 3
+SUCCESS_DELAY: int = 0
+
+# Retry Defaults
+#  Failed requests are retried with exponential backoff, starting at BACKOFF_BASE seconds and multiplying by
+#  BACKOFF_MULTIPLIER each try, up to FAIL_DELAY. Up to BACKOFF_JITTER of each wait is randomly removed, so
+#  requests which failed together don't retry together. Only connection errors and the codes below are retried.
+BACKOFF_BASE: float = 1
+BACKOFF_MULTIPLIER: float = 2
+BACKOFF_JITTER: float = 0.5
+RETRY_CODES: set[int] = {408, 425, 429, 500, 502, 503, 504}
+
+# Rate Limiting Defaults
+#  Each host has a token bucket which is shared by every Requester in the process.
+#  Values are the number of requests allowed per second, and how many can be sent in a burst.
+RATE_LIMITS: dict[str, tuple[float, int]] = {
+    'api.scryfall.com': (10.0, 10),  # Scryfall asks for 50-100 milliseconds between requests.
+    'www.17lands.com': (1.0, 4),
+}
+DEFAULT_RATE_LIMIT: tuple[float, int] = (2.0, 2)
+
+# Connection Pooling Defaults
+#  Each host gets its own session, so only a couple of pools are needed per session,
+#  but each pool can keep several connections alive for concurrent requests.
+POOL_CONNECTIONS: int = 2
+POOL_MAXSIZE: int = 10
+
+# Downloading Defaults
+#  Large files are streamed to disk in chunks of this many bytes, rather than being held in memory.
+DOWNLOAD_CHUNK_SIZE: int = 2 ** 20
+
+# Telemetry Defaults
+#  The upper bounds, in seconds, of the buckets of the per-endpoint latency histograms.
+LATENCY_BUCKETS: tuple[float, ...] = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
 
 # 17Lands Querying Defaults
 DEFAULT_FORMAT: str = 'PremierDraft'
@@ -8,11 +8,14 @@ is/was active on Arena. It contains a reference to the appropriate SetMetadata.
 """
 
 from __future__ import annotations
-from typing import Optional, Union, Callable
+from typing import Optional, Union, Callable, Iterable
 from functools import cmp_to_key
+from hashlib import sha1
 from datetime import date, time, datetime, timedelta
+import numpy as np
+import pandas as pd
 
-from core.wubrg import index_dist_wubrg, COLOR_IDENTITY
+from core.wubrg import index_dist_wubrg, COLOR_IDENTITY, WUBRG_COLOR_INDEXES
 from core.utilities import logging
 from core.data_requesting import RequestScryfall
 
@@ -31,6 +34,18 @@ class SetMetadata:
     REQUESTER = RequestScryfall()
     __cls_lock = object()
 
+    # The columns of card information attached to card data, and the Card attributes they come from.
+    CARD_INFO_ATTRS: dict[str, str] = {
+        'Cast Color': 'CAST_IDENTITY',
+        'CMC': 'CMC',
+        'Type Line': 'TYPE_LINE',
+        'Supertypes': 'SUPERTYPES',
+        'Types': 'TYPES',
+        'Subtypes': 'SUBTYPES',
+        'Power': 'POW',
+        'Toughness': 'TOU'
+    }
+
     @classmethod
     def get_metadata(cls, set_code: str) -> Optional[SetMetadata]:
         """
@@ -61,6 +76,8 @@ class SetMetadata:
         self.CARD_PRINT_ORDER_KEY: Callable = cmp_to_key(self._print_order_compare)
         self.CARD_REVIEW_ORDER_KEY: Callable = cmp_to_key(self._review_order_compare)
         self.FRAME_ORDER_KEY: Callable = cmp_to_key(self._frame_order_compare)
+        self._CARD_INFO_FRAME: Optional[pd.DataFrame] = None
+        self._CARD_INFO_FINGERPRINT: Optional[str] = None
         logging.info(f"Done!\n")
 
     @property
@@ -71,6 +88,53 @@ class SetMetadata:
     def CARD_LIST(self) -> list[Card]:
         return [self.CARD_DICT[name] for name in self.CARD_DICT]
 
+    @property
+    def CARD_INFO_FRAME(self) -> pd.DataFrame:
+        """
+        The information about each card in the set, indexed by card name, for attaching to card data.
+        It's made once, and only made again if cards are added to the set.
+        """
+        card_dict = self.CARD_DICT
+        if self._CARD_INFO_FRAME is None or len(self._CARD_INFO_FRAME) != len(card_dict):
+            self._CARD_INFO_FRAME = self.gen_card_info_frame(card_dict.values())
+            self._CARD_INFO_FINGERPRINT = None
+        return self._CARD_INFO_FRAME
+
+    @property
+    def CARD_INFO_FINGERPRINT(self) -> str:
+        """
+        A checksum of CARD_INFO_FRAME, which changes whenever the information about the cards does.
+        It's only worked out again if the frame is made again.
+        """
+        frame = self.CARD_INFO_FRAME
+        if self._CARD_INFO_FINGERPRINT is None:
+            self._CARD_INFO_FINGERPRINT = self.gen_card_info_fingerprint(frame)
+        return self._CARD_INFO_FINGERPRINT
+
+    @classmethod
+    def gen_card_info_frame(cls, cards: Iterable[Card]) -> pd.DataFrame:
+        """
+        Makes a frame of information about some cards.
+        :param cards: The cards to include.
+        :return: A DataFrame with the information for each card, indexed by card name.
+        """
+        cards = list(cards)
+        columns = {col: [getattr(card, attr) for card in cards] for col, attr in cls.CARD_INFO_ATTRS.items()}
+        frame = pd.DataFrame(columns, index=pd.Index([card.NAME for card in cards], name='Name'))
+        frame['CMC'] = frame['CMC'].astype(int)
+        return frame
+
+    @staticmethod
+    def gen_card_info_fingerprint(frame: pd.DataFrame) -> str:
+        """
+        Makes a checksum of a frame of card information, from its columns, and the names and values of its rows.
+        :param frame: The frame of card information.
+        :return: The checksum, as a hex string.
+        """
+        checksum = sha1('|'.join(map(str, frame.columns)).encode('utf-8'))
+        checksum.update(pd.util.hash_pandas_object(frame.astype(str), index=True).values.tobytes())
+        return checksum.hexdigest()
+
     def _print_order_compare(self, card_name1: str, card_name2: str):
         # Convert the names into numeric indexes
         name_idx1 = self.CARD_PRINT_ORDER_INDEXES[card_name1]
@@ -96,6 +160,18 @@ class SetMetadata:
         else:
             return color_compare_result
 
+    def get_frame_order(self, index: pd.MultiIndex) -> np.ndarray:
+        """
+        Gets the order of the rows of a frame indexed by deck colour and card name, the same as FRAME_ORDER_KEY.
+        The integer indexes of each colour and card are looked up once per row, rather than once per comparison.
+        :param index: The index of the frame, with the deck colours and card names as its first two levels.
+        :return: The positions of the rows, in order. Cards which aren't in the set go after those which are.
+        """
+        color_keys = index.get_level_values(0).map(WUBRG_COLOR_INDEXES).fillna(len(WUBRG_COLOR_INDEXES))
+        name_keys = index.get_level_values(1).map(self.CARD_PRINT_ORDER_INDEXES)
+        name_keys = name_keys.fillna(len(self.CARD_PRINT_ORDER_INDEXES))
+        return np.lexsort((name_keys.to_numpy(), color_keys.to_numpy()))
+
     def find_card(self, card_name) -> Optional[Card]:
         """
         Looks for a card name in the list of cards for the set.
@@ -187,6 +263,14 @@ class FormatMetadata:
     def CARD_LIST(self) -> list[Card]:
         return self._set_metadata.CARD_LIST
 
+    @property
+    def CARD_INFO_FRAME(self) -> pd.DataFrame:
+        return self._set_metadata.CARD_INFO_FRAME
+
+    @property
+    def CARD_INFO_FINGERPRINT(self) -> str:
+        return self._set_metadata.CARD_INFO_FINGERPRINT
+
     def find_card(self, card_name: str) -> Optional[Card]:
         """
         Looks for a card name in the list of cards for the set.
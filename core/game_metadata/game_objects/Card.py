@@ -8,9 +8,10 @@ information from the card's available faces.
 
 from __future__ import annotations
 from typing import NoReturn, Optional
+import os
 import re
 
-from core.utilities import logging, load_json_file, save_json_file
+from core.utilities import logging, flatten_lists, iter_json_array, save_json_file
 from core.wubrg import get_color_identity, calculate_cmc, parse_color_list, COLOR_STRING, WUBRG_COLOR_INDEXES
 from core.data_requesting import RequestScryfall
 
@@ -189,6 +190,10 @@ class Card:
     def from_name(cls, name) -> Card:
         return CardManager.from_name(name)
 
+    @classmethod
+    def from_names(cls, names: list[str]) -> list[Optional[Card]]:
+        return CardManager.from_names(names)
+
     @classmethod
     def from_set(cls, set_code) -> dict[str, Card]:
         return CardManager.from_set(set_code)
@@ -397,6 +402,11 @@ class CardManager:
 
     REQUESTER = RequestScryfall()
 
+    # Where the caches of cards from Scryfall are saved.
+    CACHE_DIR: str = SCRYFALL_CACHE_DIR
+    CACHE_FILE: str = SCRYFALL_CACHE_FILE
+    CACHE_FILE_ARENA: str = SCRYFALL_CACHE_FILE_ARENA
+
     @classmethod
     def _add_card(cls, card: Card, searched_name: str = '', force_update=True) -> None:
         """
@@ -439,16 +449,58 @@ class CardManager:
             return None
         # If the card is found, return it.
         else:
-            card = Card(json)
+            return cls._add_card_json(json, name)
+
+    @classmethod
+    def _add_card_json(cls, json: dict, *searched_names: str) -> Card:
+        """
+        Creates a card from Scryfall's data and tracks it, re-using any existing copy of the card.
+        :param json: The card data from Scryfall.
+        :param searched_names: The names provided by the user which found the card.
+        :return: The tracked Card.
+        """
+        card = Card(json)
 
-            # See if a copy of the card already exists, likely
-            # due to a misspelling. If so, use that instead.
-            prev_card, found = cls._find_card(card.NAME)
-            if prev_card is not None:
-                card = prev_card
+        # See if a copy of the card already exists, likely
+        # due to a misspelling. If so, use that instead.
+        prev_card, found = cls._find_card(card.NAME)
+        if prev_card is not None:
+            card = prev_card
 
+        for name in searched_names or ('',):
             cls._add_card(card, name)
-            return card
+        return card
+
+    @classmethod
+    def from_names(cls, names: list[str]) -> list[Optional[Card]]:
+        """
+        Searches for many cards by name at once. Any names not already known are looked up together, in batches,
+        and only names which still can't be found are searched for individually, with spelling correction.
+        :param names: The names of the cards to look for. Can handle inexact names, to an extent.
+        :return: A list of Cards or None, in the same order as the names.
+        """
+        # Find the names which haven't been searched before, without duplicates.
+        unknown = [name for name in dict.fromkeys(names) if not cls._find_card(name)[1]]
+
+        if unknown:
+            # Map the names to how they might be returned by Scryfall, so the cards can be matched back to them.
+            #  Cards are matched on their full name, or on the name of any of their faces, ignoring case.
+            pending: dict[str, list[str]] = dict()
+            for name in unknown:
+                pending.setdefault(name.lower(), list()).append(name)
+
+            jsons, _ = cls.REQUESTER.get_cards_by_names(unknown)
+            for json in jsons:
+                card_names = [json['name']] + [face['name'] for face in json.get('card_faces', list())]
+                searched_names = flatten_lists([pending.pop(n.lower(), list()) for n in card_names])
+                if searched_names:
+                    cls._add_card_json(json, *searched_names)
+
+            if pending:
+                logging.info(f'{sum(len(v) for v in pending.values())} names not found exactly. Searching for them.')
+
+        # Every name is now known, except those which weren't found exactly. Those fall back to a fuzzy search.
+        return [cls.from_name(name) for name in names]
 
     @classmethod
     def from_set(cls, set_code: str) -> dict[str, Card]:
@@ -519,22 +571,44 @@ class CardManager:
         cls.CARDS = dict()
 
     @classmethod
-    def load_cache_from_file(cls) -> None:
-        """ Loads the cache of Arena cards from a configurable location disk. """
-        dictionary = load_json_file(SCRYFALL_CACHE_DIR, SCRYFALL_CACHE_FILE_ARENA)
-        for line in dictionary:
-            card = Card(line)
+    def load_cache_from_file(cls, regenerate: bool = True) -> bool:
+        """
+        Loads the cache of Arena cards from a configurable location disk. If the file is truncated or corrupt, none of
+        it is loaded, and the cache is generated again and loaded instead.
+        :param regenerate: Whether to generate the cache again if the file is broken. Default: True
+        :return: Whether the cards were loaded.
+        """
+        # Cards are read from the file one at a time, rather than loading the whole file first,
+        #  but are only added once the whole file has been read, so a broken file never loads part of the cache.
+        try:
+            cards = [Card(line) for line in iter_json_array(cls.CACHE_DIR, cls.CACHE_FILE_ARENA)]
+        except FileNotFoundError:
+            # Generating the cache is slow, so it's only done here to replace a broken file, not a missing one.
+            logging.warning(f'No cache of Arena cards found. Use `generate_arena_cache_file` to create one.')
+            return False
+        except (OSError, ValueError) as ex:
+            if not regenerate:
+                return False
+            logging.warning(f'The cache of Arena cards is broken, it will be generated again. ({ex})')
+            cls.generate_arena_cache_file()
+            return cls.load_cache_from_file(regenerate=False)
+
+        for card in cards:
             cls._add_card(card)
+        return True
 
     # NOTE: The two functions below are expensive and slow, especially to Scryfall.
     #  They should be called only as required.
     @classmethod
     def generate_cache_file(cls):
-        """ Generate a cache of Arena cards on a configurable location on disk. """
+        """ Generate a cache of all cards on a configurable location on disk. """
+        # The bulk data is streamed straight to disk, as it's too large to comfortably hold in memory.
         logging.info(f'Requesting bulk data for all Scryfall cards...')
-        bulk_data = cls.REQUESTER.get_bulk_data()
-        logging.info(f'{len(bulk_data)} cards found!')
-        save_json_file(SCRYFALL_CACHE_DIR, SCRYFALL_CACHE_FILE, bulk_data, indent=None)
+        if cls.REQUESTER.download_bulk_data(cls.CACHE_DIR, cls.CACHE_FILE):
+            size = os.path.getsize(os.path.join(cls.CACHE_DIR, cls.CACHE_FILE))
+            logging.info(f'Bulk data saved! ({size / 2 ** 20:.1f} MB)')
+        else:
+            logging.error(f'Failed to save bulk data.')
 
     # Inspection of the default argument is masked, as every time this is called, if no parameter is passed,
     #  the list should be empty. Rather than doing a None check, a "mutable" argument is used.
@@ -551,4 +625,4 @@ class CardManager:
             bulk_data += extra_cards
 
         logging.info(f'{len(bulk_data)} cards found!')
-        save_json_file(SCRYFALL_CACHE_DIR, SCRYFALL_CACHE_FILE_ARENA, bulk_data, indent=None)
+        save_json_file(cls.CACHE_DIR, cls.CACHE_FILE_ARENA, bulk_data, indent=None)
@@ -108,6 +108,17 @@ class Deck:
     colors: str
 
     # region Decklist Parsing
+    @staticmethod
+    def _names_to_cards(maindeck: list[str], sideboard: list[str]) -> tuple[list[Card], list[Card]]:
+        """
+        Converts the card names in a maindeck and sideboard into Cards, with one batched lookup.
+        :param maindeck: The names of the cards in the maindeck.
+        :param sideboard: The names of the cards in the sideboard.
+        :return: The Cards in the maindeck and sideboard.
+        """
+        cards = CardManager.from_names(maindeck + sideboard)
+        return cards[:len(maindeck)], cards[len(maindeck):]
+
     @classmethod
     def parse_decklist(cls, decklist: list[str]) -> tuple[list[Card], list[Card]]:
         def parse_line(line: str) -> list[str]:
@@ -143,9 +154,8 @@ class Deck:
             pre_maindeck = [parse_line(c) for c in decklist]
             pre_sideboard = list()
 
-        # Flatten the lists and return them as Cards.
-        maindeck = [CardManager.from_name(name) for name in flatten_lists(pre_maindeck)]
-        sideboard = [CardManager.from_name(name) for name in flatten_lists(pre_sideboard)]
+        # Flatten the lists and return them as Cards, looking up the cards for both lists together.
+        maindeck, sideboard = cls._names_to_cards(flatten_lists(pre_maindeck), flatten_lists(pre_sideboard))
 
         maindeck = sorted(maindeck, key=decklist_sort_lambda)
         sideboard = sorted(sideboard, key=decklist_sort_lambda)
@@ -366,6 +376,17 @@ class LimitedDeck(Deck):
     def from_id(cls, deck_id: str) -> LimitedDeck:
         return DeckManager.from_deck_id(deck_id)
 
+    @staticmethod
+    def get_card_names(result: dict) -> tuple[list[str], list[str]]:
+        """
+        Gets the names of the cards in a deck returned by 17Lands.
+        :param result: The deck data from 17Lands.
+        :return: The names of the cards in the maindeck and sideboard.
+        """
+        maindeck = [card_dict['name'] for card_dict in result['groups'][0]["cards"]]
+        sideboard = [card_dict['name'] for card_dict in result['groups'][1]["cards"]]
+        return maindeck, sideboard
+
     def __init__(self, result: dict):
         # Get the event info from the result.
         event_info = result['event_info']
@@ -377,8 +398,7 @@ class LimitedDeck(Deck):
         name = f"{_set} - {_format} ({_deck_id})"
         wins: int = event_info['wins']
         losses: int = event_info['losses']
-        maindeck = [CardManager.from_name(card_dict['name']) for card_dict in result['groups'][0]["cards"]]
-        sideboard = [CardManager.from_name(card_dict['name']) for card_dict in result['groups'][1]["cards"]]
+        maindeck, sideboard = self._names_to_cards(*self.get_card_names(result))
         super().__init__(maindeck, sideboard, name, wins, losses)
 
         # Add the key parts of event metadata.
@@ -528,6 +548,39 @@ class DeckManager:
             cls.DECKS[deck_id] = None
             return None
 
+    @classmethod
+    def from_deck_ids(cls, deck_ids: list[str]) -> list[Optional[LimitedDeck]]:
+        """
+        Attempts to get decks for many IDs. Any decks not in the cache are fetched from 17Lands, and then the cards
+        for all of them are looked up together, so a large number of decks only needs a few requests for cards.
+        :param deck_ids: The deck ids to search for.
+        :return: A list of LimitedDecks or None, in the same order as the ids.
+        """
+        # Get the data for every deck which hasn't been searched before.
+        results = dict()
+        for deck_id in dict.fromkeys(deck_ids):
+            if not cls._find_deck(deck_id)[1]:
+                results[deck_id] = cls.REQUESTER.get_deck(deck_id)
+
+        # Look up every card across the decks at once, so the decks can then be built from the cache.
+        names = list()
+        for result in results.values():
+            try:
+                names += flatten_lists(LimitedDeck.get_card_names(result))
+            except (KeyError, IndexError, TypeError):
+                pass
+        CardManager.from_names(names)
+
+        for deck_id, result in results.items():
+            try:
+                cls._add_deck(LimitedDeck(result))
+            except (KeyError, IndexError, TypeError) as ex:
+                # Decks which couldn't be fetched, or are missing data, are remembered as not found.
+                logging.info(f"Could not get deck with deck_id: '{deck_id}' ({ex!r})")
+                cls.DECKS[deck_id] = None
+
+        return [cls.DECKS[deck_id] for deck_id in deck_ids]
+
     @classmethod
     def _find_deck(cls, deck_id: str) -> tuple[Optional[LimitedDeck], bool]:
         """ Attempts to find a deck in the cache, and if it's been searched before. """
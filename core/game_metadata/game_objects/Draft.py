@@ -18,6 +18,8 @@ import core.game_metadata.game_objects.Deck as Deck
 class Pick:
     @classmethod
     def from_json_list(cls, pick_list: list[dict]) -> list[Pick]:
+        # Look up every card in the draft at once, so each pick can be built from the cache.
+        Card.from_names([name for pick_data in pick_list for name in cls.get_card_names(pick_data)])
         picks = [Pick(pick_data) for pick_data in pick_list]
 
         pick_cnt = len(picks)
@@ -34,13 +36,29 @@ class Pick:
 
         return picks
 
+    @staticmethod
+    def get_card_names(pick: dict) -> list[str]:
+        """
+        Gets the names of the cards in a pick returned by 17Lands; the card picked, followed by the cards available,
+        the cards known to be missing, and the pool.
+        :param pick: The pick data from 17Lands.
+        :return: A list of card names.
+        """
+        return [pick['pick']['name']] + [a['name'] for a in pick['available']] + \
+            [m['name'] for m in pick['known_missing']] + [p['name'] for p in pick['pool']]
+
     def __init__(self, pick: dict, next_pick: Pick = None, last_pick: Pick = None):
         self.pack_number = pick['pack_number']
         self.pick_number = pick['pick_number']
-        self.card_picked = Card.from_name(pick['pick']['name'])
-        self.cards_available = [Card.from_name(a['name']) for a in pick['available']]
-        self.cards_missing = [Card.from_name(m['name']) for m in pick['known_missing']]
-        self.pool = [Card.from_name(p['name']) for p in pick['pool']]
+
+        # Look up all the cards for the pick at once, and then split them up.
+        cards = Card.from_names(self.get_card_names(pick))
+        available_end = 1 + len(pick['available'])
+        missing_end = available_end + len(pick['known_missing'])
+        self.card_picked = cards[0]
+        self.cards_available = cards[1:available_end]
+        self.cards_missing = cards[available_end:missing_end]
+        self.pool = cards[missing_end:]
 
         self.next_pick: Optional[Pick] = next_pick
         self.last_pick: Optional[Pick] = last_pick
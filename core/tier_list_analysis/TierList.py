@@ -10,7 +10,7 @@ from datetime import datetime, date
 from core.wubrg import WUBRG, COLOR_COMBINATIONS
 from core.utilities import logging
 from core.data_requesting import Request17Lands
-from core.game_metadata import SetMetadata, RARITIES, CardManager
+from core.game_metadata import SetMetadata, RARITIES, Card, CardManager
 from core.data_fetching import cast_color_filter, rarity_filter, filter_frame, tier_to_rank, SetManager, \
     FORMAT_NICKNAME_DICT, DATA_DIR_LOC, DATA_DIR_NAME
 
@@ -51,19 +51,19 @@ class TierList:
         return raw_data
 
     def gen_frame(self) -> pd.DataFrame:
-        def adjust_data(tier_dict: dict):
-            # Use the card name from 17Lands to get the relevant card from Scryfall.
+        def adjust_data(tier_dict: dict, card: Card):
+            # Use the card from Scryfall matching the name from 17Lands.
             # This patches bad names coming back from Arena or 17Lands.
-            card = CardManager.from_name(tier_dict['Card'])
             tier_dict['Card'] = card.NAME
             tier_dict['Rank'] = tier_to_rank[tier_dict['Tier']]
             del tier_dict['Comment']
             del tier_dict['Sideboard']
 
-        # Pull and adjust the data from 17Lands.
+        # Pull and adjust the data from 17Lands, looking up all the cards at once.
         data = self.pull_data()
-        for tier in data:
-            adjust_data(tier)
+        cards = CardManager.from_names([tier['Card'] for tier in data])
+        for tier, card in zip(data, cards):
+            adjust_data(tier, card)
 
         # Create the DataFrame, setting the index to be the user who provided the TierList.
         frame_dict = {tier['Card']: tier for tier in data}
@@ -6,7 +6,8 @@ from core.utilities.funcs import *
 from core.utilities.auto_logging import *
 
 
-from_funcs = ['flatten_lists', 'invert_dict', 'validate_json', 'load_json_file', 'save_json_file']
+from_funcs = ['flatten_lists', 'invert_dict', 'validate_json', 'load_json_file', 'save_json_file',
+             'iter_json_array']
 
 from_auto_logging = ['LogLvl', 'set_log_level', 'auto_log', 'logging']
 
@@ -4,9 +4,10 @@ Hosts basic functions which can be useful throughout the application.
 Data structure manipulation and json handling are the current focus.
 """
 
-from typing import Any, Union, Optional, TypeVar
+from typing import Any, Union, Optional, TypeVar, Iterator
 from os import path
 import json
+import re
 
 from core.utilities.auto_logging import logging
 
@@ -77,6 +78,80 @@ def save_json_file(folder: str, filename: str, data: [dict, list[dict]], indent:
         return False
 
 
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+def iter_json_array(folder: str, filename: str, chunk_size: int = 2 ** 16) -> Iterator[Any]:
+    """
+    Yields the items of a json file containing an array one at a time, reading the file in chunks.
+    Only the current chunk and item are held in memory, so very large files can be processed.
+    Unlike `load_json_file`, errors are logged and then raised, as the items before the error have already been
+    given out, and the caller needs to know they aren't the whole file.
+    :param folder: The folder the json file is in.
+    :param filename: The name of the json file (including filetype).
+    :param chunk_size: The number of characters to read at a time.
+    :return: An iterator over the items in the array.
+    """
+    filepath = path.join(folder, filename)
+    decoder = json.JSONDecoder()
+
+    try:
+        with open(filepath, 'r', encoding=ENCODING) as f:
+            buffer, pos, eof = '', 0, False
+
+            # Helper functions which read more of the file, and skip to the next meaningful character.
+            def read_more() -> bool:
+                nonlocal buffer, pos, eof
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer, pos = buffer[pos:] + chunk, 0
+                return not eof
+
+            def next_char() -> str:
+                nonlocal pos
+                pos = _WHITESPACE.match(buffer, pos).end()
+                while pos == len(buffer) and read_more():
+                    pos = _WHITESPACE.match(buffer, pos).end()
+                return buffer[pos] if pos < len(buffer) else ''
+
+            if next_char() != '[':
+                raise ValueError('File does not contain a json array.')
+            pos += 1
+
+            count = 0
+            while True:
+                char = next_char()
+                if char == ']':
+                    break
+                if count > 0:
+                    if char != ',':
+                        raise ValueError(f'Expected a comma between items, at item {count}.')
+                    pos += 1
+                    next_char()
+
+                # Decode the next item, reading more of the file until the whole item is available.
+                #  An item which isn't followed by a separator might be cut off (eg. a number), so is re-read.
+                while True:
+                    try:
+                        item, end = decoder.raw_decode(buffer, pos)
+                        if eof or (end < len(buffer) and buffer[end] in ' \t\n\r,]'):
+                            break
+                    except json.JSONDecodeError:
+                        if eof:
+                            raise
+                    read_more()
+
+                pos = end
+                count += 1
+                yield item
+
+        logging.verbose(f'File {filename} read successfully. ({count} items)')
+    except Exception as ex:
+        logging.error(f'Error reading json file {filename}')
+        logging.error(ex)
+        raise
+
+
 def reformat_json_file(folder: str, filename: str, indent: Optional[int] = 4) -> None:
     """
     Re-writes the json file in question, if it can be parsed, with the provided indents.